@@ -5,11 +5,11 @@ from loguru import logger
 
 from src.config.config import Config
 from src.websocket.web_socket_client import WebSocketClient
-from src.guardrails.guardrails import GuardRails
+from src.utils.model_registry import get_guardrails
 
 
 ws_client = WebSocketClient(Config.WEBSOCKET_URI)
-guardrails_model = GuardRails()
+guardrails_model = get_guardrails()
 
 
 async def search_click(msg: str, history: List[Tuple[str, str]]) -> Tuple[str, List[Tuple[str, str]], gr.Info]:
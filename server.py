@@ -1,4 +1,8 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
 from loguru import logger
 from src.utils.utils import find_file_names
 
@@ -6,38 +10,132 @@ from typing import Dict, Any, List, Optional
 
 from src.config.config import Config
 from src.qdrant.qdrant_utils import QdrantWrapper
-from src.embedder.embedder import EmbeddingWrapper
+from src.qdrant.async_qdrant import AsyncQdrantWrapper
+from src.qdrant.local_index import FallbackSearchClient, LocalSearchClient, LocalVectorIndex
+from src.retrieval.hybrid_search import HybridSearcher
+from src.retrieval.id_lookup import IdLookup
+from src.retrieval.relationship_graph import RelationshipGraph, serving_graph_path
+from src.qdrant.search_filters import FilterValue, validate_filters
+from src.embedder.micro_batcher import QueryMicroBatcher
 from src.parser.csv_parser import CsvParser
+from src.parser.threatmon_parser import FileProcessor
+from src.ingestion.incremental_sync import IncrementalSync
+from src.ingestion.parallel import make_parallel_ingestion
+from src.ingestion.ingestion_job import IngestionJob, IngestionState
+from src.ingestion.dataset_watcher import DatasetWatcher
+from src.ingestion.index_snapshot import IndexSnapshot, restore_latest_snapshot
+from src.ingestion.blue_green import BlueGreenReindexer
 
 from src.utils.connections_manager import ConnectionManager
 from src.chatbot.rag_chat_bot import RAGChatBot
-from src.reranker.re_ranking import RerankDocuments
-
-app = FastAPI()
+from src.chatbot.answer_cache import SemanticAnswerCache, answer_with_cache
+from src.chatbot.conversation import Conversation
+from src.utils.model_registry import get_embedding_model, get_reranker, model_registry
 
 chatbot = RAGChatBot()
+answer_cache = SemanticAnswerCache(Config.ANSWER_CACHE_SIZE, Config.ANSWER_CACHE_TTL, Config.ANSWER_CACHE_THRESHOLD)
 file_processor = CsvParser(data_dir = Config.DATA_DIRECTORY)
 
-collection_name = Config.COLLECTION_NAME
-qdrant_client = QdrantWrapper()
-embedding_client = EmbeddingWrapper()
-
-
-try:
-
-    qdrant_client.delete_collection(collection_name=collection_name)
-    logger.info("collection deleted...")
-    qdrant_client._create_collection_if_not_exists()
-    logger.info("Collection created....")
-    processed_chunks = file_processor.process_directory()
-    qdrant_client.ingest_embeddings(processed_chunks)
+collection_name = Config.COLLECTION_ALIAS
+embedding_client = get_embedding_model()
+query_batcher = QueryMicroBatcher(embedding_client)
 
-    logger.info("Successfully ingested Data")
 
-except Exception as e:
-    logger.error(f"Error in data ingestion: {str(e)}")
 
-reranker = RerankDocuments()
+def connect_qdrant() -> Optional[QdrantWrapper]:
+    """Connect to Qdrant, or return None when it is down at startup and the local index may serve instead."""
+    try:
+        return QdrantWrapper()
+    except Exception as e:
+        if not Config.LOCAL_INDEX_FALLBACK:
+            raise
+        logger.error(f"Qdrant is unreachable at startup ({str(e)}), falling back to the local index")
+        return None
+
+
+qdrant_client = connect_qdrant() if Config.SEARCH_BACKEND != "local" else None
+search_backend = "local" if qdrant_client is None else Config.SEARCH_BACKEND
+
+if qdrant_client is None:
+    # Serve the newest local index without Qdrant; ingestion needs Qdrant and is disabled
+    local_index = LocalVectorIndex.open_latest()
+    if local_index is None:
+        raise RuntimeError("Serving without Qdrant needs an index snapshot; export or build one first")
+    if Config.SEARCH_BACKEND == "local":
+        search_client = LocalSearchClient(local_index)
+    else:
+        # Qdrant was down at startup: keep retrying it for searches once it comes back
+        search_client = FallbackSearchClient(AsyncQdrantWrapper(), LocalVectorIndex.open_latest, fallback=local_index)
+    payload_source = local_index
+    load_graph = lambda: RelationshipGraph.load(local_index.path / IndexSnapshot.GRAPH_FILE)
+    ingestion_job = None
+    dataset_watcher = None
+else:
+    # Searches run on the async client; every write through the sync wrapper invalidates its cached state
+    search_client = AsyncQdrantWrapper(profile=qdrant_client.profile)
+    if Config.LOCAL_INDEX_FALLBACK:
+        # Opened now so the first failed search does not wait for the snapshot to be prepared
+        search_client = FallbackSearchClient(
+            search_client, LocalVectorIndex.open_latest, fallback=LocalVectorIndex.open_latest()
+        )
+    qdrant_client.add_change_listener(search_client.invalidate)
+    payload_source = qdrant_client
+    load_graph = lambda: RelationshipGraph.load(serving_graph_path(qdrant_client))
+
+    def export_local_index() -> None:
+        """Refresh the local copy of the collection used when Qdrant is unreachable."""
+        IndexSnapshot.export(qdrant_client, Config.LOCAL_INDEX_DIR)
+        search_client.reload()
+
+    # Only new or changed rows are embedded; rows missing from the dataset are deleted
+    threat_intel_processor = FileProcessor()
+    parallel_ingestion = make_parallel_ingestion(file_processor)
+    csv_sync = IncrementalSync(file_processor, qdrant_client, parallel=parallel_ingestion)
+    ingestion_job = IngestionJob(
+        csv_sync,
+        restore_snapshot=(lambda: restore_latest_snapshot(qdrant_client)) if Config.RESTORE_INDEX_SNAPSHOT else None,
+        reindexer=BlueGreenReindexer(
+            file_processor, qdrant_client, embedding_client,
+            parallel=parallel_ingestion, file_processor=threat_intel_processor,
+        ),
+        on_ready=export_local_index if Config.LOCAL_INDEX_FALLBACK else None,
+    )
+
+    dataset_watcher = DatasetWatcher(
+        csv_sync, threat_intel_processor, qdrant_client, write_lock=ingestion_job.write_lock
+    )
+
+hybrid_searcher = HybridSearcher(search_client, payload_source)
+id_lookup = IdLookup(payload_source, graph_loader=load_graph if Config.RELATIONSHIP_GRAPH_ENABLED else None)
+if qdrant_client is not None:
+    qdrant_client.add_change_listener(hybrid_searcher.invalidate)
+    qdrant_client.add_change_listener(id_lookup.invalidate)
+    # Answers were generated from the previous index contents
+    qdrant_client.add_change_listener(answer_cache.clear)
+
+
+def ingestion_running() -> bool:
+    return ingestion_job is not None and ingestion_job.is_running
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Ingest in the background so connections are accepted while the index builds
+    if ingestion_job is not None:
+        ingestion_job.start()
+    if dataset_watcher is not None and Config.WATCH_DATASET:
+        dataset_watcher.start()
+    query_batcher.start()
+    yield
+    await query_batcher.stop()
+    await search_client.close()
+    if dataset_watcher is not None and Config.WATCH_DATASET:
+        dataset_watcher.stop()
+
+
+app = FastAPI(lifespan=lifespan)
+
+reranker = get_reranker()
 
 # Manually added file names of the CAPEC daatset. In production, These files will be fetched from database
 database_files = ["333.csv", "658.csv", "659.csv", "1000.csv", "3000.csv"]
@@ -47,13 +145,89 @@ connection_manager = ConnectionManager(max_connections=Config.MAX_CONNECTIONS)
 connections: Dict[WebSocket, Dict[str, Any]] = {}
 
 
-async def handle_search(websocket: WebSocket, query: str) -> None:
+@app.get("/health")
+def health() -> Dict[str, Any]:
+    """Liveness probe reporting the background ingestion state, progress, cache counters and loaded models."""
+    return {
+        **(ingestion_job.status() if ingestion_job is not None else {"state": IngestionState.READY.value}),
+        "search_backend": search_backend,
+        "local_fallback_searches": getattr(search_client, "fallback_searches", 0),
+        "query_cache": embedding_client.query_cache.stats(),
+        "answer_cache": answer_cache.stats(),
+        "models": model_registry.stats(),
+    }
+
+
+@app.get("/ready")
+def ready() -> JSONResponse:
+    """
+    Readiness probe.
+
+    The server is ready once ingestion has finished, or while a run is in
+    progress as long as a previously ingested index is available to serve.
+    """
+    if ingestion_job is None:
+        points_count = local_index.count_points()
+        status = {"state": IngestionState.READY.value, "points_count": points_count, "ready": points_count > 0}
+        return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+    status = ingestion_job.status()
+    try:
+        points_count = qdrant_client.count_points()
+    except Exception as e:
+        status.update({"ready": False, "error": f"Qdrant is unreachable: {str(e)}"})
+        return JSONResponse(status_code=503, content=status)
+    status["points_count"] = points_count
+    status["ready"] = ingestion_job.state == IngestionState.READY or points_count > 0
+
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
+def get_conversation(websocket: WebSocket) -> Conversation:
+    """Return the chat memory of a connection, created on its first message."""
+    connection = connections.setdefault(websocket, {})
+    if "conversation" not in connection:
+        connection["conversation"] = Conversation()
+    return connection["conversation"]
+
+
+async def generate_answer(
+    websocket: WebSocket,
+    query: str,
+    context_results: List[Dict[str, Any]],
+    query_embeddings: Optional[Any] = None,
+) -> str:
+    """
+    Answer a query from its context, reusing the answer of a near-identical earlier query.
+
+    Args:
+        websocket (WebSocket): The connection asking; its own chat history goes into the prompt.
+        query (str): The search query string.
+        context_results (List[Dict[str, Any]]): Results passed as context, with `id` and `content`.
+        query_embeddings (Optional[Any]): Embedding of the query; computed when needed and omitted.
+
+    Returns:
+        str: The chatbot response.
+    """
+    conversation = get_conversation(websocket)
+    if not Config.ANSWER_CACHE_ENABLED:
+        response, run_id = chatbot.chat(query, [item['content'] for item in context_results], conversation)
+        return response
+
+    if query_embeddings is None:
+        query_embeddings = await query_batcher.embed(query)
+    return answer_with_cache(answer_cache, chatbot, conversation, query, query_embeddings, context_results)
+
+
+async def handle_search(websocket: WebSocket, query: str, filters: Optional[Dict[str, FilterValue]] = None) -> None:
     """
     Handle search action with proper error handling.
 
     Args:
         websocket (WebSocket): The WebSocket connection to send responses.
         query (str): The search query string.
+        filters (Optional[Dict[str, FilterValue]]): Payload filters such as
+            {"typical_severity": ["High"], "source_views": ["1000.csv"]}.
 
     Returns:
         None: Responses are sent through the WebSocket connection.
@@ -65,16 +239,39 @@ async def handle_search(websocket: WebSocket, query: str) -> None:
         logger.info(f"Processing search query")
 
         # filename = find_file_names(query, database_files)
+        validate_filters(filters)
+
+        # Queries naming CAPEC/CWE IDs are answered from the ID maps, without embedding or reranking
+        id_results = await id_lookup.resolve(query) if Config.ID_LOOKUP_ENABLED and not filters else []
+        if id_results:
+            logger.info(f"Resolved {len(id_results)} entries by ID")
+            response = await generate_answer(websocket, query, id_results)
+            await websocket.send_json({
+                "result": response
+            })
+            return
 
-        query_embeddings = embedding_client.generate_embeddings(query)
+        query_embeddings = await query_batcher.embed(query)
 
 
-        logger.info("Searching for top 5 results....")
-        top_5_results = qdrant_client.search(query_embeddings, 5)
-        logger.info("Retrieved top 5 results")
+        logger.info(f"Searching for top {Config.RERANK_CANDIDATES} results....")
+        try:
+            # Dense and BM25 candidates are fused before the cross-encoder sees them
+            top_5_results = await hybrid_searcher.search(query, query_embeddings, Config.RERANK_CANDIDATES, filters)
+        except ValueError:
+            # An empty collection is expected while the first ingestion run is building it
+            if not ingestion_running():
+                raise
+            top_5_results = []
+        logger.info(f"Retrieved top {len(top_5_results)} results")
 
         if not top_5_results:
             logger.warning("No results found in database")
+            if ingestion_running():
+                await websocket.send_json({
+                    "result": "The knowledge base is still being built. Please try again shortly."
+                })
+                return
             await websocket.send_json({
                 "result": "The database is empty. Please ingest some data first before searching."
             })
@@ -82,12 +279,17 @@ async def handle_search(websocket: WebSocket, query: str) -> None:
         
 
         reranked_docs = reranker.rerank_docs(query, top_5_results)
-        reranked_top_5_list = [item['content'] for item in reranked_docs]
-
-        context = reranked_top_5_list[:2]
 
         # only top 2 documents are passing as a context
-        response, conversation_id  = chatbot.chat(query, context)
+        context_results = reranked_docs[:2]
+        if Config.RELATIONSHIP_GRAPH_ENABLED:
+            # Parents, children and follow-on patterns of the top hits come from the graph, not extra searches
+            await id_lookup.ensure_built()
+            context_results += id_lookup.describe_relationships(
+                [item["capec_id"] for item in reranked_docs[:2] if item.get("capec_id")]
+            )
+
+        response = await generate_answer(websocket, query, context_results, query_embeddings)
 
         logger.info("Generating response from Groq")
 
@@ -109,7 +311,7 @@ async def add_feedback(websocket: WebSocket, action:str,  comment: str) -> None:
         logger.info(action)
         logger.info(comment)
 
-        chatbot.add_feedback(action, comment)
+        chatbot.add_feedback(action, comment, get_conversation(websocket))
 
         await websocket.send_json({
             "result": "Feedback added successfully"
@@ -122,6 +324,85 @@ async def add_feedback(websocket: WebSocket, action:str,  comment: str) -> None:
         })
 
 
+async def stream_ingestion_progress(websocket: WebSocket) -> None:
+    """
+    Send progress frames for the running ingestion job until it finishes.
+
+    Args:
+        websocket (WebSocket): The WebSocket connection to send frames to.
+
+    Returns:
+        None: The final frame carries either a `result` or an `error`.
+    """
+    try:
+        while ingestion_job.is_running:
+            await websocket.send_json({"type": "progress", **ingestion_job.status()})
+            await asyncio.sleep(Config.INGESTION_PROGRESS_INTERVAL)
+
+        status = ingestion_job.status()
+        if ingestion_job.state == IngestionState.READY:
+            await websocket.send_json({
+                "result": f"Data ingested successfully: {status['report']}"
+            })
+        elif ingestion_job.state == IngestionState.CANCELLED:
+            await websocket.send_json({"result": "Ingestion cancelled"})
+        else:
+            await websocket.send_json({"error": f"Ingestion failed: {status['error']}"})
+
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        logger.error(f"Error streaming ingestion progress: {str(e)}")
+
+
+async def handle_ingest(websocket: WebSocket, rebuild: bool = False) -> None:
+    """
+    Start an ingestion job, or attach to the running one, and stream its progress.
+
+    Progress is streamed from a separate task so the socket keeps receiving
+    actions such as `cancel_ingestion` in the meantime.
+
+    Args:
+        websocket (WebSocket): The WebSocket connection to send responses.
+        rebuild (bool): Rebuild the index into a shadow collection and swap the
+            serving alias once it validates, instead of syncing in place.
+
+    Returns:
+        None: Responses are sent through the WebSocket connection.
+    """
+    if ingestion_job is None:
+        await websocket.send_json({"error": "Ingestion needs Qdrant; the server is serving from the local index"})
+        return
+
+    if ingestion_job.start(rebuild=rebuild):
+        logger.info("Ingestion job started from WebSocket request")
+    else:
+        logger.info("Ingestion job already running, streaming its progress")
+
+    connection = connections.setdefault(websocket, {})
+    previous_task = connection.get("ingest_task")
+    if previous_task and not previous_task.done():
+        return
+
+    connection["ingest_task"] = asyncio.create_task(stream_ingestion_progress(websocket))
+
+
+async def handle_cancel_ingestion(websocket: WebSocket) -> None:
+    """
+    Cancel the running ingestion job.
+
+    Args:
+        websocket (WebSocket): The WebSocket connection to send responses.
+
+    Returns:
+        None: Responses are sent through the WebSocket connection.
+    """
+    if ingestion_job is not None and ingestion_job.cancel():
+        await websocket.send_json({"result": "Ingestion cancellation requested"})
+    else:
+        await websocket.send_json({"error": "No ingestion job is running"})
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket) -> None:
     """
@@ -149,11 +430,15 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
                 await websocket.send_json({"error": "No action specified"})
                 continue
             elif  action == "search":
-                await handle_search(websocket, payload["query"])
+                await handle_search(websocket, payload["query"], payload.get("filters"))
             elif action == "positive":
                  await add_feedback(websocket, action , payload["comment"])
             elif action == "negative":
                  await add_feedback(websocket, action , payload["comment"])
+            elif action == "ingest_data":
+                await handle_ingest(websocket, bool((payload or {}).get("rebuild")))
+            elif action == "cancel_ingestion":
+                await handle_cancel_ingestion(websocket)
             else:
                 await websocket.send_json({"error": f"Unknown action: {action}"})
 
@@ -162,6 +447,9 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
     finally:
+        ingest_task = connections.pop(websocket, {}).get("ingest_task")
+        if ingest_task:
+            ingest_task.cancel()
         connection_manager.disconnect(websocket)
         
 
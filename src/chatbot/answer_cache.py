@@ -0,0 +1,243 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypedDict, Union
+
+import numpy as np
+from loguru import logger
+
+from src.chatbot.conversation import Conversation
+
+
+PointId = Union[int, str]
+
+
+class CachedAnswer(TypedDict):
+    """Type definition for an answer served from the cache."""
+    answer: str
+    run_id: Any
+    similarity: float
+
+
+class _Entry(TypedDict):
+    created_at: float
+    embedding: np.ndarray
+    context_ids: Tuple[PointId, ...]
+    history: str
+    answer: str
+    run_id: Any
+    latency: float
+
+
+class SemanticAnswerCache:
+    """
+    Bounded, thread-safe LRU cache with a time-to-live for generated answers.
+
+    An answer is reused for a later query whose embedding has a cosine
+    similarity of at least `threshold` with the original query and that
+    retrieved exactly the same context, with the same chat history in the
+    prompt and under the same chatbot guidelines. Chat history is kept per
+    connection, so a new connection's first query can reuse the answer given
+    to another connection's first query.
+    Entries are compared with one matrix product, so lookups stay cheap next
+    to the LLM call they replace.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        threshold: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_size (int): Maximum number of cached answers.
+            ttl_seconds (float): Seconds after which an answer expires.
+            threshold (float): Minimum cosine similarity between query embeddings.
+            clock (Callable[[], float]): Source of the current time in seconds.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self.clock = clock
+        self.guidelines_version: Optional[int] = None
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_keys: List[int] = []
+        self._next_key = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.saved_seconds = 0.0
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+    def _check_guidelines(self, guidelines_version: int) -> None:
+        # Answers generated under other guidelines are no longer valid
+        if guidelines_version != self.guidelines_version:
+            if self._entries:
+                self._clear_locked()
+            self.guidelines_version = guidelines_version
+
+    def _clear_locked(self) -> None:
+        self._entries.clear()
+        self._matrix = None
+        self.invalidations += 1
+
+    def get(
+        self,
+        query_embedding: Sequence[float],
+        context_ids: Sequence[PointId],
+        history: str,
+        guidelines_version: int,
+    ) -> Optional[CachedAnswer]:
+        """
+        Return the answer of the most similar cached query with the same context and history.
+
+        Args:
+            query_embedding (Sequence[float]): Embedding of the new query.
+            context_ids (Sequence[PointId]): IDs of the results passed as context, in order.
+            history (str): `Conversation.history_fingerprint()` before the query is answered.
+            guidelines_version (int): Current `RAGChatBot.guidelines_version`.
+
+        Returns:
+            Optional[CachedAnswer]: The cached answer, or None on a miss.
+        """
+        query = self._normalize(query_embedding)
+        context_key = tuple(context_ids)
+
+        with self._lock:
+            self._check_guidelines(guidelines_version)
+            self._evict_expired()
+            if self._entries:
+                if self._matrix is None:
+                    self._matrix_keys = list(self._entries)
+                    self._matrix = np.stack([self._entries[key]["embedding"] for key in self._matrix_keys])
+                similarities = self._matrix @ query
+                for position in np.argsort(-similarities):
+                    if similarities[position] < self.threshold:
+                        break
+                    key = self._matrix_keys[position]
+                    entry = self._entries[key]
+                    if entry["context_ids"] == context_key and entry["history"] == history:
+                        self._entries.move_to_end(key)
+                        self.hits += 1
+                        self.saved_seconds += entry["latency"]
+                        return CachedAnswer(
+                            answer=entry["answer"], run_id=entry["run_id"], similarity=float(similarities[position])
+                        )
+
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        query_embedding: Sequence[float],
+        context_ids: Sequence[PointId],
+        history: str,
+        guidelines_version: int,
+        answer: str,
+        run_id: Any,
+        latency: float,
+    ) -> None:
+        """
+        Store a generated answer, evicting the least recently used entry when full.
+
+        Args:
+            query_embedding (Sequence[float]): Embedding of the query.
+            context_ids (Sequence[PointId]): IDs of the results passed as context, in order.
+            history (str): Fingerprint of the chat history the answer was generated with.
+            guidelines_version (int): Guidelines version the answer was generated under.
+            answer (str): Generated answer.
+            run_id (Any): Tracing run of the generation, reused for feedback on cached answers.
+            latency (float): Seconds the generation took, counted as saved on every hit.
+        """
+        with self._lock:
+            self._check_guidelines(guidelines_version)
+            self._entries[self._next_key] = _Entry(
+                created_at=self.clock(),
+                embedding=self._normalize(query_embedding),
+                context_ids=tuple(context_ids),
+                history=history,
+                answer=answer,
+                run_id=run_id,
+                latency=latency,
+            )
+            self._next_key += 1
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            self._matrix = None
+
+    def _evict_expired(self) -> None:
+        now = self.clock()
+        expired = [key for key, entry in self._entries.items() if now - entry["created_at"] > self.ttl_seconds]
+        for key in expired:
+            del self._entries[key]
+        if expired:
+            self._matrix = None
+
+    def clear(self) -> None:
+        """Drop every cached answer; safe to call from any thread, e.g. as a change listener."""
+        with self._lock:
+            self._clear_locked()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, the generation time saved by hits and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "saved_seconds": round(self.saved_seconds, 3),
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+
+def answer_with_cache(
+    cache: SemanticAnswerCache,
+    chatbot: Any,
+    conversation: Conversation,
+    query: str,
+    query_embedding: Sequence[float],
+    context_results: List[Dict[str, Any]],
+) -> str:
+    """
+    Answer a query from its context, reusing the answer of a near-identical earlier query.
+
+    Args:
+        cache (SemanticAnswerCache): Cache the answer is looked up in and stored to.
+        chatbot (Any): `RAGChatBot` generating the answer on a miss.
+        conversation (Conversation): Chat memory of the connection asking; the
+            exchange is recorded in it whether or not the answer was cached.
+        query (str): The user's question.
+        query_embedding (Sequence[float]): Embedding of the query.
+        context_results (List[Dict[str, Any]]): Results passed as context, with `id` and `content`.
+
+    Returns:
+        str: The answer.
+    """
+    context_ids = [item["id"] for item in context_results]
+    history = conversation.history_fingerprint()
+    cached = cache.get(query_embedding, context_ids, history, chatbot.guidelines_version)
+    if cached is not None:
+        logger.info(f"Answer served from cache (similarity {cached['similarity']:.3f})")
+        conversation.record(query, cached["answer"], cached["run_id"])
+        return cached["answer"]
+
+    guidelines_version = chatbot.guidelines_version
+    start = time.perf_counter()
+    response, run_id = chatbot.chat(query, [item["content"] for item in context_results], conversation)
+    cache.put(
+        query_embedding, context_ids, history, guidelines_version, response, run_id, time.perf_counter() - start
+    )
+    return response
@@ -0,0 +1,52 @@
+from typing import Any, List
+
+from langchain.memory import ConversationBufferWindowMemory
+from langchain_core.messages import BaseMessage
+
+from src.utils.utils import hash_text
+
+
+class Conversation:
+    """
+    Chat memory and latest interaction of one client connection.
+
+    Every WebSocket connection gets its own conversation, so the history that
+    goes into the prompt, and the answer that feedback refers to, only depend
+    on that client's own messages.
+    """
+
+    def __init__(self, window: int = 5) -> None:
+        """
+        Initialize an empty conversation.
+
+        Args:
+            window (int): Number of past exchanges kept in the prompt.
+        """
+        self.memory = ConversationBufferWindowMemory(
+            k=window, return_messages=True, memory_key="chat_history"
+        )
+        self.input = ""
+        self.response = ""
+        self.run_id: Any = None
+
+    def history(self) -> List[BaseMessage]:
+        """Return the chat history the next prompt is built with."""
+        return self.memory.load_memory_variables({})["chat_history"]
+
+    def history_fingerprint(self) -> str:
+        """Return a hash of the chat history the next prompt is built with."""
+        return hash_text("\n".join(f"{message.type}: {message.content}" for message in self.history()))
+
+    def record(self, query: str, response: str, run_id: Any) -> None:
+        """
+        Register an exchange as the latest interaction.
+
+        Args:
+            query (str): The user's question.
+            response (str): The answer, generated or served from the answer cache.
+            run_id (Any): Tracing run the answer was generated in, so feedback is attached to it.
+        """
+        self.memory.save_context({"input": query}, {"output": response})
+        self.input = query
+        self.response = response
+        self.run_id = run_id
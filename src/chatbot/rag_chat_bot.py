@@ -1,15 +1,15 @@
 
-from typing import Dict, List
+from typing import Any, Dict, List, Tuple
 from langchain_core.messages import HumanMessage, SystemMessage, BaseMessage
 from langchain_groq import ChatGroq
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.schema.output_parser import StrOutputParser
-from langchain.memory import ConversationBufferWindowMemory
 from langchain_core.runnables import RunnablePassthrough, RunnableSequence
 from langchain_core.output_parsers import StrOutputParser
 from langsmith import Client
 from langchain import  callbacks
 
+from src.chatbot.conversation import Conversation
 from src.chatbot.refection import ReflectionModel
 
 from loguru import logger
@@ -38,18 +38,12 @@ class RAGChatBot:
             frequency_penalty=0.9
         )
 
-        # Initialize memory
-        self.memory = ConversationBufferWindowMemory(
-            k=5, return_messages=True, memory_key="chat_history"
-        )
-
+        # Chat memory lives in a Conversation per connection; guidelines are shared
         self.positive_examples = None
         self.negative_examples = None
         self.feedback = ""
-        self.response = ""
-        self.input = ""
         self.client = Client()
-        self.run_id = None
+        self.guidelines_version = 0
         self.guidelines = ""
         self.reflection_model = ReflectionModel()
 
@@ -111,11 +105,23 @@ Notes: Additional information."""),
         ])
 
 
-    def _create_chain(self, query: str, context: str, guidelines: str) -> RunnableSequence:
+    @property
+    def guidelines(self) -> str:
+        return self._guidelines
+
+    @guidelines.setter
+    def guidelines(self, value: str) -> None:
+        # Answers cached under the previous guidelines are dropped when the version changes
+        self._guidelines = value
+        self.guidelines_version += 1
+
+    def _create_chain(
+        self, query: str, context: str, guidelines: str, conversation: Conversation
+    ) -> RunnableSequence:
         """Create a chain for a single query-context pair"""
 
         def get_context_and_history(_: dict) -> dict:
-            chat_history = self.memory.load_memory_variables({})["chat_history"]
+            chat_history = conversation.history()
 
             return {"context": context, "chat_history": chat_history, "input": query, "guidelines":guidelines}
 
@@ -127,48 +133,37 @@ Notes: Additional information."""),
             | StrOutputParser()
         )
 
-    def _update_memory(self, input_text: str, output_text: str) -> None:
-        """Update conversation memory with the latest interaction"""
-        self.memory.save_context({"input": input_text}, {"output": output_text})
-
-    def chat(self, query: str, context: List[str]) -> str:
+    def chat(self, query: str, context: List[str], conversation: Conversation) -> Tuple[str, Any]:
         """
         Process a single message with provided context and return the response
 
         Args:
             query (str): The user's question
             docs (List[str]): List of relevant document contents/contexts
+            conversation (Conversation): Chat memory of the connection asking
 
         Returns:
-            str: The model's response
+            Tuple[str, Any]: The model's response and its tracing run ID
         """
 
         with callbacks.collect_runs() as cb:
        
             # Create and run the chain
-            chain = self._create_chain(query, context, self.guidelines)
+            chain = self._create_chain(query, context, self.guidelines, conversation)
             response = chain.invoke({})
+            run_id = cb.traced_runs[0].id
 
-            # Update memory
-            self._update_memory(query, response)
-
-            self.input = query
-            self.response = response
-            self.run_id = cb.traced_runs[0].id
-
-
-        return response, "conversation_id"
+        # Update memory
+        conversation.record(query, response, run_id)
 
-    def get_chat_history(self) -> List[BaseMessage]:
-        """Return the current chat history"""
-        return self.memory.load_memory_variables({})["chat_history"]
+        return response, run_id
 
-    def add_feedback(self, feedback: str, comment: str) -> str:
+    def add_feedback(self, feedback: str, comment: str, conversation: Conversation) -> str:
 
         # Add the new feedback entry
         feed = {
-            "Query": self.input,
-            "Response": self.response,
+            "Query": conversation.input,
+            "Response": conversation.response,
             "Comment": comment,
         }
 
@@ -184,7 +179,7 @@ Notes: Additional information."""),
             score = 0
 
         self.client.create_feedback(
-            run_id=self.run_id,
+            run_id=conversation.run_id,
             key="user-feedback",
             score=score,
             comment=comment,
@@ -21,18 +21,90 @@ class Config:
     SCOPES = ["https://www.googleapis.com/auth/drive.readonly"]
     FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
     
-    COLLECTION_NAME = "capec-collection-v1"
+    COLLECTION_NAME = "capec-collection-v1"  # physical collection of pre-alias deployments
+    COLLECTION_ALIAS = "capec-collection"
+    COLLECTION_VERSIONS_TO_KEEP = 2
+    REINDEX_MIN_POINTS = 1
+    COLLECTION_PROFILE = os.getenv("COLLECTION_PROFILE", "default")  # see src/qdrant/collection_profiles.py
+    PAYLOAD_SCHEMA_VERSION = 3  # part of the CSV content hash, so a schema change rewrites stored points
+    PAYLOAD_INDEX_FIELDS = [
+        "capec_id", "source_file", "source_views", "abstraction", "status",
+        "likelihood", "typical_severity", "related_cwe_ids",
+    ]
+    REINDEX_VALIDATION_QUERIES = ["SQL injection", "buffer overflow", "phishing"]
 
     EMBEDDING_VERSION_NUMBER = "v1.0"
     EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+    EMBEDDING_BATCH_SIZE = 64
 
     CAPEC_DATA_DIR = "./capec-dataset/"
     PERSIST_DIR = "/app/src/index/index/"
+    INDEX_SNAPSHOT_DIR = "/app/src/index/index/snapshots/"
+    LOCAL_INDEX_DIR = "/app/src/index/index/local/"  # exports of the live collection for local serving
+    RELATIONSHIP_GRAPH_DIR = "/app/src/index/index/graphs/"  # one CAPEC relationship graph per collection
+    GRAPH_MAX_NEIGHBORS = 5  # related entries listed per relation type in expanded context
+    RESTORE_INDEX_SNAPSHOT = True
+    EMBEDDING_CACHE_ENABLED = True
+    EMBEDDING_CACHE_LOG_MAX_ENTRIES = 50000  # index.log entries before they are compacted into index.json
+    QUERY_CACHE_SIZE = 1024
+    QUERY_CACHE_TTL = 3600  # seconds
+    ANSWER_CACHE_ENABLED = True
+    ANSWER_CACHE_SIZE = 512
+    ANSWER_CACHE_TTL = 3600  # seconds
+    ANSWER_CACHE_THRESHOLD = 0.95  # minimum cosine similarity between a query and a cached one
+    QUERY_BATCH_MAX_SIZE = 32
+    QUERY_BATCH_MAX_WAIT_MS = 5
+
+    HYBRID_SEARCH_ENABLED = True
+    HYBRID_PREFETCH = 40  # field-level candidates taken from dense and BM25 search before fusion
+    RRF_K = 60
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+    SPARSE_INDEX_REBUILD_INTERVAL = 30.0  # minimum seconds between BM25 index rebuilds
+    RERANK_CANDIDATES = 5  # fused candidates scored by the cross-encoder
+
+    ID_LOOKUP_ENABLED = True
+    ID_LOOKUP_MAX_RELATED = 2  # related attack patterns added per matched CAPEC entry
+    ID_LOOKUP_MAX_RESULTS = 4  # entries passed as context for an ID query
+    RELATIONSHIP_GRAPH_ENABLED = True  # build the CAPEC relationship graph at ingestion and expand context with it
+
+    INGESTION_BATCH_SIZE = 256
+    INGESTION_QUEUE_SIZE = 4
+    INGESTION_UPLOAD_WORKERS = 4
+    INGESTION_PROCESSES = int(os.getenv("INGESTION_PROCESSES", 0))  # 0 embeds in the server process
+    INGESTION_TORCH_THREADS = 1
+    INGESTION_SHARD_SIZE = 512
+    INGESTION_PROGRESS_INTERVAL = 1.0  # seconds between progress frames
+
+    IOC_CHUNK_LINES = 50
+    FIELD_CHUNKING = True  # index CAPEC entries as one vector per field
+    FIELD_CHUNK_CHARS = 800  # roughly MiniLM's 256-token window
+    PARENT_AGGREGATION = "max"  # "max" or "sum" of the field scores of an entry
+    MAX_FIELDS_PER_RESULT = 3  # matched fields of an entry passed on to the reranker
+
+    WATCH_DATASET = True
+    WATCH_POLL_INTERVAL = 2.0  # seconds between directory scans
+    WATCH_DEBOUNCE_SECONDS = 5.0  # quiet period before a batch of changes is applied
 
     QDRANT_HOST = "qdrant"
     QDRANT_PORT = 6333
+    QDRANT_GRPC_PORT = 6334
+    QDRANT_PREFER_GRPC = True
+    QDRANT_POOL_SIZE = 20  # pooled HTTP connections used when gRPC is unavailable
+
+    SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "qdrant")  # "qdrant", or "local" to serve without Qdrant
+    LOCAL_INDEX_FALLBACK = True  # search the local index when Qdrant is unreachable
+    LOCAL_INDEX_RETRY_INTERVAL = 30.0  # seconds before Qdrant is tried again after a failed search
+    LOCAL_INDEX_HNSW = False  # needs hnswlib; exact NumPy search otherwise
+    LOCAL_INDEX_HNSW_M = 16
+    LOCAL_INDEX_HNSW_EF_CONSTRUCT = 200
+    LOCAL_INDEX_HNSW_EF = 64
 
     EMBEDDING_MODEL_PATH = "./src/embedder/embedding_model/"
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")  # "torch" or "onnx"
+    ONNX_MODEL_DIR = "./src/embedder/onnx_model/"
+    ONNX_NUM_THREADS = 0  # 0 lets ONNX Runtime pick
+    ONNX_PARITY_THRESHOLD = 0.98  # minimum cosine similarity to the torch embeddings
     RERANKING_MODEL_PATH = "./src/reranker/re_ranker_model/"
 
 
@@ -1,11 +1,34 @@
+from typing import Optional
+
 import numpy as np
+from loguru import logger
 from sentence_transformers import SentenceTransformer
 from src.config.config import Config
+from src.embedder.embedding_cache import EmbeddingCache, get_embedding_cache
+from src.embedder.query_cache import QueryEmbeddingCache, normalize_query
+from src.utils.utils import hash_text
 
 
 class EmbeddingWrapper:
-    def __init__(self, model_name='all-MiniLM-L6-v2'):
-        self.model = SentenceTransformer(Config.EMBEDDING_MODEL_PATH)
+    def __init__(self, model_name='all-MiniLM-L6-v2', batch_size: int = Config.EMBEDDING_BATCH_SIZE, use_cache: bool = Config.EMBEDDING_CACHE_ENABLED, backend: str = Config.EMBEDDING_BACKEND):
+        if backend == "onnx":
+            # Imported lazily so onnxruntime is only needed when the backend is selected
+            from src.embedder.onnx_backend import OnnxEncoder
+            self.model = OnnxEncoder(Config.ONNX_MODEL_DIR)
+            self.model_key = f"{Config.EMBEDDING_MODEL}-onnx-int8"
+        else:
+            self.model = SentenceTransformer(Config.EMBEDDING_MODEL_PATH)
+            self.model_key = Config.EMBEDDING_MODEL
+        self.batch_size = batch_size
+        self.cache: Optional[EmbeddingCache] = None
+        self.query_cache = QueryEmbeddingCache(Config.QUERY_CACHE_SIZE, Config.QUERY_CACHE_TTL)
+
+        if use_cache:
+            try:
+                # Backends produce slightly different vectors, so each gets its own cache
+                self.cache = get_embedding_cache(self.model.get_sentence_embedding_dimension(), model_name=self.model_key)
+            except Exception as e:
+                logger.warning(f"Embedding cache disabled: {str(e)}")
     
     def generate_embeddings(self, texts):
         """
@@ -17,5 +40,127 @@ class EmbeddingWrapper:
         Returns:
             numpy.ndarray: A 2D array of embeddings, where each row corresponds to a text input.
         """
+        if self.cache is not None:
+            if isinstance(texts, str):
+                # Single texts are queries; they are not worth persisting
+                return self._encode([texts])[0]
+            return self.generate_batch_embeddings(texts)
+
         embeddings = self.model.encode(texts)
         return np.array(embeddings)
+
+    def embed_query(self, query):
+        """
+        Embed a search query through the in-memory LRU/TTL query cache.
+
+        Queries are normalized (case and whitespace) before lookup; the model
+        lowercases its input, so normalized queries embed identically.
+
+        Args:
+            query (str): The search query.
+
+        Returns:
+            numpy.ndarray: A read-only 1D embedding.
+        """
+        return self.embed_queries([query])[0]
+
+    def embed_queries(self, queries):
+        """
+        Embed several search queries, running one forward pass for all cache misses.
+
+        Args:
+            queries (list): Search queries.
+
+        Returns:
+            list: One read-only 1D embedding per query, in input order.
+        """
+        keys = [self._query_key(query) for query in queries]
+        embeddings = {key: self.query_cache.get(key) for key in set(keys)}
+
+        missing = [key for key, embedding in embeddings.items() if embedding is None]
+        if missing:
+            # Queries bypass the persistent cache, which would otherwise grow with every distinct query
+            encoded = self._encode([key[2] for key in missing])
+            for key, embedding in zip(missing, encoded):
+                embedding = np.array(embedding)
+                self.query_cache.put(key, embedding)
+                embeddings[key] = embedding
+
+        return [embeddings[key] for key in keys]
+
+    def _query_key(self, query):
+        """Return the query cache key: model, embedding version and normalized text."""
+        return (self.model_key, Config.EMBEDDING_VERSION_NUMBER, normalize_query(query))
+
+    def generate_batch_embeddings(self, texts, batch_size=None):
+        """
+        Generate embeddings for many texts in batched forward passes.
+
+        Texts already present in the persistent cache skip the forward pass.
+
+        Args:
+            texts (list): A list of strings to generate embeddings for.
+            batch_size (int, optional): Number of texts per forward pass.
+                Defaults to the wrapper's configured batch size.
+
+        Returns:
+            numpy.ndarray: A C-contiguous float32 matrix of shape (len(texts), dim).
+        """
+        texts = list(texts)
+        dim = self.model.get_sentence_embedding_dimension()
+        if len(texts) == 0:
+            return np.empty((0, dim), dtype=np.float32)
+
+        if self.cache is None:
+            return self._encode(texts, batch_size)
+
+        embeddings, missing, hashes = self.lookup_cached(texts)
+
+        if missing:
+            encoded = self._encode([texts[position] for position in missing], batch_size)
+            embeddings[missing] = encoded
+            self.store_cached([hashes[position] for position in missing], encoded)
+
+        return embeddings
+
+    def lookup_cached(self, texts):
+        """
+        Fill a float32 matrix with the cached embeddings of the given texts.
+
+        Args:
+            texts (list): A list of strings.
+
+        Returns:
+            tuple: The partially filled matrix, the positions of texts that still
+            need a forward pass, and the hash of every text.
+        """
+        dim = self.model.get_sentence_embedding_dimension()
+        hashes = [hash_text(text) for text in texts]
+        embeddings = np.empty((len(texts), dim), dtype=np.float32)
+
+        if self.cache is None:
+            return embeddings, list(range(len(texts))), hashes
+
+        missing = []
+        for position, cached in enumerate(self.cache.get_many(hashes)):
+            if cached is None:
+                missing.append(position)
+            else:
+                embeddings[position] = cached
+
+        return embeddings, missing, hashes
+
+    def store_cached(self, hashes, embeddings):
+        """Persist freshly computed embeddings in the cache, if one is enabled."""
+        if self.cache is not None:
+            self.cache.put_many(hashes, embeddings)
+
+    def _encode(self, texts, batch_size=None):
+        """Run the transformer forward pass and return a contiguous float32 matrix."""
+        embeddings = self.model.encode(
+            texts,
+            batch_size=batch_size or self.batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
@@ -0,0 +1,192 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from src.config.config import Config
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache backed by a memory-mapped float32 matrix.
+
+    Each model/version pair gets its own directory under `cache_dir` holding
+    `vectors.f32` (the raw matrix), `index.json` (text hash -> row number) and
+    `index.log`, to which new entries are appended as "<hash> <row>" lines. The
+    log is folded into `index.json` when the cache is opened, and whenever it
+    holds `log_max_entries` entries, so it stays bounded in long-running processes.
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    INDEX_FILE = "index.json"
+    LOG_FILE = "index.log"
+    INITIAL_CAPACITY = 1024
+
+    def __init__(
+        self,
+        dim: int,
+        cache_dir: str = Config.PERSIST_DIR,
+        model_name: str = Config.EMBEDDING_MODEL,
+        version: str = Config.EMBEDDING_VERSION_NUMBER,
+        log_max_entries: int = Config.EMBEDDING_CACHE_LOG_MAX_ENTRIES,
+    ) -> None:
+        """
+        Open (or create) the cache for a model version.
+
+        Args:
+            dim (int): Embedding dimension of the model.
+            cache_dir (str): Root directory where caches are persisted.
+            model_name (str): Embedding model name, part of the cache key.
+            version (str): Embedding version number, part of the cache key.
+            log_max_entries (int): Log entries after which the index is rewritten and the log emptied.
+        """
+        self.dim = dim
+        self.log_max_entries = log_max_entries
+        self.log_entries = 0
+        self.directory = Path(cache_dir) / f"embeddings-{model_name}-{version}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.directory / self.VECTORS_FILE
+        self.index_path = self.directory / self.INDEX_FILE
+        self.log_path = self.directory / self.LOG_FILE
+        self._lock = threading.Lock()
+
+        self.index: Dict[str, int] = {}
+        if self.index_path.exists():
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                self.index = json.load(file)
+        if self.log_path.exists():
+            with open(self.log_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    text_hash, _, row = line.strip().partition(" ")
+                    # A line torn by a crash mid-append is skipped
+                    if row.isdigit():
+                        self.index[text_hash] = int(row)
+
+        existing_rows = 0
+        if self.vectors_path.exists():
+            existing_rows = self.vectors_path.stat().st_size // (self.dim * 4)
+
+        # Rows written after the last index flush are unreachable, so drop any stale entries
+        self.index = {key: row for key, row in self.index.items() if row < existing_rows}
+        self.capacity = max(existing_rows, self.INITIAL_CAPACITY)
+        self._open_matrix()
+        if self.log_path.exists() and self.log_path.stat().st_size:
+            self.flush()
+
+        logger.info(f"Embedding cache opened at {self.directory} with {len(self.index)} entries")
+
+    def _open_matrix(self) -> None:
+        """Grow the backing file to the current capacity and memory-map it."""
+        required_bytes = self.capacity * self.dim * 4
+        with open(self.vectors_path, "ab") as file:
+            if file.tell() < required_bytes:
+                file.truncate(required_bytes)
+        self.matrix = np.memmap(
+            self.vectors_path, dtype=np.float32, mode="r+", shape=(self.capacity, self.dim)
+        )
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def get(self, text_hash: str) -> Optional[np.ndarray]:
+        """
+        Look up one embedding.
+
+        Args:
+            text_hash (str): Hash of the embedded text.
+
+        Returns:
+            Optional[np.ndarray]: A copy of the cached embedding, or None on a miss.
+        """
+        return self.get_many([text_hash])[0]
+
+    def get_many(self, text_hashes: List[str]) -> List[Optional[np.ndarray]]:
+        """Look up several embeddings; misses are returned as None."""
+        # `put_many` may remap the matrix when it grows
+        with self._lock:
+            rows = [self.index.get(text_hash) for text_hash in text_hashes]
+            return [None if row is None else np.array(self.matrix[row]) for row in rows]
+
+    def put_many(self, text_hashes: List[str], embeddings: np.ndarray) -> None:
+        """
+        Store embeddings and persist them to disk.
+
+        Only the new rows are written: the matrix is flushed, then their index
+        entries are appended to the log.
+
+        Args:
+            text_hashes (List[str]): Hashes of the embedded texts.
+            embeddings (np.ndarray): Matrix with one row per hash.
+        """
+        with self._lock:
+            new_rows = {
+                text_hash: embedding
+                for text_hash, embedding in zip(text_hashes, embeddings)
+                if text_hash not in self.index
+            }
+            if not new_rows:
+                return
+
+            needed = len(self.index) + len(new_rows)
+            if needed > self.capacity:
+                self.matrix.flush()
+                while self.capacity < needed:
+                    self.capacity *= 2
+                self._open_matrix()
+
+            next_row = len(self.index)
+            entries = []
+            for text_hash, embedding in new_rows.items():
+                self.matrix[next_row] = embedding
+                entries.append((text_hash, next_row))
+                next_row += 1
+
+            # Rows are on disk before the log points at them
+            self.matrix.flush()
+            with open(self.log_path, "a", encoding="utf-8") as file:
+                file.write("".join(f"{text_hash} {row}\n" for text_hash, row in entries))
+            self.index.update(entries)
+            self.log_entries += len(entries)
+            if self.log_entries >= self.log_max_entries:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Flush the matrix, atomically rewrite the index and empty the log it now covers."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self.matrix.flush()
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.index, file)
+        os.replace(tmp_path, self.index_path)
+        open(self.log_path, "w").close()
+        self.log_entries = 0
+
+
+_caches: Dict[Path, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(
+    dim: int,
+    cache_dir: str = Config.PERSIST_DIR,
+    model_name: str = Config.EMBEDDING_MODEL,
+    version: str = Config.EMBEDDING_VERSION_NUMBER,
+) -> EmbeddingCache:
+    """
+    Return the process-wide cache for a model version, opening it on first use.
+
+    Sharing one instance per directory keeps concurrent wrappers from writing
+    the same rows of the backing file.
+    """
+    directory = Path(cache_dir) / f"embeddings-{model_name}-{version}"
+    with _caches_lock:
+        if directory not in _caches:
+            _caches[directory] = EmbeddingCache(dim, cache_dir, model_name, version)
+        return _caches[directory]
@@ -0,0 +1,108 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from src.config.config import Config
+from src.embedder.embedder import EmbeddingWrapper
+
+
+class QueryMicroBatcher:
+    """
+    Coalesce concurrent query embeddings into shared forward passes.
+
+    Queries arriving within `max_wait_ms` of the first pending one (or until
+    `max_batch_size` is reached) are embedded together in a worker thread, and
+    each caller's future is resolved with its own row. The event loop never
+    runs the model itself.
+    """
+
+    def __init__(
+        self,
+        embedder: EmbeddingWrapper,
+        max_batch_size: int = Config.QUERY_BATCH_MAX_SIZE,
+        max_wait_ms: float = Config.QUERY_BATCH_MAX_WAIT_MS,
+    ) -> None:
+        """
+        Initialize the batcher.
+
+        Args:
+            embedder (EmbeddingWrapper): Embedder used for the batched forward passes.
+            max_batch_size (int): Maximum number of queries per forward pass.
+            max_wait_ms (float): How long to wait for more queries after the first one.
+        """
+        self.embedder = embedder
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional["asyncio.Queue[Tuple[str, asyncio.Future]]"] = None
+        self._task: Optional[asyncio.Task] = None
+        # A single worker keeps forward passes serialized; torch parallelizes inside each pass
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="query-embedder")
+
+    def start(self) -> None:
+        """Start the batching loop on the running event loop."""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the batching loop and the worker thread."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False)
+
+    async def embed(self, query: str) -> np.ndarray:
+        """
+        Embed a query, sharing the forward pass with concurrent callers.
+
+        Args:
+            query (str): The search query.
+
+        Returns:
+            np.ndarray: A read-only 1D embedding.
+        """
+        if self._queue is None:
+            # Not started (e.g. outside the server lifespan): embed off the event loop directly
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self.embedder.embed_query, query)
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future]]:
+        """Wait for one query, then gather more until the batch is full or the window closes."""
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            queries = [query for query, _ in batch]
+            try:
+                embeddings = await loop.run_in_executor(self._executor, self.embedder.embed_queries, queries)
+            except Exception as e:
+                logger.error(f"Batched query embedding failed: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
@@ -0,0 +1,301 @@
+import argparse
+import json
+import resource
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import onnxruntime as ort
+from loguru import logger
+from transformers import AutoTokenizer
+
+from src.config.config import Config
+
+
+FP32_MODEL_FILE = "model.onnx"
+INT8_MODEL_FILE = "model-int8.onnx"
+SETTINGS_FILE = "onnx_settings.json"
+
+SAMPLE_TEXTS = [
+    "SQL injection through unsanitized query parameters",
+    "CAPEC-66 SQL Injection",
+    "Buffer overflow via oversized input to a fixed-length stack buffer",
+    "Phishing email that harvests user credentials",
+    "Cross-site scripting using a reflected search parameter",
+    "Privilege escalation by abusing a misconfigured setuid binary",
+    "Execution Flow: Explore, Experiment, Exploit",
+    "Related Weaknesses: CWE-89, CWE-20",
+    "Adversary-in-the-middle attack on an unencrypted channel",
+    "Brute force guessing of weak passwords against a login form",
+]
+
+
+def _read_sentence_transformer_settings(model_path: Path) -> Dict[str, Any]:
+    """Read pooling, normalization and sequence length from a saved SentenceTransformer."""
+    settings = {"pooling": "mean", "normalize": False, "max_seq_length": 256}
+
+    modules_path = model_path / "modules.json"
+    if modules_path.exists():
+        with open(modules_path, "r", encoding="utf-8") as file:
+            modules = json.load(file)
+        settings["normalize"] = any(module["type"].endswith("Normalize") for module in modules)
+        for module in modules:
+            pooling_config = model_path / module["path"] / "config.json"
+            if module["type"].endswith("Pooling") and pooling_config.exists():
+                with open(pooling_config, "r", encoding="utf-8") as file:
+                    pooling = json.load(file)
+                settings["pooling"] = "cls" if pooling.get("pooling_mode_cls_token") else "mean"
+
+    bert_config = model_path / "sentence_bert_config.json"
+    if bert_config.exists():
+        with open(bert_config, "r", encoding="utf-8") as file:
+            settings["max_seq_length"] = json.load(file).get("max_seq_length", settings["max_seq_length"])
+
+    return settings
+
+
+def export_quantized_onnx(
+    model_path: str = Config.EMBEDDING_MODEL_PATH,
+    output_dir: str = Config.ONNX_MODEL_DIR,
+) -> Path:
+    """
+    Export the SentenceTransformer's transformer to ONNX and quantize it to int8.
+
+    Pooling and normalization are not part of the graph; `OnnxEncoder` applies
+    them with NumPy using the settings saved next to the model.
+
+    Args:
+        model_path (str): Directory of the saved SentenceTransformer.
+        output_dir (str): Directory the ONNX model, tokenizer and settings are written to.
+
+    Returns:
+        Path: Path of the quantized model.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModel
+
+    source = Path(model_path)
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(source)
+    model = AutoModel.from_pretrained(source).eval()
+    settings = _read_sentence_transformer_settings(source)
+    settings["dim"] = model.config.hidden_size
+
+    dummy = tokenizer(["export"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(dummy[name] for name in input_names),
+            str(output / FP32_MODEL_FILE),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+
+    quantize_dynamic(str(output / FP32_MODEL_FILE), str(output / INT8_MODEL_FILE), weight_type=QuantType.QInt8)
+    tokenizer.save_pretrained(output)
+    with open(output / SETTINGS_FILE, "w", encoding="utf-8") as file:
+        json.dump(settings, file, indent=2)
+
+    logger.info(f"Quantized ONNX model written to {output / INT8_MODEL_FILE}")
+    return output / INT8_MODEL_FILE
+
+
+class OnnxEncoder:
+    """
+    ONNX Runtime CPU encoder exposing the subset of the SentenceTransformer API
+    used by `EmbeddingWrapper` (`encode` and `get_sentence_embedding_dimension`).
+    """
+
+    def __init__(self, model_dir: str = Config.ONNX_MODEL_DIR, num_threads: int = Config.ONNX_NUM_THREADS) -> None:
+        """
+        Load the quantized model and its tokenizer.
+
+        Args:
+            model_dir (str): Directory written by `export_quantized_onnx`.
+            num_threads (int): ONNX Runtime intra-op threads; 0 lets the runtime decide.
+        """
+        directory = Path(model_dir)
+        with open(directory / SETTINGS_FILE, "r", encoding="utf-8") as file:
+            self.settings: Dict[str, Any] = json.load(file)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(directory)
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(directory / INT8_MODEL_FILE), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.settings["dim"]
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        show_progress_bar: bool = False,
+        **kwargs: Any,
+    ) -> np.ndarray:
+        """
+        Embed one text or a list of texts.
+
+        Args:
+            sentences (Union[str, List[str]]): Text(s) to embed.
+            batch_size (int): Number of texts per inference call.
+            convert_to_numpy (bool): Accepted for API compatibility; output is always NumPy.
+            show_progress_bar (bool): Accepted for API compatibility.
+
+        Returns:
+            np.ndarray: A 1D embedding for a single text, else a (len, dim) float32 matrix.
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        embeddings = np.empty((len(texts), self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        # Sorting by length keeps padding, and therefore wasted compute, low within a batch
+        order = sorted(range(len(texts)), key=lambda position: len(texts[position]))
+        for start in range(0, len(order), batch_size):
+            positions = order[start:start + batch_size]
+            embeddings[positions] = self._encode_batch([texts[position] for position in positions])
+
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        tokens = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.settings["max_seq_length"],
+            return_tensors="np",
+        )
+        feeds = {name: tokens[name].astype(np.int64) for name in self.input_names}
+        hidden = self.session.run(None, feeds)[0]
+
+        if self.settings["pooling"] == "cls":
+            pooled = hidden[:, 0]
+        else:
+            mask = tokens["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        if self.settings["normalize"]:
+            pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32)
+
+
+def check_parity(texts: List[str], threshold: float = Config.ONNX_PARITY_THRESHOLD) -> Dict[str, float]:
+    """
+    Compare ONNX embeddings with the PyTorch SentenceTransformer embeddings.
+
+    Args:
+        texts (List[str]): Texts to embed with both backends.
+        threshold (float): Minimum acceptable cosine similarity for any text.
+
+    Returns:
+        Dict[str, float]: Minimum and mean cosine similarity.
+
+    Raises:
+        ValueError: If any text falls below the threshold.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    reference = SentenceTransformer(Config.EMBEDDING_MODEL_PATH).encode(texts, convert_to_numpy=True)
+    candidate = OnnxEncoder().encode(texts)
+
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    candidate = candidate / np.linalg.norm(candidate, axis=1, keepdims=True)
+    cosines = (reference * candidate).sum(axis=1)
+
+    result = {"min_cosine": float(cosines.min()), "mean_cosine": float(cosines.mean())}
+    if result["min_cosine"] < threshold:
+        raise ValueError(f"ONNX embeddings diverge from torch: {result}, threshold {threshold}")
+    return result
+
+
+def _benchmark_encoder(encoder: Any, texts: List[str], repeats: int) -> Dict[str, float]:
+    """Measure single-query latency percentiles and batch throughput of an encoder."""
+    encoder.encode(texts[0])  # warm-up
+
+    latencies = []
+    for _ in range(repeats):
+        for text in texts:
+            start = time.perf_counter()
+            encoder.encode(text)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        encoder.encode(texts, batch_size=32)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "batch_texts_per_sec": len(texts) * repeats / batch_seconds,
+    }
+
+
+def benchmark(texts: List[str], repeats: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmark the torch and ONNX backends on the same texts.
+
+    Args:
+        texts (List[str]): Texts used for both single-query and batch runs.
+        repeats (int): Number of passes over the texts.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Per-backend latency, throughput and the
+        growth in peak RSS caused by loading and running it.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    results = {}
+    for name, load in (
+        ("onnx-int8", lambda: OnnxEncoder()),
+        ("torch", lambda: SentenceTransformer(Config.EMBEDDING_MODEL_PATH)),
+    ):
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        encoder = load()
+        results[name] = _benchmark_encoder(encoder, texts, repeats)
+        results[name]["peak_rss_growth_mb"] = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+
+    return results
+
+
+def _load_texts(texts_file: Optional[str]) -> List[str]:
+    if not texts_file:
+        return SAMPLE_TEXTS
+    with open(texts_file, "r", encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export, validate and benchmark the ONNX embedding backend.")
+    parser.add_argument("command", choices=["export", "check", "benchmark"])
+    parser.add_argument("--texts-file", help="File with one text per line used by check/benchmark")
+    parser.add_argument("--repeats", type=int, default=5, help="Benchmark passes over the texts")
+    args = parser.parse_args()
+
+    texts = _load_texts(args.texts_file)
+    if args.command == "export":
+        export_quantized_onnx()
+        print(json.dumps(check_parity(texts), indent=2))
+    elif args.command == "check":
+        print(json.dumps(check_parity(texts), indent=2))
+    else:
+        print(json.dumps(benchmark(texts, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase a query and collapse its whitespace, so trivially different spellings share a cache entry."""
+    return " ".join(query.lower().split())
+
+
+class QueryEmbeddingCache:
+    """Bounded, thread-safe LRU cache with a time-to-live for query embeddings."""
+
+    def __init__(
+        self, max_size: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_size (int): Maximum number of cached embeddings.
+            ttl_seconds (float): Seconds after which an entry expires.
+            clock (Callable[[], float]): Source of the current time in seconds.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        """
+        Return a cached embedding and mark it as recently used.
+
+        Args:
+            key (Hashable): Cache key.
+
+        Returns:
+            Optional[np.ndarray]: The embedding, or None on a miss or expired entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self.clock() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, embedding: np.ndarray) -> None:
+        """Store an embedding, evicting the least recently used entry when full."""
+        # Cached arrays are shared between callers, so they must not be mutated in place
+        embedding.setflags(write=False)
+        with self._lock:
+            self._entries[key] = (self.clock(), embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
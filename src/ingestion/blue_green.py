@@ -0,0 +1,153 @@
+import threading
+from typing import List, Optional
+
+from loguru import logger
+
+from src.config.config import Config
+from src.embedder.embedder import EmbeddingWrapper
+from src.ingestion.incremental_sync import IncrementalSync, SyncReport
+from src.ingestion.parallel import ParallelIngestion
+from src.ingestion.pipeline import IngestionPipeline
+from src.ingestion.progress import IngestionProgress
+from src.parser.csv_parser import CsvParser
+from src.parser.threatmon_parser import FileProcessor
+from src.qdrant.qdrant_utils import QdrantWrapper
+from src.retrieval.relationship_graph import collection_graph_path
+
+
+class BlueGreenReindexer:
+    """
+    Rebuild the index into a shadow collection and swap the serving alias atomically.
+
+    Queries keep hitting the current collection through the alias until the new
+    one has been built and validated; older versions are then garbage-collected.
+    """
+
+    def __init__(
+        self,
+        parser: CsvParser,
+        qdrant_client: QdrantWrapper,
+        embedder: EmbeddingWrapper,
+        parallel: Optional[ParallelIngestion] = None,
+        file_processor: Optional[FileProcessor] = None,
+        validation_queries: List[str] = Config.REINDEX_VALIDATION_QUERIES,
+        min_points: int = Config.REINDEX_MIN_POINTS,
+        versions_to_keep: int = Config.COLLECTION_VERSIONS_TO_KEEP,
+    ) -> None:
+        """
+        Initialize the reindexer.
+
+        Args:
+            parser (CsvParser): Parser for the dataset directory.
+            qdrant_client (QdrantWrapper): Wrapper bound to the serving alias.
+            embedder (EmbeddingWrapper): Embedder used for validation queries.
+            parallel (Optional[ParallelIngestion]): Process pool used for embedding.
+            file_processor (Optional[FileProcessor]): When given, YARA/IOC files of the
+                dataset directory are indexed into the shadow collection as well.
+            validation_queries (List[str]): Queries that must return results from the shadow collection.
+            min_points (int): Minimum number of points the shadow collection must hold.
+            versions_to_keep (int): Physical collections kept, including the serving one.
+        """
+        self.parser = parser
+        self.qdrant_client = qdrant_client
+        self.embedder = embedder
+        self.parallel = parallel
+        self.file_processor = file_processor
+        self.validation_queries = validation_queries
+        self.min_points = min_points
+        self.versions_to_keep = max(1, versions_to_keep)
+
+    def reindex(
+        self,
+        progress: Optional[IngestionProgress] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> SyncReport:
+        """
+        Build, validate and publish a new collection version.
+
+        Args:
+            progress (Optional[IngestionProgress]): Tracker for the build.
+            cancel_event (Optional[threading.Event]): Cancels the build when set.
+
+        Returns:
+            SyncReport: Report of the build into the shadow collection.
+
+        Raises:
+            ValueError: If the shadow collection fails validation; it is then dropped.
+        """
+        alias = self.qdrant_client.collection_name
+        shadow_name = self.qdrant_client.new_collection_name(alias)
+        shadow = QdrantWrapper(
+            collection_name=shadow_name, client=self.qdrant_client.client, profile=self.qdrant_client.profile
+        )
+        logger.info(f"Building shadow collection {shadow_name}")
+
+        try:
+            report = IncrementalSync(self.parser, shadow, parallel=self.parallel).sync(progress, cancel_event)
+            self.ingest_threat_intel(shadow)
+            self.validate(shadow)
+        except BaseException:
+            logger.error(f"Dropping shadow collection {shadow_name}")
+            self.qdrant_client.delete_collection(shadow_name)
+            collection_graph_path(shadow_name).unlink(missing_ok=True)
+            raise
+
+        self.qdrant_client.swap_alias(shadow_name)
+        self.garbage_collect()
+        return report
+
+    def ingest_threat_intel(self, shadow: QdrantWrapper) -> None:
+        """Index the YARA/IOC files of the dataset directory into the shadow collection."""
+        if self.file_processor is None:
+            return
+
+        pipeline = IngestionPipeline(shadow)
+        for file_list in self.file_processor.find_all_files(self.parser.data_dir).values():
+            for file_path in file_list:
+                records = self.file_processor.iter_records(file_path)
+                pipeline.run(self.file_processor.iter_embedded_batches(records))
+
+    def validate(self, shadow: QdrantWrapper) -> None:
+        """
+        Check point count and sample queries against a shadow collection.
+
+        Args:
+            shadow (QdrantWrapper): Wrapper bound to the shadow collection.
+
+        Raises:
+            ValueError: If a check fails.
+        """
+        points_count = shadow.count_points()
+        if points_count < self.min_points:
+            raise ValueError(f"Shadow collection holds {points_count} points, expected at least {self.min_points}")
+
+        for query in self.validation_queries:
+            if not shadow.search(self.embedder.generate_embeddings(query), 1):
+                raise ValueError(f"Validation query returned no results: {query}")
+
+        logger.info(f"Shadow collection {shadow.collection_name} validated with {points_count} points")
+
+    def garbage_collect(self) -> List[str]:
+        """
+        Delete old physical versions of the alias, keeping the newest `versions_to_keep`.
+
+        Returns:
+            List[str]: Names of the deleted collections.
+        """
+        alias = self.qdrant_client.collection_name
+        current = self.qdrant_client.get_alias_target(alias)
+        # Versions sort by their timestamp suffix; the pre-alias collection sorts first
+        versions = sorted(
+            (
+                name for name in self.qdrant_client.list_collection_names()
+                if name.startswith(f"{alias}-") and name != current
+            ),
+            key=lambda name: (name[len(alias) + 1:].isdigit(), name),
+        )
+        stale = versions[:max(0, len(versions) - (self.versions_to_keep - 1))]
+
+        for name in stale:
+            self.qdrant_client.delete_collection(name)
+            collection_graph_path(name).unlink(missing_ok=True)
+            logger.info(f"Deleted old collection version {name}")
+        return stale
@@ -0,0 +1,184 @@
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from src.config.config import Config
+from src.ingestion.incremental_sync import IncrementalSync
+from src.ingestion.pipeline import IngestionPipeline
+from src.parser.threatmon_parser import FileProcessor, ThreatIntelRecord
+from src.qdrant.qdrant_utils import QdrantWrapper
+
+
+FileSignature = Tuple[int, int]
+
+
+class DatasetWatcher:
+    """
+    Poll the dataset directory and apply row-level deltas to the live collection.
+
+    CAPEC IDs are deduplicated across the CSV views, so any CSV change is applied
+    by re-running the (hash-based) CSV sync; YARA/IOC files are diffed one file
+    at a time through `FileProcessor`. Changes are accumulated until the
+    directory has been quiet for `debounce_seconds`, so a burst of writes
+    results in a single update. Changes are applied under `write_lock`, shared
+    with `IngestionJob`, and held back while a run owns it.
+    """
+
+    def __init__(
+        self,
+        csv_sync: IncrementalSync,
+        file_processor: FileProcessor,
+        qdrant_client: QdrantWrapper,
+        pipeline: Optional[IngestionPipeline] = None,
+        poll_interval: float = Config.WATCH_POLL_INTERVAL,
+        debounce_seconds: float = Config.WATCH_DEBOUNCE_SECONDS,
+        write_lock: Optional[threading.Lock] = None,
+    ) -> None:
+        """
+        Initialize the watcher.
+
+        Args:
+            csv_sync (IncrementalSync): Sync of the CAPEC CSV files; its parser's data directory is watched.
+            file_processor (FileProcessor): Parser for YARA and IOC files.
+            qdrant_client (QdrantWrapper): Wrapper around the live collection.
+            pipeline (Optional[IngestionPipeline]): Pipeline used to upsert changed rows.
+            poll_interval (float): Seconds between directory scans.
+            debounce_seconds (float): Quiet period required before changes are applied.
+            write_lock (Optional[threading.Lock]): Lock held by every writer to the
+                collection, e.g. `IngestionJob.write_lock`; pending changes are held
+                back while another writer holds it.
+        """
+        self.csv_sync = csv_sync
+        self.csv_parser = csv_sync.parser
+        self.file_processor = file_processor
+        self.qdrant_client = qdrant_client
+        self.pipeline = pipeline or IngestionPipeline(qdrant_client)
+        self.root = self.csv_parser.data_dir
+        self.poll_interval = poll_interval
+        self.debounce_seconds = debounce_seconds
+        self.write_lock = write_lock or threading.Lock()
+
+        self._snapshot: Dict[Path, FileSignature] = {}
+        self._changed: Set[Path] = set()
+        self._removed: Set[Path] = set()
+        self._last_change_at: Optional[float] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def scan(self) -> Dict[Path, FileSignature]:
+        """Return the (mtime, size) signature of every watched file."""
+        paths = list(self.csv_parser.list_files())
+        for file_list in self.file_processor.find_all_files(self.root).values():
+            paths.extend(file_list)
+
+        snapshot: Dict[Path, FileSignature] = {}
+        for path in paths:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def start(self) -> None:
+        """Take the initial snapshot and start polling in a background thread."""
+        self._snapshot = self.scan()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="dataset-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {self.root} for dataset changes")
+
+    def stop(self) -> None:
+        """Stop polling and wait for the watcher thread to exit."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Dataset watcher failed: {str(e)}")
+
+    def poll(self) -> None:
+        """Scan once, record changes, and apply them if the debounce window has elapsed."""
+        current = self.scan()
+
+        for path, signature in current.items():
+            if self._snapshot.get(path) != signature:
+                self._changed.add(path)
+                self._removed.discard(path)
+                self._last_change_at = time.monotonic()
+
+        for path in self._snapshot.keys() - current.keys():
+            self._removed.add(path)
+            self._changed.discard(path)
+            self._last_change_at = time.monotonic()
+
+        self._snapshot = current
+
+        if self._last_change_at is None:
+            return
+        if time.monotonic() - self._last_change_at < self.debounce_seconds:
+            return
+        # Never write next to a running ingestion; the changes are retried on the next poll
+        if not self.write_lock.acquire(blocking=False):
+            return
+
+        try:
+            changed, removed = sorted(self._changed), sorted(self._removed)
+            self._changed, self._removed = set(), set()
+            self._last_change_at = None
+            self.apply(changed, removed)
+        finally:
+            self.write_lock.release()
+
+    def apply(self, changed: List[Path], removed: List[Path]) -> None:
+        """
+        Apply the deltas of changed files and drop the points of removed files.
+
+        Args:
+            changed (List[Path]): Files that were added or modified.
+            removed (List[Path]): Files that no longer exist.
+        """
+        if any(path.suffix.lower() == ".csv" for path in changed + removed):
+            self.csv_sync.sync()
+
+        for path in removed:
+            if path.suffix.lower() != ".csv":
+                self.qdrant_client.delete_source_file(str(path))
+
+        for path in changed:
+            if path.suffix.lower() == ".csv":
+                continue
+            try:
+                self._apply_file(path)
+            except Exception as e:
+                logger.error(f"Failed to apply changes of {path}: {str(e)}")
+
+        logger.info(f"Applied dataset changes: {len(changed)} changed, {len(removed)} removed files")
+
+    def _apply_file(self, path: Path) -> None:
+        """Upsert new or changed chunks of a YARA/IOC file and delete chunks that disappeared from it."""
+        stored_hashes = self.qdrant_client.fetch_content_hashes(source_file=str(path))
+        current_ids = set()
+        upserted = [0]
+
+        def pending_records() -> Iterator[ThreatIntelRecord]:
+            # The file is streamed rule by rule, so large rule packs are never held whole
+            for record in self.file_processor.iter_records(path):
+                current_ids.add(record["id"])
+                if stored_hashes.get(record["id"]) != record["content_hash"]:
+                    upserted[0] += 1
+                    yield record
+
+        self.pipeline.run(self.file_processor.iter_embedded_batches(pending_records()))
+
+        stale_ids = [point_id for point_id in stored_hashes if point_id not in current_ids]
+        self.qdrant_client.delete_points(stale_ids)
+
+        logger.info(f"{path.name}: {upserted[0]} chunks upserted, {len(stale_ids)} chunks deleted")
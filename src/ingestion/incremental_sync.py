@@ -0,0 +1,166 @@
+import threading
+from typing import Iterable, Iterator, List, Optional, TypedDict
+
+from loguru import logger
+
+from src.config.config import Config
+from src.ingestion.parallel import ParallelIngestion
+from src.ingestion.pipeline import IngestionPipeline
+from src.ingestion.progress import IngestionProgress
+from src.parser.csv_parser import CsvParser, ProcessedChunk, RowRecord
+from src.qdrant.qdrant_utils import QdrantWrapper
+from src.retrieval.relationship_graph import RelationshipGraph, serving_graph_path
+
+
+class SyncReport(TypedDict):
+    """Type definition for the outcome of an incremental sync."""
+    added: int
+    updated: int
+    deleted: int
+    unchanged: int
+
+
+class IngestionCancelled(Exception):
+    """Raised inside a sync when its cancel event is set."""
+
+
+class IncrementalSync:
+    """Bring a Qdrant collection in line with the CSV dataset, re-embedding only changed rows."""
+
+    def __init__(
+        self,
+        parser: CsvParser,
+        qdrant_client: QdrantWrapper,
+        pipeline: Optional[IngestionPipeline] = None,
+        parallel: Optional[ParallelIngestion] = None,
+    ) -> None:
+        """
+        Initialize the sync with the parser that reads the dataset and the target collection.
+
+        Args:
+            parser (CsvParser): Parser for the dataset directory.
+            qdrant_client (QdrantWrapper): Wrapper around the target collection.
+            pipeline (Optional[IngestionPipeline]): Pipeline used to upsert embedded rows.
+            parallel (Optional[ParallelIngestion]): Process pool used for embedding;
+                rows are embedded in-process when omitted.
+        """
+        self.parser = parser
+        self.qdrant_client = qdrant_client
+        self.pipeline = pipeline or IngestionPipeline(qdrant_client)
+        self.parallel = parallel
+
+    def sync(
+        self,
+        progress: Optional[IngestionProgress] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> SyncReport:
+        """
+        Embed and upsert new or changed rows, and delete rows that disappeared.
+
+        Args:
+            progress (Optional[IngestionProgress]): Tracker updated as files are
+                diffed and rows are upserted.
+            cancel_event (Optional[threading.Event]): When set, the sync stops
+                before the next file or embedded batch; rows already upserted
+                are kept and stale rows are not deleted.
+
+        Returns:
+            SyncReport: Counts of added, updated, deleted and unchanged rows.
+
+        Raises:
+            IngestionCancelled: If `cancel_event` is set during the sync.
+        """
+        if progress is not None:
+            progress.start(len(self.parser.list_files()))
+
+        stored_payloads = {
+            point_id: payload
+            for point_id, payload in self.qdrant_client.scroll_payloads(
+                ["content_hash", "source_file", "source_views"]
+            ).items()
+            # Points of YARA/IOC files are owned by the dataset watcher, not this sync
+            if str(payload.get("source_file") or ".csv").endswith(".csv")
+        }
+        stored_hashes = {point_id: payload.get("content_hash") for point_id, payload in stored_payloads.items()}
+        counts = {"added": 0, "updated": 0, "unchanged": 0}
+        seen_ids = set()
+        failed_files: List[str] = []
+
+        def pending_records() -> Iterator[RowRecord]:
+            # Only row texts are held here; embeddings are produced batch by batch downstream
+            file_records: List[RowRecord] = []
+            for records in self.parser.iter_file_records(failed_files):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise IngestionCancelled("Ingestion cancelled")
+                file_records.extend(records)
+                if progress is not None:
+                    progress.add_file_done(len(records))
+
+            # The CAPEC views overlap heavily, so each CAPEC ID is indexed once (as field-level children)
+            pending: List[RowRecord] = []
+            for record in self.parser.index_records(file_records):
+                seen_ids.add(record["id"])
+                stored_hash = stored_hashes.get(record["id"], _MISSING)
+                if failed_files and _belongs_to(stored_payloads.get(record["id"], {}), failed_files):
+                    # Merged without an unreadable view, the entry would lose it; the stored point is kept as is
+                    counts["unchanged"] += 1
+                    continue
+                if stored_hash is _MISSING:
+                    counts["added"] += 1
+                elif stored_hash != record["content_hash"]:
+                    counts["updated"] += 1
+                else:
+                    counts["unchanged"] += 1
+                    continue
+                pending.append(record)
+
+            if progress is not None:
+                progress.set_rows_pending(len(pending))
+            # Saved before the first upsert, so lookups rebuilt on the resulting change see the new graph.
+            # Without every view the graph would be incomplete, so the previous one is kept then.
+            if Config.RELATIONSHIP_GRAPH_ENABLED and not failed_files:
+                RelationshipGraph.from_records(file_records).save(serving_graph_path(self.qdrant_client))
+            yield from pending
+
+        if self.parallel is not None:
+            batches = self.parallel.iter_embedded_batches(pending_records())
+        else:
+            batches = self.parser.iter_embedded_batches(pending_records())
+        self.pipeline.run(_cancellable(batches, cancel_event), progress)
+
+        # Rows of a file that failed to read (e.g. mid-write) are missing, not deleted
+        stale_ids = [
+            point_id for point_id, payload in stored_payloads.items()
+            if point_id not in seen_ids and not _belongs_to(payload, failed_files)
+        ]
+        if failed_files:
+            logger.warning(f"Kept the stored rows of unreadable files {failed_files}")
+        self.qdrant_client.delete_points(stale_ids)
+
+        report = SyncReport(
+            added=counts["added"],
+            updated=counts["updated"],
+            deleted=len(stale_ids),
+            unchanged=counts["unchanged"],
+        )
+        if progress is not None:
+            progress.finish()
+        logger.info(f"Incremental sync finished: {report}")
+        return report
+
+
+def _belongs_to(payload: dict, file_names: List[str]) -> bool:
+    """Check whether a stored point was read from any of the given files."""
+    views = [payload.get("source_file"), *(payload.get("source_views") or [])]
+    return any(view in file_names for view in views)
+
+
+def _cancellable(batches: Iterable[List[ProcessedChunk]], cancel_event: Optional[threading.Event]) -> Iterator[List[ProcessedChunk]]:
+    """Yield embedded batches until `cancel_event` is set; most of a sync is spent here."""
+    for batch in batches:
+        if cancel_event is not None and cancel_event.is_set():
+            raise IngestionCancelled("Ingestion cancelled")
+        yield batch
+
+
+_MISSING = object()
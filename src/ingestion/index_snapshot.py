@@ -0,0 +1,309 @@
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from src.config.config import Config
+from src.ingestion.pipeline import IngestionPipeline
+from src.parser.csv_parser import CsvParser, ProcessedChunk
+from src.qdrant.qdrant_utils import CHILD_PAYLOAD_FIELDS
+from src.qdrant.qdrant_utils import QdrantWrapper
+from src.retrieval.relationship_graph import RelationshipGraph, serving_graph_path
+from src.utils.utils import hash_text
+
+
+class IndexSnapshot:
+    """
+    Versioned, Qdrant-independent index artifact.
+
+    A snapshot directory holds:
+        - `embeddings.npy`: float32 matrix, one row per point
+        - `payloads.jsonl`: one compact JSON record per point, in matrix order
+        - `manifest.json`: model name/version, embedding backend, dimension, point count and dataset hash
+        - `relationships.npz`: the CAPEC relationship graph, when enabled
+    """
+
+    FORMAT_VERSION = 1
+    EMBEDDINGS_FILE = "embeddings.npy"
+    PAYLOADS_FILE = "payloads.jsonl"
+    MANIFEST_FILE = "manifest.json"
+    GRAPH_FILE = "relationships.npz"
+
+    def __init__(self, path: Path) -> None:
+        """
+        Open an existing snapshot directory.
+
+        Args:
+            path (Path): Snapshot directory.
+        """
+        self.path = Path(path)
+        with open(self.path / self.MANIFEST_FILE, "r", encoding="utf-8") as file:
+            self.manifest: Dict[str, Any] = json.load(file)
+
+    @classmethod
+    def build(cls, parser: CsvParser, output_root: str = Config.INDEX_SNAPSHOT_DIR) -> "IndexSnapshot":
+        """
+        Embed the dataset and write a new snapshot, without touching Qdrant.
+
+        Args:
+            parser (CsvParser): Parser for the dataset directory.
+            output_root (str): Directory under which the versioned snapshot is created.
+
+        Returns:
+            IndexSnapshot: The snapshot that was written.
+        """
+        rows = parser.collect_records()
+        records = parser.index_records(rows)
+        dim = parser.embedder.model.get_sentence_embedding_dimension()
+
+        version = f"{Config.EMBEDDING_MODEL}-{Config.EMBEDDING_VERSION_NUMBER}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        path = Path(output_root) / version
+        path.mkdir(parents=True, exist_ok=False)
+
+        # Rows are written batch by batch into a memory-mapped .npy, so the matrix is never held whole
+        embeddings = np.lib.format.open_memmap(
+            path / cls.EMBEDDINGS_FILE, mode="w+", dtype=np.float32, shape=(len(records), dim)
+        )
+        row = 0
+        with open(path / cls.PAYLOADS_FILE, "w", encoding="utf-8") as payloads:
+            for batch in parser.iter_embedded_batches(records):
+                for chunk in batch:
+                    embeddings[row] = chunk["embeddings"]
+                    record = {key: value for key, value in chunk.items() if key != "embeddings"}
+                    payloads.write(json.dumps(record, separators=(",", ":")) + "\n")
+                    row += 1
+        embeddings.flush()
+        del embeddings
+        if Config.RELATIONSHIP_GRAPH_ENABLED:
+            RelationshipGraph.from_records(rows).save(path / cls.GRAPH_FILE)
+
+        manifest = {
+            "format_version": cls.FORMAT_VERSION,
+            "embedding_model": Config.EMBEDDING_MODEL,
+            "embedding_version": Config.EMBEDDING_VERSION_NUMBER,
+            "embedding_backend": Config.EMBEDDING_BACKEND,
+            "dim": dim,
+            "count": row,
+            "dataset_hash": hash_text("".join(record["content_hash"] for record in records)),
+            "created_at": datetime.now().isoformat(),
+        }
+        with open(path / cls.MANIFEST_FILE, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2)
+
+        logger.info(f"Index snapshot with {row} points written to {path}")
+        return cls(path)
+
+    @classmethod
+    def export(cls, qdrant_client: QdrantWrapper, output_root: str = Config.LOCAL_INDEX_DIR, keep: int = 1) -> "IndexSnapshot":
+        """
+        Dump the live collection, vectors and payloads included, into a new snapshot.
+
+        Unlike `build`, this captures every point in the collection (threat intel
+        included) without embedding anything. Pages are written out as they are
+        scrolled, so neither the vectors nor the payloads are held whole. Older
+        snapshots under `output_root` are removed, keeping the newest `keep`.
+
+        Args:
+            qdrant_client (QdrantWrapper): Wrapper around the collection to export.
+            output_root (str): Directory under which the versioned snapshot is created.
+            keep (int): Number of snapshots to keep under `output_root`, this one included.
+
+        Returns:
+            IndexSnapshot: The snapshot that was written.
+        """
+        version = f"{Config.EMBEDDING_MODEL}-{Config.EMBEDDING_VERSION_NUMBER}-{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        path = Path(output_root) / version
+        path.mkdir(parents=True, exist_ok=False)
+
+        # The point count is only known after the scroll, so vectors go to a raw file first
+        raw_path = path / f"{cls.EMBEDDINGS_FILE}.raw"
+        count, dim = 0, None
+        content_hashes: List[str] = []
+        with open(raw_path, "wb") as raw, open(path / cls.PAYLOADS_FILE, "w", encoding="utf-8") as payloads:
+            for page in qdrant_client.iter_points():
+                for point_id, vector, payload in page:
+                    vector = np.asarray(vector, dtype=np.float32)
+                    dim = dim or len(vector)
+                    raw.write(vector.tobytes())
+                    fields = {field: payload[field] for field in Config.PAYLOAD_INDEX_FIELDS if field in payload}
+                    record = {
+                        "id": point_id,
+                        "text": payload.get("text"),
+                        "metadata": payload.get("metadata"),
+                        "content_hash": payload.get("content_hash"),
+                        "source_file": payload.get("source_file"),
+                        "source_views": payload.get("source_views"),
+                        "fields": fields,
+                        **{key: payload[key] for key in CHILD_PAYLOAD_FIELDS if key in payload},
+                    }
+                    payloads.write(json.dumps(record, separators=(",", ":")) + "\n")
+                    content_hashes.append(str(record["content_hash"]))
+                    count += 1
+        dim = dim or 384
+
+        embeddings = np.lib.format.open_memmap(
+            path / cls.EMBEDDINGS_FILE, mode="w+", dtype=np.float32, shape=(count, dim)
+        )
+        if count:
+            raw_vectors = np.memmap(raw_path, dtype=np.float32, mode="r", shape=(count, dim))
+            for start in range(0, count, Config.INGESTION_BATCH_SIZE):
+                embeddings[start:start + Config.INGESTION_BATCH_SIZE] = raw_vectors[start:start + Config.INGESTION_BATCH_SIZE]
+            del raw_vectors
+        embeddings.flush()
+        del embeddings
+        os.remove(raw_path)
+
+        graph_path = serving_graph_path(qdrant_client)
+        if graph_path.exists():
+            shutil.copyfile(graph_path, path / cls.GRAPH_FILE)
+
+        manifest = {
+            "format_version": cls.FORMAT_VERSION,
+            "embedding_model": Config.EMBEDDING_MODEL,
+            "embedding_version": Config.EMBEDDING_VERSION_NUMBER,
+            "embedding_backend": Config.EMBEDDING_BACKEND,
+            "dim": dim,
+            "count": count,
+            "dataset_hash": hash_text("".join(sorted(content_hashes))),
+            "created_at": datetime.now().isoformat(),
+        }
+        # The manifest is written last, so a partially written export is never picked up
+        with open(path / cls.MANIFEST_FILE, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2)
+
+        older = sorted(
+            (candidate for candidate in Path(output_root).iterdir() if candidate.is_dir() and candidate != path),
+            key=lambda candidate: candidate.name,
+        )
+        for stale in older[:max(len(older) - (keep - 1), 0)]:
+            shutil.rmtree(stale, ignore_errors=True)
+
+        logger.info(f"Exported {count} points of {qdrant_client.collection_name} to {path}")
+        return cls(path)
+
+    @classmethod
+    def find_latest(cls, root: str = Config.INDEX_SNAPSHOT_DIR) -> Optional["IndexSnapshot"]:
+        """
+        Return the newest snapshot built with the configured embedding model, version and backend.
+
+        Args:
+            root (str): Directory holding snapshot directories.
+
+        Returns:
+            Optional[IndexSnapshot]: The newest compatible snapshot, or None.
+        """
+        root_path = Path(root)
+        if not root_path.is_dir():
+            return None
+
+        candidates = []
+        for manifest_path in root_path.glob(f"*/{cls.MANIFEST_FILE}"):
+            try:
+                snapshot = cls(manifest_path.parent)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable snapshot {manifest_path.parent}: {e}")
+                continue
+            if snapshot.is_compatible():
+                candidates.append(snapshot)
+
+        if not candidates:
+            return None
+        return max(candidates, key=lambda snapshot: snapshot.manifest["created_at"])
+
+    def is_compatible(self) -> bool:
+        """
+        Check that the snapshot was built with the configured embedding model, version and backend.
+
+        The ONNX export may be quantized, so its vectors are not interchangeable
+        with the torch model's. Manifests written before the backend was
+        recorded were all built with torch.
+        """
+        return (
+            self.manifest.get("format_version") == self.FORMAT_VERSION
+            and self.manifest.get("embedding_model") == Config.EMBEDDING_MODEL
+            and self.manifest.get("embedding_version") == Config.EMBEDDING_VERSION_NUMBER
+            and self.manifest.get("embedding_backend", "torch") == Config.EMBEDDING_BACKEND
+        )
+
+    def iter_chunk_batches(self, batch_size: int = Config.INGESTION_BATCH_SIZE) -> Iterator[List[ProcessedChunk]]:
+        """
+        Stream the snapshot back as batches of processed chunks.
+
+        Args:
+            batch_size (int): Number of chunks per batch.
+
+        Yields:
+            List[ProcessedChunk]: Chunks ready for `IngestionPipeline.run`.
+        """
+        embeddings = np.load(self.path / self.EMBEDDINGS_FILE, mmap_mode="r")
+        batch: List[ProcessedChunk] = []
+
+        with open(self.path / self.PAYLOADS_FILE, "r", encoding="utf-8") as payloads:
+            for row, line in enumerate(payloads):
+                chunk = json.loads(line)
+                chunk["embeddings"] = embeddings[row]
+                batch.append(chunk)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+
+        if batch:
+            yield batch
+
+    def restore(self, qdrant_client: QdrantWrapper, pipeline: Optional[IngestionPipeline] = None) -> int:
+        """
+        Bulk-load the snapshot into the collection without re-embedding.
+
+        Args:
+            qdrant_client (QdrantWrapper): Wrapper around the target collection.
+            pipeline (Optional[IngestionPipeline]): Pipeline used for the upserts.
+
+        Returns:
+            int: Number of points restored.
+        """
+        logger.info(f"Restoring index snapshot {self.path.name} ({self.manifest['count']} points)")
+        pipeline = pipeline or IngestionPipeline(qdrant_client)
+        return pipeline.run(self.iter_chunk_batches())
+
+
+def restore_latest_snapshot(qdrant_client: QdrantWrapper, root: str = Config.INDEX_SNAPSHOT_DIR) -> bool:
+    """
+    Restore the newest compatible snapshot into an empty collection.
+
+    Args:
+        qdrant_client (QdrantWrapper): Wrapper around the target collection.
+        root (str): Directory holding snapshot directories.
+
+    Returns:
+        bool: True if a snapshot was restored.
+    """
+    if qdrant_client.count_points() > 0:
+        return False
+
+    snapshot = IndexSnapshot.find_latest(root)
+    if snapshot is None:
+        logger.info("No compatible index snapshot found, building the index from the dataset")
+        return False
+
+    snapshot.restore(qdrant_client)
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build an offline index snapshot from the CAPEC dataset.")
+    parser.add_argument("--data-dir", default=Config.DATA_DIRECTORY, help="Directory containing the CAPEC CSV files")
+    parser.add_argument("--output", default=Config.INDEX_SNAPSHOT_DIR, help="Directory under which the snapshot is written")
+    args = parser.parse_args()
+
+    snapshot = IndexSnapshot.build(CsvParser(data_dir=args.data_dir), args.output)
+    print(snapshot.path)
+
+
+if __name__ == "__main__":
+    main()
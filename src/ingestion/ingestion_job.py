@@ -0,0 +1,159 @@
+import threading
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+
+from src.ingestion.blue_green import BlueGreenReindexer
+from src.ingestion.incremental_sync import IncrementalSync, IngestionCancelled, SyncReport
+from src.ingestion.progress import IngestionProgress
+
+
+class IngestionState(str, Enum):
+    """Lifecycle of a background ingestion job."""
+    PENDING = "pending"
+    RUNNING = "running"
+    READY = "ready"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class IngestionJob:
+    """
+    Run an incremental sync in a background thread and expose its state.
+
+    The collection is updated in place, so the previously ingested index keeps
+    serving queries while a run is in progress. A run holds `write_lock`, which
+    other writers to the collection (the dataset watcher) share.
+    """
+
+    def __init__(
+        self,
+        sync: IncrementalSync,
+        restore_snapshot: Optional[Callable[[], Any]] = None,
+        reindexer: Optional[BlueGreenReindexer] = None,
+        on_ready: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        """
+        Initialize the job.
+
+        Args:
+            sync (IncrementalSync): Sync executed on every run.
+            restore_snapshot (Optional[Callable[[], Any]]): Called before the sync,
+                e.g. to bulk-load a prebuilt index into an empty collection so the
+                sync finds nothing left to embed.
+            reindexer (Optional[BlueGreenReindexer]): Used for full rebuilds into a
+                shadow collection.
+            on_ready (Optional[Callable[[], Any]]): Called after every successful run,
+                e.g. to export the collection; its failure does not fail the run.
+        """
+        self.sync = sync
+        self.restore_snapshot = restore_snapshot
+        self.reindexer = reindexer
+        self.on_ready = on_ready
+        self.state = IngestionState.PENDING
+        self.progress = IngestionProgress()
+        self.report: Optional[SyncReport] = None
+        self.error: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self._cancel_event = threading.Event()
+
+    @property
+    def is_running(self) -> bool:
+        return self.state == IngestionState.RUNNING
+
+    def start(self, rebuild: bool = False) -> bool:
+        """
+        Start a run in a background thread.
+
+        Args:
+            rebuild (bool): Rebuild the whole index into a shadow collection and
+                swap it in, instead of syncing the serving collection in place.
+
+        Returns:
+            bool: False if a run is already in progress, True otherwise.
+
+        Raises:
+            ValueError: If a rebuild is requested but no reindexer is configured.
+        """
+        if rebuild and self.reindexer is None:
+            raise ValueError("Full rebuilds need a BlueGreenReindexer")
+
+        with self._lock:
+            if self.is_running:
+                return False
+            self.state = IngestionState.RUNNING
+            self.report = None
+            self.error = None
+            self._cancel_event.clear()
+            self._thread = threading.Thread(target=self._run, args=(rebuild,), name="ingestion-job", daemon=True)
+            self._thread.start()
+            return True
+
+    def cancel(self) -> bool:
+        """
+        Ask the running sync or rebuild to stop.
+
+        Cancellation is not immediate: the run checks for it between files and
+        between embedded batches, so the batch being embedded or upserted still
+        completes, and rows already upserted are kept.
+
+        Returns:
+            bool: False if no run is in progress, True otherwise.
+        """
+        if not self.is_running:
+            return False
+        self._cancel_event.set()
+        return True
+
+    def _run(self, rebuild: bool) -> None:
+        """Hold the write lock for the whole run, so no other writer interleaves with it."""
+        with self.write_lock:
+            self._execute(rebuild)
+
+    def _execute(self, rebuild: bool) -> None:
+        """Execute the sync or rebuild and record the outcome."""
+        try:
+            logger.info("Background ingestion started")
+            if rebuild:
+                self.report = self.reindexer.reindex(self.progress, self._cancel_event)
+            else:
+                if self.restore_snapshot is not None:
+                    self.restore_snapshot()
+                self.report = self.sync.sync(self.progress, self._cancel_event)
+            self.state = IngestionState.READY
+            logger.info("Background ingestion finished")
+            self._notify_ready()
+        except IngestionCancelled:
+            logger.info("Background ingestion cancelled")
+            self.progress.finish()
+            self.state = IngestionState.CANCELLED
+        except Exception as e:
+            logger.error(f"Error in data ingestion: {str(e)}")
+            self.progress.finish()
+            self.error = str(e)
+            self.state = IngestionState.FAILED
+
+    def _notify_ready(self) -> None:
+        if self.on_ready is None:
+            return
+        try:
+            self.on_ready()
+        except Exception as e:
+            logger.error(f"Post-ingestion hook failed: {str(e)}")
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Return a JSON-serializable view of the job.
+
+        Returns:
+            Dict[str, Any]: State, progress counters, last report and last error.
+        """
+        return {
+            "state": self.state.value,
+            "progress": self.progress.snapshot(),
+            "report": self.report,
+            "error": self.error,
+        }
@@ -0,0 +1,138 @@
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from src.config.config import Config
+from src.parser.csv_parser import CsvParser, ProcessedChunk, RowRecord
+
+
+# Embedding model loaded once per worker process by `_init_worker`
+_worker_embedder = None
+
+
+def _init_worker(torch_threads: int) -> None:
+    """Limit intra-op threads and load the embedding model in a pool worker."""
+    global _worker_embedder
+
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+    import torch
+    from src.embedder.embedder import EmbeddingWrapper
+
+    torch.set_num_threads(torch_threads)
+    # The persistent cache is owned by the parent process; workers only run forward passes
+    _worker_embedder = EmbeddingWrapper(use_cache=False)
+
+
+def _embed_shard(texts: List[str]) -> np.ndarray:
+    """Embed one shard of row texts inside a pool worker."""
+    return _worker_embedder.generate_batch_embeddings(texts)
+
+
+class ParallelIngestion:
+    """
+    Embed row records across a process pool.
+
+    Each CSV file is split into row shards of at most `shard_size` rows; shards
+    are embedded by worker processes and yielded as chunk batches in completion
+    order, ready for `IngestionPipeline.run`. The number of shards in flight is
+    bounded so memory stays flat.
+    """
+
+    def __init__(
+        self,
+        parser: CsvParser,
+        num_workers: int = Config.INGESTION_PROCESSES,
+        torch_threads: int = Config.INGESTION_TORCH_THREADS,
+        shard_size: int = Config.INGESTION_SHARD_SIZE,
+    ) -> None:
+        """
+        Initialize the parallel embedder.
+
+        Args:
+            parser (CsvParser): Parser whose records are embedded; its embedder's
+                cache is consulted before shards are sent to the pool.
+            num_workers (int): Number of worker processes.
+            torch_threads (int): Torch intra-op threads per worker.
+            shard_size (int): Maximum rows per shard.
+        """
+        self.parser = parser
+        self.num_workers = max(1, num_workers)
+        self.torch_threads = max(1, torch_threads)
+        self.shard_size = max(1, shard_size)
+
+    def iter_shards(self, records: Iterable[RowRecord]) -> Iterator[List[RowRecord]]:
+        """Split a record stream into shards that never span two source files."""
+        shard: List[RowRecord] = []
+
+        for record in records:
+            if shard and (
+                len(shard) >= self.shard_size
+                or shard[-1]["source_file"] != record["source_file"]
+            ):
+                yield shard
+                shard = []
+            shard.append(record)
+
+        if shard:
+            yield shard
+
+    def iter_embedded_batches(self, records: Iterable[RowRecord]) -> Iterator[List[ProcessedChunk]]:
+        """
+        Embed a record stream across the process pool.
+
+        Args:
+            records (Iterable[RowRecord]): Row records to embed.
+
+        Yields:
+            List[ProcessedChunk]: One batch of embedded chunks per shard.
+        """
+        embedder = self.parser.embedder
+        in_flight: Dict[Future, Tuple[List[RowRecord], np.ndarray, List[int], List[str]]] = {}
+        max_in_flight = self.num_workers * 2
+
+        logger.info(f"Starting ingestion pool with {self.num_workers} processes")
+        with ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.torch_threads,),
+        ) as pool:
+            for shard in self.iter_shards(records):
+                texts = [record["text"] for record in shard]
+                embeddings, missing, hashes = embedder.lookup_cached(texts)
+
+                if not missing:
+                    yield self.parser.build_chunks(shard, embeddings)
+                    continue
+
+                future = pool.submit(_embed_shard, [texts[position] for position in missing])
+                in_flight[future] = (shard, embeddings, missing, hashes)
+
+                if len(in_flight) >= max_in_flight:
+                    yield from self._collect(in_flight)
+
+            while in_flight:
+                yield from self._collect(in_flight)
+
+    def _collect(self, in_flight: Dict[Future, Tuple]) -> Iterator[List[ProcessedChunk]]:
+        """Wait for at least one finished shard, cache its embeddings and turn it into chunks."""
+        done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+
+        for future in done:
+            shard, embeddings, missing, hashes = in_flight.pop(future)
+            encoded = future.result()
+            embeddings[missing] = encoded
+            self.parser.embedder.store_cached([hashes[position] for position in missing], encoded)
+            yield self.parser.build_chunks(shard, embeddings)
+
+
+def make_parallel_ingestion(parser: CsvParser) -> Optional[ParallelIngestion]:
+    """Return a ParallelIngestion when `Config.INGESTION_PROCESSES` enables it, else None."""
+    if Config.INGESTION_PROCESSES > 0:
+        return ParallelIngestion(parser)
+    return None
@@ -0,0 +1,118 @@
+import queue
+import threading
+from typing import Iterable, List, Optional
+
+from loguru import logger
+
+from src.config.config import Config
+from src.ingestion.progress import IngestionProgress
+from src.parser.csv_parser import ProcessedChunk
+from src.qdrant.qdrant_utils import QdrantWrapper
+
+
+class IngestionPipeline:
+    """
+    Stream batches of processed chunks into Qdrant through a bounded queue.
+
+    The caller's thread produces batches (parsing and embedding) while a pool of
+    upload workers drains the queue, so embedding and network I/O overlap and
+    at most `queue_size` batches are held in memory at once.
+    """
+
+    def __init__(
+        self,
+        qdrant_client: QdrantWrapper,
+        num_workers: int = Config.INGESTION_UPLOAD_WORKERS,
+        queue_size: int = Config.INGESTION_QUEUE_SIZE,
+    ) -> None:
+        """
+        Initialize the pipeline.
+
+        Args:
+            qdrant_client (QdrantWrapper): Wrapper around the target collection.
+            num_workers (int): Number of concurrent upload workers.
+            queue_size (int): Maximum number of batches waiting for upload.
+        """
+        self.qdrant_client = qdrant_client
+        self.num_workers = max(1, num_workers)
+        self.queue_size = max(1, queue_size)
+
+    def run(self, batches: Iterable[List[ProcessedChunk]], progress: Optional[IngestionProgress] = None) -> int:
+        """
+        Consume the batch iterator and upsert every batch.
+
+        Args:
+            batches (Iterable[List[ProcessedChunk]]): Lazily produced chunk batches.
+            progress (Optional[IngestionProgress]): Tracker credited with every uploaded chunk.
+
+        Returns:
+            int: Number of chunks upserted.
+
+        Raises:
+            Exception: The first error raised by the producer or an upload worker.
+        """
+        batch_queue: "queue.Queue[Optional[List[ProcessedChunk]]]" = queue.Queue(maxsize=self.queue_size)
+        stop_event = threading.Event()
+        errors: List[Exception] = []
+        uploaded = [0]
+        counter_lock = threading.Lock()
+
+        def upload_worker() -> None:
+            while True:
+                batch = batch_queue.get()
+                try:
+                    if batch is None:
+                        return
+                    if stop_event.is_set():
+                        continue
+                    self.qdrant_client.upsert_chunks(batch)
+                    with counter_lock:
+                        uploaded[0] += len(batch)
+                    if progress is not None:
+                        progress.add_rows_embedded(len(batch))
+                except Exception as e:
+                    logger.error(f"Upload worker failed: {str(e)}")
+                    errors.append(e)
+                    stop_event.set()
+                finally:
+                    batch_queue.task_done()
+
+        workers = [
+            threading.Thread(target=upload_worker, name=f"qdrant-upload-{i}", daemon=True)
+            for i in range(self.num_workers)
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            for batch in batches:
+                if stop_event.is_set():
+                    break
+                if not batch:
+                    continue
+                self._put(batch_queue, batch, stop_event)
+        except Exception as e:
+            logger.error(f"Batch producer failed: {str(e)}")
+            errors.append(e)
+            stop_event.set()
+        finally:
+            for _ in workers:
+                batch_queue.put(None)
+            for worker in workers:
+                worker.join()
+
+        if errors:
+            raise errors[0]
+
+        logger.info(f"Pipeline upserted {uploaded[0]} chunks")
+        return uploaded[0]
+
+    @staticmethod
+    def _put(batch_queue: queue.Queue, batch: List[ProcessedChunk], stop_event: threading.Event) -> None:
+        """Block until the batch is queued, giving up if a worker has failed."""
+        while not stop_event.is_set():
+            try:
+                batch_queue.put(batch, timeout=0.5)
+                return
+            except queue.Full:
+                continue
@@ -0,0 +1,86 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class IngestionProgress:
+    """Thread-safe counters describing how far an ingestion run has got."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.files_total = 0
+        self.files_done = 0
+        self.rows_seen = 0
+        self.rows_embedded = 0
+        self.rows_pending: Optional[int] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def start(self, files_total: int) -> None:
+        """Reset the counters for a run over `files_total` files."""
+        with self._lock:
+            self.files_total = files_total
+            self.files_done = 0
+            self.rows_seen = 0
+            self.rows_embedded = 0
+            self.rows_pending = None
+            self.started_at = time.monotonic()
+            self.finished_at = None
+
+    def finish(self) -> None:
+        """Stop the clock used for throughput figures."""
+        with self._lock:
+            self.finished_at = time.monotonic()
+
+    def add_file_done(self, rows: int) -> None:
+        """Record that a file with `rows` rows has been read and diffed."""
+        with self._lock:
+            self.files_done += 1
+            self.rows_seen += rows
+
+    def set_rows_pending(self, rows: int) -> None:
+        """Record how many rows need embedding once every file has been diffed."""
+        with self._lock:
+            self.rows_pending = rows
+
+    def add_rows_embedded(self, rows: int) -> None:
+        """Record that `rows` rows have been embedded and upserted."""
+        with self._lock:
+            self.rows_embedded += rows
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the current counters together with derived throughput figures.
+
+        Returns:
+            Dict[str, Any]: Counters plus `elapsed_seconds`, `rows_per_sec` and
+            `eta_seconds`. The ETA is row-based once the rows to embed are known,
+            file-based before that, and None until it can be estimated.
+        """
+        with self._lock:
+            if self.started_at is None:
+                elapsed = 0.0
+            else:
+                elapsed = (self.finished_at or time.monotonic()) - self.started_at
+
+            rows_per_sec = self.rows_embedded / elapsed if elapsed > 0 else 0.0
+
+            eta_seconds = None
+            if self.finished_at is not None:
+                eta_seconds = 0.0
+            elif self.rows_pending is not None:
+                if rows_per_sec > 0:
+                    eta_seconds = max(self.rows_pending - self.rows_embedded, 0) / rows_per_sec
+            elif self.files_done:
+                eta_seconds = elapsed / self.files_done * (self.files_total - self.files_done)
+
+            return {
+                "files_total": self.files_total,
+                "files_done": self.files_done,
+                "rows_seen": self.rows_seen,
+                "rows_embedded": self.rows_embedded,
+                "rows_pending": self.rows_pending,
+                "elapsed_seconds": round(elapsed, 2),
+                "rows_per_sec": round(rows_per_sec, 2),
+                "eta_seconds": None if eta_seconds is None else round(eta_seconds, 2),
+            }
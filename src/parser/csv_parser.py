@@ -1,14 +1,16 @@
 
+import re
 import pandas as pd
-from typing import List, Dict, Any, Optional, TypedDict
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, TypedDict, Union
 from pathlib import Path
 import numpy as np
-from src.embedder.embedder import EmbeddingWrapper
 
 from datetime import datetime
 from dataclasses import dataclass
 from loguru import logger
 from src.config.config import Config
+from src.utils.utils import hash_text, make_point_id
+from src.utils.model_registry import get_embedding_model
 
 
 @dataclass
@@ -23,24 +25,121 @@ class DocumentMetadata(TypedDict):
 
 
 
-class ProcessedChunk(TypedDict):
-    """Type definition for processed file chunks."""
+class CapecFields(TypedDict):
+    """Structured CAPEC columns stored as top-level, indexed payload fields."""
+    capec_id: str
+    abstraction: Optional[str]
+    status: Optional[str]
+    likelihood: Optional[str]
+    typical_severity: Optional[str]
+    related_cwe_ids: List[str]
+
+
+
+class _RowRecordBase(TypedDict):
+    id: str
+    capec_id: str
+    text: str
+    content_hash: str
+    source_file: str
+    source_views: List[str]
+
+
+
+class RowRecord(_RowRecordBase, total=False):
+    """
+    Type definition for a parsed row that has not been embedded yet; only CAPEC rows carry `fields`.
+
+    `sections` holds the (column, value) pairs a row was read from. Field-level
+    child records set `parent_id`, `field` and `chunk_index` instead.
+    """
+    fields: CapecFields
+    sections: List[Tuple[str, str]]
+    parent_id: str
+    field: str
+    chunk_index: int
+
+
+
+class _ProcessedChunkBase(TypedDict):
+    id: str
     embeddings: List[float]
     text: str
-    metadata: str
+    metadata: Union[str, Dict[str, Any]]
+    content_hash: str
+    source_file: str
+    source_views: List[str]
+
+
+
+class ProcessedChunk(_ProcessedChunkBase, total=False):
+    """Type definition for processed file chunks; `fields` become top-level payload fields."""
+    fields: CapecFields
+    parent_id: str
+    field: str
+    chunk_index: int
+
+
+
+# Short descriptive columns embedded together as one "Summary" child of a CAPEC entry
+SUMMARY_COLUMNS = ("Abstraction", "Status", "Likelihood Of Attack", "Typical Severity", "Alternate Terms")
+CHILD_HEADER_SEPARATOR = " | "
+
+
+def join_sections(sections: Iterable[Tuple[str, str]]) -> str:
+    """Join (column, value) pairs into the "Column: value | Column: value" text that is embedded."""
+    return " | ".join(f"{col}: {value}" for col, value in sections)
+
+
+def split_text(text: str, max_chars: int) -> List[str]:
+    """
+    Split a field value into pieces of at most `max_chars` characters.
+
+    CAPEC list columns separate their items with "::", so pieces are packed
+    from whole items where possible and cut at whitespace otherwise.
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    pieces: List[str] = []
+    current = ""
+    for item in (part.strip() for part in text.split("::")):
+        if not item:
+            continue
+        while len(item) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            cut = item.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(item[:cut].strip())
+            item = item[cut:].strip()
+        if not item:
+            continue
+
+        candidate = f"{current} :: {item}" if current else item
+        if len(candidate) > max_chars:
+            pieces.append(current)
+            current = item
+        else:
+            current = candidate
+
+    if current:
+        pieces.append(current)
+    return pieces
 
 
 
 class CsvParser:
 
-    def __init__(self, data_dir: str, embedding_version: str =  Config.EMBEDDING_VERSION_NUMBER, embedding_model_name: str = Config.EMBEDDING_MODEL) -> None:
+    def __init__(self, data_dir: str, embedding_version: str =  Config.EMBEDDING_VERSION_NUMBER, embedding_model_name: str = Config.EMBEDDING_MODEL, batch_size: int = Config.EMBEDDING_BATCH_SIZE) -> None:
         self.data_dir = Path(data_dir)
         self.embedding_version = embedding_version
         self.embedding_model_name = embedding_model_name
-        self.embedder = EmbeddingWrapper()
-        self.chunks: List[ProcessedChunk] = []
+        self.batch_size = batch_size
+        self.embedder = get_embedding_model()
 
-    def create_document_metadata(self, row: pd.Series, file_name: str,) -> DocumentMetadata:
+    def create_document_metadata(self, row: Optional[pd.Series], file_name: str,) -> DocumentMetadata:
         """Create comprehensive document metadata"""
         current_time = datetime.now().isoformat()
         
@@ -75,76 +174,319 @@ class CsvParser:
         return df
 
 
-    def process_file(self, file_path: Path) -> None:
-        """Process a single CSV file with enhanced metadata and version control"""
-        try:
-            logger.info(f"Processing file: {file_path}")
-            
-            # Read CSV file
-            df = self.read_file(file_path)
-                        
-            for _, row in df.iterrows():
-                # Combine text fields
-                text_content = self.get_text(row)
-                
-                # Create comprehensive metadata
-                metadata = self.create_document_metadata(row, file_path.name)
-                embeddings = self.embedder.generate_embeddings(text_content)
+    def read_records(self, file_path: Path) -> List[RowRecord]:
+        """
+        Read a CSV file into row records carrying a deterministic point ID and content hash.
 
+        The point ID is derived from the CAPEC ID and the source file name, so the
+        same row maps to the same Qdrant point across restarts.
 
-                # Create Document object with enhanced metadata
-                doc : ProcessedChunk = {
-                    "embeddings": embeddings,
-                    "text":text_content,
-                    "metadata":"metadata"
-                }
+        Args:
+            file_path: Path to the CSV file
 
+        Returns:
+            List[RowRecord]: One record per row, in row order
+        """
+        df = self.read_file(file_path)
+
+        # Build all row texts at once so they can be embedded in batched forward passes
+        sections = self.get_sections(df)
+        texts = [join_sections(row_sections) for row_sections in sections]
+
+        if "ID" in df.columns:
+            capec_ids = df["ID"].astype(str).str.strip().tolist()
+        else:
+            # Without an ID column rows cannot be matched across views, so key them by file
+            capec_ids = [f"{file_path.name}:{position}" for position in range(len(df))]
+
+        return [
+            RowRecord(
+                id=make_point_id(file_path.name, capec_id),
+                capec_id=capec_id,
+                text=text_content,
+                content_hash=hash_text(text_content),
+                source_file=file_path.name,
+                source_views=[file_path.name],
+                fields=fields,
+                sections=sections,
+            )
+            for capec_id, text_content, fields, sections in zip(
+                capec_ids, texts, self.get_fields(df, capec_ids), sections
+            )
+        ]
+
+
+    def get_sections(self, df: pd.DataFrame) -> List[List[Tuple[str, str]]]:
+        """
+        Return the non-empty, whitespace-stripped (column, value) pairs of every row.
 
-                self.chunks.append(doc)
-                            
-            logger.info(f"Successfully processed all documents from {file_path}")
+        These are the only cleaning rules for row content: the row text and the
+        field-level child texts are all built from them with `join_sections`.
 
-            
-        except Exception as e:
-            logger.error(f"Error processing file {file_path}: {str(e)}")
-            raise
+        Args:
+            df: pandas DataFrame read through `read_file`
 
+        Returns:
+            List[List[Tuple[str, str]]]: Column/value pairs for each row, in column order
+        """
+        column_values = []
+
+        for col in df.columns:
+            values = df[col]
+            cleaned = values.astype(str).str.strip()
+            keep = values.notna() & (cleaned != "")
+            column_values.append((col, cleaned.where(keep, "").tolist()))
 
+        return [
+            [(col, values[position]) for col, values in column_values if values[position]]
+            for position in range(len(df))
+        ]
 
-    def get_text(self, row: pd.Series) -> str:
+
+    @staticmethod
+    def get_fields(df: pd.DataFrame, capec_ids: List[str]) -> List[CapecFields]:
         """
-        Combine all columns into text field, excluding null values and cleaning the text.
-        
+        Extract the structured, filterable columns of every row.
+
         Args:
-            row: pandas Series containing row data
-            
+            df: pandas DataFrame read through `read_file`
+            capec_ids: CAPEC ID of each row
+
         Returns:
-            str: Combined text from all columns
+            List[CapecFields]: Structured fields for each row, in row order
         """
-        text_parts = []
-        
-        # Process each column in the row
-        for col, value in row.items():  # Change here to access both col and value
-            cleaned_text = str(value).strip() if pd.notna(value) else ""
-            if cleaned_text:  # Only include non-empty values
-                text_parts.append(f"{col}: {cleaned_text}")
+        def column(name: str) -> List[Optional[str]]:
+            if name not in df.columns:
+                return [None] * len(df)
+            values = df[name].astype(str).str.strip()
+            return values.where(df[name].notna() & (values != ""), None).tolist()
+
+        return [
+            CapecFields(
+                capec_id=capec_id,
+                abstraction=abstraction,
+                status=status,
+                likelihood=likelihood,
+                typical_severity=severity,
+                # "Related Weaknesses" holds bare CWE numbers, e.g. "::89::1286::"
+                related_cwe_ids=list(dict.fromkeys(re.findall(r"\d+", weaknesses or ""))),
+            )
+            for capec_id, abstraction, status, likelihood, severity, weaknesses in zip(
+                capec_ids,
+                column("Abstraction"),
+                column("Status"),
+                column("Likelihood Of Attack"),
+                column("Typical Severity"),
+                column("Related Weaknesses"),
+            )
+        ]
+
+
+    @staticmethod
+    def dedupe_records(records: Iterable[RowRecord]) -> List[RowRecord]:
+        """
+        Collapse rows sharing a CAPEC ID across views into a single record.
 
-        # Join all parts with a separator
-        return " | ".join(text_parts)
+        The surviving record keeps the text of the first occurrence (files are
+        read in sorted order), lists every view it appears in, and gets a point
+        ID derived from the CAPEC ID alone. Its content hash covers the view
+        list, so a change in view membership updates the point.
 
+        Args:
+            records: Row records read from one or more files
 
-    def process_directory(self) -> List[Dict[str, Any]]:
-        """Process all CSV files in directory"""
-        all_documents = []
-        
-        logger.info("Attempting to read all .csv files and indexing....")
-        for file_path in self.data_dir.glob('*.csv'):
+        Returns:
+            List[RowRecord]: One record per CAPEC ID, in first-seen order
+        """
+        unique: Dict[str, RowRecord] = {}
+
+        for record in records:
+            existing = unique.get(record["capec_id"])
+            if existing is None:
+                unique[record["capec_id"]] = RowRecord(**{**record, "source_views": list(record["source_views"])})
+            elif record["source_file"] not in existing["source_views"]:
+                existing["source_views"].append(record["source_file"])
+
+        for record in unique.values():
+            record["id"] = make_point_id("capec", record["capec_id"])
+            # The payload schema version is hashed too, so points stored under an older schema are rewritten
+            record["content_hash"] = hash_text(
+                f"{record['text']}|{','.join(record['source_views'])}|{Config.PAYLOAD_SCHEMA_VERSION}"
+            )
+
+        return list(unique.values())
+
+
+    def index_records(self, records: Iterable[RowRecord]) -> List[RowRecord]:
+        """
+        Turn the rows of every view into the records that are indexed.
+
+        Rows are deduplicated by CAPEC ID and, with `Config.FIELD_CHUNKING`,
+        split into one child record per field.
+
+        Args:
+            records: Row records read from one or more files
+
+        Returns:
+            List[RowRecord]: Records to embed and upsert
+        """
+        unique = self.dedupe_records(records)
+        return self.split_fields(unique) if Config.FIELD_CHUNKING else unique
+
+
+    @staticmethod
+    def split_fields(records: Iterable[RowRecord]) -> List[RowRecord]:
+        """
+        Split CAPEC rows into field-level child records.
+
+        The short descriptive columns form one "Summary" child; every other column
+        becomes its own child, split further when longer than
+        `Config.FIELD_CHUNK_CHARS`, so no field is truncated out of the embedding
+        window. Each child text starts with a "CAPEC-<id> <name>" header and
+        points at its row through `parent_id`.
+
+        Args:
+            records: Deduplicated row records carrying `sections`
+
+        Returns:
+            List[RowRecord]: Child records; rows without sections are kept whole
+        """
+        children: List[RowRecord] = []
+
+        for record in records:
+            sections = record.get("sections")
+            if not sections:
+                children.append(record)
+                continue
+
+            values = dict(sections)
+            header = f"CAPEC-{record['capec_id']} {values.get('Name', '')}".strip()
+            summary = join_sections([(col, value) for col, value in sections if col in SUMMARY_COLUMNS])
+
+            pieces = [("Summary", 0, summary)] if summary else []
+            for col, value in sections:
+                if col in SUMMARY_COLUMNS or col in ("ID", "Name"):
+                    continue
+                pieces.extend((col, part, piece) for part, piece in enumerate(split_text(value, Config.FIELD_CHUNK_CHARS)))
+
+            for chunk_index, (field, part, piece) in enumerate(pieces):
+                text = f"{header}{CHILD_HEADER_SEPARATOR}{piece if field == 'Summary' else join_sections([(field, piece)])}"
+                children.append(RowRecord(
+                    id=make_point_id("capec", f"{record['capec_id']}#{field}#{part}"),
+                    capec_id=record["capec_id"],
+                    text=text,
+                    content_hash=hash_text(
+                        f"{text}|{','.join(record['source_views'])}|{Config.PAYLOAD_SCHEMA_VERSION}"
+                    ),
+                    source_file=record["source_file"],
+                    source_views=record["source_views"],
+                    fields=record["fields"],
+                    parent_id=record["id"],
+                    field=field,
+                    chunk_index=chunk_index,
+                ))
+
+        return children
+
+
+    def list_files(self) -> List[Path]:
+        """Return the CSV files of the data directory in a stable order"""
+        return sorted(self.data_dir.glob('*.csv'))
+
+
+    def iter_file_records(self, failed_files: Optional[List[str]] = None) -> Iterator[List[RowRecord]]:
+        """
+        Yield the row records of each CSV file in the directory, one file at a time
+
+        Args:
+            failed_files: When given, the names of files that could not be read are appended to it
+        """
+        for file_path in self.list_files():
             try:
-                self.process_file(file_path)
+                records = self.read_records(file_path)
             except Exception as e:
                 logger.error(f"Skipping file {file_path} due to error: {str(e)}")
+                if failed_files is not None:
+                    failed_files.append(file_path.name)
                 continue
-            
-        
-        logger.info("All .csv files processed. Returning chunks...")
-        return self.chunks
\ No newline at end of file
+            yield records
+
+
+    def collect_records(self) -> List[RowRecord]:
+        """Read row records from every CSV file in the directory without embedding them"""
+        records: List[RowRecord] = []
+
+        for file_records in self.iter_file_records():
+            records.extend(file_records)
+
+        return records
+
+
+    def iter_embedded_batches(self, records: Iterable[RowRecord], batch_size: int = Config.INGESTION_BATCH_SIZE) -> Iterator[List[ProcessedChunk]]:
+        """
+        Embed row records lazily and yield them as batches of processed chunks.
+
+        Only one batch of embeddings is alive at a time, so memory stays flat
+        regardless of how many records are fed in.
+
+        Args:
+            records: Row records to embed
+            batch_size: Number of chunks per yielded batch
+
+        Yields:
+            List[ProcessedChunk]: Batches of embedded chunks
+        """
+        pending: List[RowRecord] = []
+
+        for record in records:
+            pending.append(record)
+            if len(pending) >= batch_size:
+                yield self.embed_records(pending)
+                pending = []
+
+        if pending:
+            yield self.embed_records(pending)
+
+
+    def embed_records(self, records: List[RowRecord]) -> List[ProcessedChunk]:
+        """
+        Embed row records in batches and turn them into processed chunks.
+
+        Args:
+            records: Row records returned by `read_records`
+
+        Returns:
+            List[ProcessedChunk]: Chunks ready to be upserted into Qdrant
+        """
+        embeddings = self.embed_texts([record["text"] for record in records])
+        return self.build_chunks(records, embeddings)
+
+
+    def build_chunks(self, records: List[RowRecord], embeddings: np.ndarray) -> List[ProcessedChunk]:
+        """Pair row records with their embedding rows to form processed chunks"""
+        return [
+            ProcessedChunk(
+                id=record["id"],
+                embeddings=row_embedding,
+                text=record["text"],
+                metadata=dict(self.create_document_metadata(None, record["source_file"])),
+                content_hash=record["content_hash"],
+                source_file=record["source_file"],
+                source_views=record["source_views"],
+                **{key: record[key] for key in ("fields", "parent_id", "field", "chunk_index") if key in record},
+            )
+            for record, row_embedding in zip(records, embeddings)
+        ]
+
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed row texts in batches of `self.batch_size`.
+
+        Args:
+            texts: List of row texts
+
+        Returns:
+            np.ndarray: Contiguous float32 matrix with one embedding per text
+        """
+        return self.embedder.generate_batch_embeddings(texts, batch_size=self.batch_size)
@@ -1,8 +1,12 @@
 import os
+import re
 from pathlib import Path
-from typing import Dict, List, Optional, Union, TypedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union, TypedDict
 
-from src.embedder.embedder import EmbeddingWrapper
+from src.config.config import Config
+from src.parser.csv_parser import RowRecord, ProcessedChunk as IndexedChunk
+from src.utils.utils import hash_text, make_point_id
+from src.utils.model_registry import get_embedding_model
 
 
 class ProcessedChunk(TypedDict):
@@ -10,14 +14,77 @@ class ProcessedChunk(TypedDict):
     embeddings: List[float]
     text: str
     document: str
+    rule_name: str
+    file_path: str
+
+
+class ThreatIntelRecord(RowRecord):
+    """Row record for one YARA rule or one group of IOC lines."""
+    rule_name: str
+
+
+YARA_RULE_START = re.compile(r"^\s*(?:(?:private|global)\s+)*rule\s+(\w+)")
+YARA_REGEX_PRECEDER = re.compile(r"(?:=|\bmatches)\s*$")
+
+
+def strip_yara_literals(line: str, in_comment: bool = False) -> Tuple[str, bool]:
+    """
+    Remove quoted strings, regex literals and comments from one line of YARA source.
+
+    Args:
+        line (str): Source line.
+        in_comment (bool): Whether the line starts inside a `/* ... */` comment.
+
+    Returns:
+        Tuple[str, bool]: The remaining code, and whether the line ends inside a block comment.
+    """
+    code: List[str] = []
+    position = 0
+    while position < len(line):
+        if in_comment:
+            end = line.find("*/", position)
+            if end < 0:
+                return "".join(code), True
+            position, in_comment = end + 2, False
+            continue
+
+        char = line[position]
+        if line.startswith("//", position):
+            break
+        if line.startswith("/*", position):
+            position, in_comment = position + 2, True
+            continue
+        # A slash starts a regex only where a value is expected: `$re = /.../` or `matches /.../`
+        if char == '"' or (char == "/" and YARA_REGEX_PRECEDER.search("".join(code))):
+            position += 1
+            while position < len(line) and line[position] != char:
+                position += 2 if line[position] == "\\" else 1
+            position += 1
+            continue
+        code.append(char)
+        position += 1
+
+    return "".join(code), in_comment
 
 
 class FileProcessor:
     """Process YARA and IOC files, generating embeddings and metadata."""
 
-    def __init__(self) -> None:
-        """Initialize the FileProcessor with required components and settings."""
-        self.embedder = EmbeddingWrapper()
+    def __init__(
+        self,
+        ioc_chunk_lines: int = Config.IOC_CHUNK_LINES,
+        batch_size: int = Config.EMBEDDING_BATCH_SIZE,
+    ) -> None:
+        """
+        Initialize the FileProcessor with required components and settings.
+
+        Args:
+            ioc_chunk_lines (int): Maximum number of IOC lines per chunk.
+            batch_size (int): Number of chunks embedded per forward pass.
+        """
+        self.embedder = get_embedding_model()
+        self.ioc_chunk_lines = ioc_chunk_lines
+        self.batch_size = batch_size
         self.yara_extensions = ('.yar', '.yara')
         self.ioc_extensions = ('.txt',)
         self.files_found: Dict[str, List[Path]] = {
@@ -77,7 +144,10 @@ class FileProcessor:
 
     def process_file(self, file_path: Path, file_type: str) -> None:
         """
-        Process a single file (YARA or IOC) and add the processed chunk to self.chunks.
+        Process a single file (YARA or IOC) and add its processed chunks to self.chunks.
+
+        YARA files are split at rule boundaries and IOC files into bounded line
+        groups; the chunks are embedded in batches.
         
         Args:
             file_path (Path): Path to the file to process.
@@ -86,23 +156,201 @@ class FileProcessor:
         Raises:
             Exception: If there's an error processing the file.
         """
-        content = self.read_file(file_path)
         file_name = self.extract_directory_name(file_path)
 
-        if content:
-            try:
-                embeddings = self.embedder.generate_embeddings(content)
-
-                chunk: ProcessedChunk = {
-                    "embeddings": embeddings,
-                    "text": content,
-                    "document": file_name
-                }
-                
-                self.chunks.append(chunk)
-                
-            except Exception as e:
-                print(f"Error processing {file_path.name}: {str(e)}")
+        try:
+            for batch in self.iter_embedded_batches(self.iter_records(file_path)):
+                for chunk in batch:
+                    self.chunks.append({
+                        "embeddings": chunk["embeddings"],
+                        "text": chunk["text"],
+                        "document": file_name,
+                        "rule_name": chunk["metadata"]["rule_name"],
+                        "file_path": chunk["metadata"]["file_path"],
+                    })
+
+        except Exception as e:
+            print(f"Error processing {file_path.name}: {str(e)}")
+
+    def iter_lines(self, file_path: Path) -> Iterator[str]:
+        """
+        Stream the lines of a file without reading it fully into memory.
+
+        Args:
+            file_path (Path): Path to the file to read.
+
+        Yields:
+            str: Lines of the file, without trailing newlines.
+        """
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
+            for line in file:
+                yield line.rstrip("\n")
+
+    def iter_yara_rules(self, file_path: Path) -> Iterator[Dict[str, str]]:
+        """
+        Split a YARA file into one chunk per rule.
+
+        Rule ends are found by brace depth, ignoring braces inside quoted strings,
+        regex literals and comments. Imports and includes outside rules are dropped.
+
+        Args:
+            file_path (Path): Path to the YARA file.
+
+        Yields:
+            Dict[str, str]: `rule_name` and `text` of each rule.
+        """
+        rule_name: Optional[str] = None
+        rule_lines: List[str] = []
+        depth = 0
+        opened = False
+        in_comment = False
+
+        for line in self.iter_lines(file_path):
+            if rule_name is None:
+                match = YARA_RULE_START.match(line)
+                if in_comment or not match:
+                    _, in_comment = strip_yara_literals(line, in_comment)
+                    continue
+                rule_name, rule_lines, depth, opened = match.group(1), [], 0, False
+
+            rule_lines.append(line)
+            code, in_comment = strip_yara_literals(line, in_comment)
+            depth += code.count("{") - code.count("}")
+            opened = opened or "{" in code
+
+            if opened and depth <= 0:
+                yield {"rule_name": rule_name, "text": "\n".join(rule_lines)}
+                rule_name = None
+
+        if rule_name is not None and rule_lines:
+            # Unterminated last rule: keep what was read rather than dropping it
+            yield {"rule_name": rule_name, "text": "\n".join(rule_lines)}
+
+    def iter_ioc_groups(self, file_path: Path) -> Iterator[Dict[str, str]]:
+        """
+        Split an IOC list into groups of at most `ioc_chunk_lines` non-empty lines.
+
+        Args:
+            file_path (Path): Path to the IOC file.
+
+        Yields:
+            Dict[str, str]: `rule_name` (the line range) and `text` of each group.
+        """
+        group: List[str] = []
+        first_line = last_line = 0
+
+        for line_number, line in enumerate(self.iter_lines(file_path), start=1):
+            if not line.strip():
+                continue
+            if not group:
+                first_line = line_number
+            group.append(line.strip())
+            last_line = line_number
+            if len(group) >= self.ioc_chunk_lines:
+                yield {"rule_name": f"lines {first_line}-{last_line}", "text": "\n".join(group)}
+                group = []
+
+        if group:
+            yield {"rule_name": f"lines {first_line}-{last_line}", "text": "\n".join(group)}
+
+    def iter_records(self, file_path: Path) -> Iterator[ThreatIntelRecord]:
+        """
+        Stream the chunks of a YARA or IOC file as records keyed by a deterministic point ID.
+
+        Args:
+            file_path (Path): Path to the file to read.
+
+        Yields:
+            ThreatIntelRecord: One record per YARA rule or IOC line group.
+        """
+        if file_path.suffix.lower() in self.yara_extensions:
+            pieces = self.iter_yara_rules(file_path)
+        else:
+            pieces = self.iter_ioc_groups(file_path)
+
+        seen: Dict[str, int] = {}
+        try:
+            for piece in pieces:
+                # Rule names may repeat inside a pack, so the occurrence count is part of the key
+                occurrence = seen.get(piece["rule_name"], 0)
+                seen[piece["rule_name"]] = occurrence + 1
+
+                yield ThreatIntelRecord(
+                    id=make_point_id(str(file_path), f"{piece['rule_name']}#{occurrence}"),
+                    capec_id="",
+                    text=piece["text"],
+                    content_hash=hash_text(piece["text"]),
+                    source_file=str(file_path),
+                    source_views=[str(file_path)],
+                    rule_name=piece["rule_name"],
+                )
+        except FileNotFoundError:
+            print(f"Error: File '{file_path}' not found")
+
+    def read_records(self, file_path: Path) -> List[ThreatIntelRecord]:
+        """
+        Read all chunk records of a YARA or IOC file.
+
+        Args:
+            file_path (Path): Path to the file to read.
+
+        Returns:
+            List[ThreatIntelRecord]: Records for the file, empty if it cannot be read.
+        """
+        return list(self.iter_records(file_path))
+
+    def embed_records(self, records: List[ThreatIntelRecord]) -> List[IndexedChunk]:
+        """
+        Embed records in one batch and turn them into chunks ready for Qdrant.
+
+        Args:
+            records (List[ThreatIntelRecord]): Records returned by `iter_records`.
+
+        Returns:
+            List[IndexedChunk]: Chunks carrying the directory name, rule name
+            and file path as metadata.
+        """
+        embeddings = self.embedder.generate_batch_embeddings(
+            [record["text"] for record in records], batch_size=self.batch_size
+        )
+
+        return [
+            IndexedChunk(
+                id=record["id"],
+                embeddings=embedding,
+                text=record["text"],
+                metadata={
+                    "document": self.extract_directory_name(record["source_file"]),
+                    "rule_name": record["rule_name"],
+                    "file_path": record["source_file"],
+                },
+                content_hash=record["content_hash"],
+                source_file=record["source_file"],
+                source_views=record["source_views"],
+            )
+            for record, embedding in zip(records, embeddings)
+        ]
+
+    def iter_embedded_batches(self, records: Iterable[ThreatIntelRecord]) -> Iterator[List[IndexedChunk]]:
+        """
+        Embed a record stream in batches of `batch_size`.
+
+        Args:
+            records (Iterable[ThreatIntelRecord]): Records to embed.
+
+        Yields:
+            List[IndexedChunk]: Batches of embedded chunks.
+        """
+        pending: List[ThreatIntelRecord] = []
+
+        for record in records:
+            pending.append(record)
+            if len(pending) >= self.batch_size:
+                yield self.embed_records(pending)
+                pending = []
+
+        if pending:
+            yield self.embed_records(pending)
 
     def extract_directory_name(self, file_path: Union[str, Path]) -> str:
         """
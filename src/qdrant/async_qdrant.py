@@ -0,0 +1,140 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import httpx
+from loguru import logger
+from qdrant_client import AsyncQdrantClient
+
+from src.config.config import Config
+from src.qdrant.collection_profiles import CollectionProfile, get_collection_profile
+from src.qdrant.qdrant_utils import hit_to_result
+from src.qdrant.search_filters import FilterValue, build_search_filter
+
+
+class AsyncQdrantWrapper:
+    """
+    Non-blocking, read-side counterpart of `QdrantWrapper` for the request path.
+
+    Searches go over gRPC when available, and a pooled HTTP connection is used
+    otherwise. The points count of the collection is cached instead of being
+    fetched before every search; call `invalidate` whenever the collection
+    changes and the next search refreshes it.
+    """
+
+    def __init__(
+        self,
+        collection_name: str = Config.COLLECTION_ALIAS,
+        profile: Optional[CollectionProfile] = None,
+        client: Optional[AsyncQdrantClient] = None,
+    ) -> None:
+        """
+        Initialize the wrapper. No request is made until the first search.
+
+        Args:
+            collection_name (str): Collection or alias to search.
+            profile (Optional[CollectionProfile]): Provides the search parameters;
+                defaults to `Config.COLLECTION_PROFILE`.
+            client (Optional[AsyncQdrantClient]): Existing client to reuse.
+        """
+        self.collection_name = collection_name
+        self.profile = profile or get_collection_profile()
+        self.client = client or AsyncQdrantClient(
+            host=Config.QDRANT_HOST,
+            port=Config.QDRANT_PORT,
+            grpc_port=Config.QDRANT_GRPC_PORT,
+            prefer_grpc=Config.QDRANT_PREFER_GRPC,
+            timeout=60,
+            limits=httpx.Limits(
+                max_connections=Config.QDRANT_POOL_SIZE,
+                max_keepalive_connections=Config.QDRANT_POOL_SIZE,
+            ),
+        )
+        self.points_count: Optional[int] = None
+        self._stale = True
+        self._refresh_lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        """Mark the cached collection state as outdated; safe to call from any thread."""
+        self._stale = True
+
+    async def refresh_state(self) -> int:
+        """
+        Fetch the points count of the collection and cache it.
+
+        Returns:
+            int: Number of points.
+
+        Raises:
+            ValueError: If the collection does not exist.
+        """
+        async with self._refresh_lock:
+            if not self._stale and self.points_count is not None:
+                return self.points_count
+
+            # Cleared before the request, so a change made while it is in flight triggers another refresh
+            self._stale = False
+            try:
+                self.points_count = (await self.client.count(self.collection_name, exact=True)).count
+            except Exception as e:
+                self._stale = True
+                if "not found" in str(e).lower():
+                    raise ValueError(
+                        f"Collection '{self.collection_name}' does not exist. "
+                        "Please create it first."
+                    )
+                raise
+            logger.info(f"Collection '{self.collection_name}' holds {self.points_count} points")
+            return self.points_count
+
+    async def search(
+        self,
+        query_vector: List[float],
+        limit: int = 5,
+        filters: Optional[Dict[str, FilterValue]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the collection without blocking the event loop.
+
+        Args:
+            query_vector (List[float]): Vector to search for.
+            limit (int): Number of results to return.
+            filters (Optional[Dict[str, FilterValue]]): Restrict results to points whose
+                payload fields match; see `validate_filters`.
+
+        Returns:
+            List[Dict[str, Any]]: List of search results containing documents and content.
+
+        Raises:
+            ValueError: If the collection is empty or doesn't exist, or a filter field is unknown.
+        """
+        query_filter = build_search_filter(filters)
+        points_count = self.points_count if not self._stale else await self.refresh_state()
+        if not points_count:
+            logger.warning(f"Collection '{self.collection_name}' is empty")
+            raise ValueError(
+                f"The collection '{self.collection_name}' is empty. "
+                "Please ingest data first."
+            )
+
+        try:
+            search_result = await self.client.search(
+                collection_name=self.collection_name,
+                query_vector=list(map(float, query_vector)),
+                limit=limit,
+                query_filter=query_filter,
+                search_params=self.profile.search_params(),
+            )
+        except Exception as e:
+            if "not found" in str(e).lower():
+                self.invalidate()
+                raise ValueError(
+                    f"Collection '{self.collection_name}' does not exist. "
+                    "Please create it first."
+                )
+            raise
+
+        return [hit_to_result(hit.id, hit.score, hit.payload or {}) for hit in search_result]
+
+    async def close(self) -> None:
+        """Close the underlying connections."""
+        await self.client.close()
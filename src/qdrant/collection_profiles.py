@@ -0,0 +1,125 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Union
+
+from qdrant_client.models import (
+    CompressionRatio,
+    Distance,
+    HnswConfigDiff,
+    ProductQuantization,
+    ProductQuantizationConfig,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+)
+
+from src.config.config import Config
+
+
+@dataclass(frozen=True)
+class CollectionProfile:
+    """
+    Storage and index settings a collection is created and searched with.
+
+    `quantization` is one of "none", "scalar" (int8) or "product". Quantized
+    vectors are kept in RAM while the original float32 vectors can live on disk
+    and are only read to rescore the `oversampling * limit` best candidates.
+    """
+    name: str
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 100
+    hnsw_on_disk: bool = False
+    vectors_on_disk: bool = False
+    payload_on_disk: bool = False
+    quantization: str = "none"
+    quantization_always_ram: bool = True
+    rescore: bool = True
+    oversampling: float = 2.0
+    search_ef: Optional[int] = None
+
+    def vectors_config(self, size: int = 384) -> VectorParams:
+        """Return the cosine vector parameters of this profile."""
+        return VectorParams(size=size, distance=Distance.COSINE, on_disk=self.vectors_on_disk)
+
+    def hnsw_config(self) -> HnswConfigDiff:
+        return HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct, on_disk=self.hnsw_on_disk)
+
+    def quantization_config(self) -> Optional[Union[ScalarQuantization, ProductQuantization]]:
+        if self.quantization == "scalar":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8, quantile=0.99, always_ram=self.quantization_always_ram
+                )
+            )
+        if self.quantization == "product":
+            return ProductQuantization(
+                product=ProductQuantizationConfig(
+                    compression=CompressionRatio.X16, always_ram=self.quantization_always_ram
+                )
+            )
+        return None
+
+    def search_params(self) -> SearchParams:
+        """Return the search-time HNSW and rescoring parameters of this profile."""
+        quantization = None
+        if self.quantization != "none":
+            quantization = QuantizationSearchParams(
+                ignore=False, rescore=self.rescore, oversampling=self.oversampling
+            )
+        return SearchParams(hnsw_ef=self.search_ef, quantization=quantization)
+
+    def estimated_ram_bytes(self, points: int, size: int = 384) -> int:
+        """
+        Estimate the resident memory the vectors and HNSW graph of `points` points need.
+
+        Payloads and Qdrant's fixed overhead are not included.
+        """
+        total = 0
+        if not self.vectors_on_disk:
+            total += points * size * 4
+        if self.quantization == "scalar" and self.quantization_always_ram:
+            total += points * size
+        elif self.quantization == "product" and self.quantization_always_ram:
+            total += points * size * 4 // 16
+        if not self.hnsw_on_disk:
+            # Layer 0 keeps up to 2 * m neighbour ids (4 bytes each) per point
+            total += points * self.hnsw_m * 2 * 4
+        return total
+
+
+COLLECTION_PROFILES: Dict[str, CollectionProfile] = {
+    # Original behaviour: float32 vectors, graph and payloads in RAM
+    "default": CollectionProfile(name="default"),
+    "on_disk": CollectionProfile(
+        name="on_disk", vectors_on_disk=True, payload_on_disk=True, hnsw_on_disk=True, search_ef=128
+    ),
+    "scalar": CollectionProfile(
+        name="scalar", vectors_on_disk=True, payload_on_disk=True, quantization="scalar",
+        oversampling=2.0, search_ef=128,
+    ),
+    "product": CollectionProfile(
+        name="product", vectors_on_disk=True, payload_on_disk=True, quantization="product",
+        oversampling=4.0, hnsw_m=32, hnsw_ef_construct=200, search_ef=256,
+    ),
+}
+
+
+def get_collection_profile(name: str = Config.COLLECTION_PROFILE) -> CollectionProfile:
+    """
+    Look up a collection profile by name.
+
+    Args:
+        name (str): Profile name, one of `COLLECTION_PROFILES`.
+
+    Returns:
+        CollectionProfile: The profile.
+
+    Raises:
+        ValueError: If the profile is unknown.
+    """
+    try:
+        return COLLECTION_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown collection profile '{name}', expected one of {sorted(COLLECTION_PROFILES)}")
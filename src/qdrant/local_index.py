@@ -0,0 +1,414 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+from loguru import logger
+
+from src.config.config import Config
+from src.ingestion.index_snapshot import IndexSnapshot
+from src.qdrant.qdrant_utils import hit_to_result
+from src.qdrant.search_filters import FilterValue, payload_matches, validate_filters
+
+
+PointId = Union[int, str]
+
+
+class LocalVectorIndex:
+    """
+    In-process, read-only vector index served from an index snapshot directory.
+
+    Vectors are L2-normalized once into `vectors-normalized.npy` next to the
+    snapshot and memory-mapped, so cosine search is a single matrix-vector
+    product followed by a partial sort. Payload texts stay on disk in
+    `payloads.jsonl` and are read by byte offset for the returned hits only; the
+    filterable fields are the only payload data held in memory. With
+    `use_hnsw`, an hnswlib graph (optional dependency) is built once and used
+    instead of the exact scan.
+    """
+
+    NORMALIZED_FILE = "vectors-normalized.npy"
+    OFFSETS_FILE = "payload-offsets.npy"
+    HNSW_FILE = "hnsw.bin"
+
+    def __init__(self, snapshot: IndexSnapshot, use_hnsw: bool = Config.LOCAL_INDEX_HNSW) -> None:
+        """
+        Open the index, deriving the normalized matrix and payload offsets on first use.
+
+        Args:
+            snapshot (IndexSnapshot): Snapshot holding the vectors and payloads.
+            use_hnsw (bool): Search an HNSW graph instead of scanning every vector.
+        """
+        self.snapshot = snapshot
+        self.path = snapshot.path
+        self._prepare()
+
+        self.vectors = np.load(self.path / self.NORMALIZED_FILE, mmap_mode="r")
+        self.offsets = np.load(self.path / self.OFFSETS_FILE)
+        self.ids: List[PointId] = []
+        self.filter_fields: List[Dict[str, Any]] = []
+        for record in self._iter_records():
+            flat = {**(record.get("fields") or {}), **record}
+            self.ids.append(record["id"])
+            self.filter_fields.append({field: flat.get(field) for field in Config.PAYLOAD_INDEX_FIELDS})
+
+        self.hnsw = self._load_hnsw() if use_hnsw else None
+        logger.info(
+            f"Local vector index over {len(self.ids)} points loaded from {self.path}"
+            f"{' with HNSW graph' if self.hnsw is not None else ''}"
+        )
+
+    @classmethod
+    def open_latest(cls, roots: Optional[List[str]] = None, use_hnsw: bool = Config.LOCAL_INDEX_HNSW) -> Optional["LocalVectorIndex"]:
+        """
+        Open the newest compatible snapshot found under any of the given directories.
+
+        Args:
+            roots (Optional[List[str]]): Snapshot directories, by default the
+                exported live index and the offline build snapshots.
+            use_hnsw (bool): Search an HNSW graph instead of scanning every vector.
+
+        Returns:
+            Optional[LocalVectorIndex]: The index, or None if no snapshot exists.
+        """
+        candidates = [
+            snapshot for snapshot in (
+                IndexSnapshot.find_latest(root) for root in (roots or [Config.LOCAL_INDEX_DIR, Config.INDEX_SNAPSHOT_DIR])
+            )
+            if snapshot is not None
+        ]
+        if not candidates:
+            return None
+        return cls(max(candidates, key=lambda snapshot: snapshot.manifest["created_at"]), use_hnsw)
+
+    def _iter_records(self):
+        with open(self.path / IndexSnapshot.PAYLOADS_FILE, "r", encoding="utf-8") as payloads:
+            for line in payloads:
+                yield json.loads(line)
+
+    def _prepare(self) -> None:
+        """Write the normalized matrix and payload offsets if they do not exist yet."""
+        normalized_path = self.path / self.NORMALIZED_FILE
+        if not normalized_path.exists():
+            source = np.load(self.path / IndexSnapshot.EMBEDDINGS_FILE, mmap_mode="r")
+            tmp_path = self.path / f"{self.NORMALIZED_FILE}.tmp"
+            target = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=source.shape)
+            for start in range(0, len(source), Config.INGESTION_BATCH_SIZE):
+                block = np.asarray(source[start:start + Config.INGESTION_BATCH_SIZE], dtype=np.float32)
+                target[start:start + len(block)] = block / np.clip(
+                    np.linalg.norm(block, axis=1, keepdims=True), 1e-12, None
+                )
+            target.flush()
+            del target
+            os.replace(tmp_path, normalized_path)
+
+        offsets_path = self.path / self.OFFSETS_FILE
+        if not offsets_path.exists():
+            offsets = []
+            with open(self.path / IndexSnapshot.PAYLOADS_FILE, "rb") as payloads:
+                position = 0
+                for line in payloads:
+                    offsets.append(position)
+                    position += len(line)
+            with open(self.path / f"{self.OFFSETS_FILE}.tmp", "wb") as file:
+                np.save(file, np.array(offsets, dtype=np.int64))
+            os.replace(self.path / f"{self.OFFSETS_FILE}.tmp", offsets_path)
+
+    def _load_hnsw(self) -> Optional[Any]:
+        """Load or build the HNSW graph; returns None when hnswlib is not installed."""
+        try:
+            import hnswlib
+        except ImportError:
+            logger.warning("hnswlib is not installed, the local index falls back to exact search")
+            return None
+
+        graph = hnswlib.Index(space="ip", dim=self.vectors.shape[1])
+        graph_path = self.path / self.HNSW_FILE
+        if graph_path.exists():
+            graph.load_index(str(graph_path), max_elements=len(self.vectors))
+        else:
+            graph.init_index(
+                max_elements=max(len(self.vectors), 1),
+                M=Config.LOCAL_INDEX_HNSW_M,
+                ef_construction=Config.LOCAL_INDEX_HNSW_EF_CONSTRUCT,
+            )
+            if len(self.vectors):
+                graph.add_items(np.asarray(self.vectors), np.arange(len(self.vectors)))
+            graph.save_index(str(graph_path))
+        graph.set_ef(Config.LOCAL_INDEX_HNSW_EF)
+        return graph
+
+    def count_points(self) -> int:
+        return len(self.ids)
+
+    def read_payload(self, row: int) -> Dict[str, Any]:
+        """Read the stored record of one row from the payload file."""
+        with open(self.path / IndexSnapshot.PAYLOADS_FILE, "rb") as payloads:
+            payloads.seek(int(self.offsets[row]))
+            return json.loads(payloads.readline())
+
+    def scroll_payloads(
+        self,
+        fields: List[str],
+        page_size: int = 1000,
+        source_file: Optional[str] = None,
+    ) -> Dict[PointId, Dict[str, Any]]:
+        """Same contract as `QdrantWrapper.scroll_payloads`, read from the payload file."""
+        payloads: Dict[PointId, Dict[str, Any]] = {}
+        for record in self._iter_records():
+            flat = {**(record.get("fields") or {}), **record}
+            if source_file is None or flat.get("source_file") == source_file:
+                payloads[record["id"]] = {field: flat.get(field) for field in fields if field in flat}
+        return payloads
+
+    def search_rows(self, query_vector: List[float], limit: int, filters: Dict[str, List[str]]) -> List[int]:
+        """
+        Return the rows of the best matches, best first.
+
+        Args:
+            query_vector (List[float]): Vector to search for.
+            limit (int): Number of rows to return.
+            filters (Dict[str, List[str]]): Normalized payload filters.
+
+        Returns:
+            List[int]: Matching rows.
+        """
+        query = np.asarray(query_vector, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+        allowed = None
+        if filters:
+            allowed = np.array(
+                [payload_matches(fields, filters) for fields in self.filter_fields], dtype=bool
+            )
+            if not allowed.any():
+                return []
+
+        if self.hnsw is not None:
+            count = min(limit, len(self.ids) if allowed is None else int(allowed.sum()))
+            if count == 0:
+                return []
+            labels, _ = self.hnsw.knn_query(
+                query, k=count, filter=None if allowed is None else (lambda label: bool(allowed[label]))
+            )
+            return [int(label) for label in labels[0]]
+
+        scores = self.vectors @ query
+        if allowed is not None:
+            scores = np.where(allowed, scores, -np.inf)
+            limit = min(limit, int(allowed.sum()))
+        if limit >= len(scores):
+            return list(np.argsort(-scores)[:limit])
+        top = np.argpartition(-scores, limit)[:limit]
+        return list(top[np.argsort(-scores[top])])
+
+    def search(
+        self,
+        query_vector: List[float],
+        limit: int = 5,
+        filters: Optional[Dict[str, FilterValue]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search with the contract of `QdrantWrapper.search`.
+
+        Args:
+            query_vector (List[float]): Vector to search for.
+            limit (int): Number of results to return.
+            filters (Optional[Dict[str, FilterValue]]): Payload filters; see `validate_filters`.
+
+        Returns:
+            List[Dict[str, Any]]: Results with `id`, `document` and `content`.
+
+        Raises:
+            ValueError: If the index is empty or a filter field is unknown.
+        """
+        normalized_filters = validate_filters(filters)
+        if not self.ids:
+            raise ValueError(f"The local index at {self.path} is empty. Please ingest data first.")
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+        results = []
+        for row in self.search_rows(query, limit, normalized_filters):
+            record = self.read_payload(row)
+            results.append(hit_to_result(record["id"], float(self.vectors[row] @ query), record))
+        return results
+
+
+class LocalSearchClient:
+    """Async facade over `LocalVectorIndex` with the interface of `AsyncQdrantWrapper`."""
+
+    def __init__(self, index: LocalVectorIndex) -> None:
+        self.index = index
+
+    def invalidate(self) -> None:
+        """The local index is read-only; nothing to refresh."""
+
+    async def search(
+        self,
+        query_vector: List[float],
+        limit: int = 5,
+        filters: Optional[Dict[str, FilterValue]] = None
+    ) -> List[Dict[str, Any]]:
+        # A scan over an in-RAM corpus takes well under a millisecond, so it runs inline
+        return self.index.search(query_vector, limit, filters)
+
+    async def close(self) -> None:
+        """Nothing to close."""
+
+
+class FallbackSearchClient:
+    """
+    Search Qdrant, falling back to a local index when Qdrant cannot be reached.
+
+    Empty-collection and filter errors (ValueError) are not connection failures
+    and are passed through unchanged. After a failure, Qdrant is not tried again
+    for `retry_interval` seconds, so requests do not each wait for its timeout.
+    A local index that was not preloaded is opened in a worker thread, so
+    preparing it does not block the event loop.
+    """
+
+    def __init__(
+        self,
+        primary: Any,
+        load_fallback: Any,
+        retry_interval: float = Config.LOCAL_INDEX_RETRY_INTERVAL,
+        fallback: Optional[LocalVectorIndex] = None,
+    ) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            primary (AsyncQdrantWrapper): Client used while Qdrant is reachable.
+            load_fallback (Callable[[], Optional[LocalVectorIndex]]): Opens the newest
+                local index; called by `reload` and on a failure before any index is open.
+            retry_interval (float): Seconds searches go straight to the local index after a failure.
+            fallback (Optional[LocalVectorIndex]): Local index opened at startup, if any.
+        """
+        self.primary = primary
+        self.load_fallback = load_fallback
+        self.retry_interval = retry_interval
+        self.fallback = fallback
+        self.fallback_searches = 0
+        self._primary_down_until = 0.0
+        self._load_lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self.primary.invalidate()
+
+    def reload(self) -> None:
+        """Open the newest local index; blocking, so call it off the event loop, e.g. after an export."""
+        fallback = self.load_fallback()
+        if fallback is not None:
+            self.fallback = fallback
+
+    async def search(
+        self,
+        query_vector: List[float],
+        limit: int = 5,
+        filters: Optional[Dict[str, FilterValue]] = None
+    ) -> List[Dict[str, Any]]:
+        if time.monotonic() < self._primary_down_until and await self._open_fallback() is not None:
+            self.fallback_searches += 1
+            return self.fallback.search(query_vector, limit, filters)
+
+        try:
+            return await self.primary.search(query_vector, limit, filters)
+        except ValueError:
+            raise
+        except Exception as e:
+            self._primary_down_until = time.monotonic() + self.retry_interval
+            if await self._open_fallback() is None:
+                raise
+            logger.warning(
+                f"Qdrant search failed ({str(e)}), serving from the local index for {self.retry_interval:.0f}s"
+            )
+            self.fallback_searches += 1
+            return self.fallback.search(query_vector, limit, filters)
+
+    async def _open_fallback(self) -> Optional[LocalVectorIndex]:
+        if self.fallback is None:
+            async with self._load_lock:
+                if self.fallback is None:
+                    self.fallback = await asyncio.to_thread(self.load_fallback)
+        return self.fallback
+
+    async def close(self) -> None:
+        await self.primary.close()
+
+
+def benchmark(index: LocalVectorIndex, num_queries: int = 200, k: int = 5, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """
+    Compare the exact local scan, the local HNSW graph and Qdrant on the same queries.
+
+    Qdrant is searched through the serving alias, so the snapshot should be an
+    export of the live collection. Recall is measured against the exact local scan.
+
+    Args:
+        index (LocalVectorIndex): Index to benchmark.
+        num_queries (int): Number of sampled queries.
+        k (int): Results per query.
+        seed (int): Seed for query sampling.
+
+    Returns:
+        Dict[str, Dict[str, float]]: p50/p95 latency and recall@k per engine.
+    """
+    from src.qdrant.profile_tuning import make_queries
+    from src.qdrant.qdrant_utils import QdrantWrapper
+
+    queries = make_queries(np.asarray(index.vectors), num_queries, seed)
+    exact = [set(index.search_rows(query, k, {})) for query in queries]
+    engines = {"local-exact": lambda query: index.search_rows(query, k, {})}
+
+    hnsw = index._load_hnsw()
+    if hnsw is not None:
+        engines["local-hnsw"] = lambda query: [int(label) for label in hnsw.knn_query(query, k=k)[0][0]]
+
+    try:
+        qdrant = QdrantWrapper()
+        rows = {point_id: row for row, point_id in enumerate(index.ids)}
+        engines["qdrant"] = lambda query: [rows.get(result["id"]) for result in qdrant.search(query.tolist(), k)]
+    except Exception as e:
+        logger.warning(f"Skipping Qdrant in the benchmark: {str(e)}")
+
+    results = {}
+    for name, search in engines.items():
+        search(queries[0])  # warm-up
+        latencies, recalls = [], []
+        for query, expected in zip(queries, exact):
+            start = time.perf_counter()
+            found = search(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+            recalls.append(len(set(found) & expected) / k)
+        results[name] = {
+            "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+            "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+            f"recall@{k}": round(float(np.mean(recalls)), 4),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export the live collection for local serving, or benchmark the local index.")
+    parser.add_argument("command", choices=["export", "benchmark"])
+    parser.add_argument("--queries", type=int, default=200, help="Number of sampled benchmark queries")
+    parser.add_argument("--k", type=int, default=5, help="Results per benchmark query")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        from src.qdrant.qdrant_utils import QdrantWrapper
+        print(IndexSnapshot.export(QdrantWrapper(), Config.LOCAL_INDEX_DIR).path)
+        return
+
+    index = LocalVectorIndex.open_latest(use_hnsw=False)
+    if index is None:
+        raise SystemExit("No index snapshot found; run the export or build one first")
+    print(json.dumps(benchmark(index, args.queries, args.k), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import argparse
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+from qdrant_client import QdrantClient
+from qdrant_client.models import CollectionStatus, OptimizersConfigDiff
+
+from src.config.config import Config
+from src.ingestion.index_snapshot import IndexSnapshot
+from src.ingestion.pipeline import IngestionPipeline
+from src.parser.csv_parser import CsvParser
+from src.qdrant.collection_profiles import COLLECTION_PROFILES, CollectionProfile
+from src.qdrant.qdrant_utils import QdrantWrapper
+from src.utils.utils import make_point_id
+
+
+TUNING_COLLECTION_PREFIX = "capec-tuning"
+
+def _load_corpus(snapshot: IndexSnapshot, scale: int, seed: int) -> List[Dict[str, Any]]:
+    """
+    Load the snapshot as chunks, optionally replicated `scale` times with
+    jittered vectors to approximate a larger corpus.
+    """
+    rng = np.random.default_rng(seed)
+    chunks = [chunk for batch in snapshot.iter_chunk_batches() for chunk in batch]
+
+    corpus = []
+    for copy in range(scale):
+        for chunk in chunks:
+            vector = np.asarray(chunk["embeddings"], dtype=np.float32)
+            if copy:
+                vector = vector + rng.normal(0, 0.1 / np.sqrt(len(vector)), len(vector)).astype(np.float32)
+            corpus.append({
+                **chunk,
+                "id": chunk["id"] if not copy else make_point_id(f"tuning-copy-{copy}", str(chunk["id"])),
+                "embeddings": vector,
+            })
+    return corpus
+
+
+def make_queries(matrix: np.ndarray, num_queries: int, seed: int) -> np.ndarray:
+    """Sample stored vectors and perturb them so a query is not simply its own nearest neighbour."""
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(matrix), size=min(num_queries, len(matrix)), replace=False)
+    noise = rng.normal(0, 0.5 / np.sqrt(matrix.shape[1]), (len(rows), matrix.shape[1])).astype(np.float32)
+    queries = matrix[rows] + noise
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def _wait_until_indexed(client: QdrantClient, name: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while client.get_collection(name).status != CollectionStatus.GREEN:
+        if time.monotonic() > deadline:
+            logger.warning(f"{name} is still optimizing after {timeout}s, measuring anyway")
+            return
+        time.sleep(1)
+
+
+def evaluate_profile(
+    client: QdrantClient,
+    profile: CollectionProfile,
+    corpus: List[Dict[str, Any]],
+    queries: np.ndarray,
+    ground_truth: List[List[int]],
+    ids: List[Any],
+    k: int,
+    keep: bool = False,
+    index_timeout: float = 600.0,
+) -> Dict[str, Any]:
+    """
+    Load the corpus into a scratch collection built with `profile` and measure it.
+
+    Args:
+        client (QdrantClient): Qdrant connection.
+        profile (CollectionProfile): Profile under test.
+        corpus (List[Dict[str, Any]]): Chunks to index.
+        queries (np.ndarray): Normalized query vectors.
+        ground_truth (List[List[int]]): Exact top-k rows of `corpus` for every query.
+        ids (List[Any]): Point ID of every corpus row.
+        k (int): Number of results per query.
+        keep (bool): Keep the scratch collection instead of dropping it.
+        index_timeout (float): Seconds to wait for the HNSW index to be built.
+
+    Returns:
+        Dict[str, Any]: Estimated RAM, recall@k and latency percentiles.
+    """
+    # Kept outside the alias namespace, which blue/green garbage collection treats as collection versions
+    name = f"{TUNING_COLLECTION_PREFIX}-{profile.name}"
+    if any(collection.name == name for collection in client.get_collections().collections):
+        client.delete_collection(name)
+
+    wrapper = QdrantWrapper(collection_name=name, client=client, profile=profile)
+    # Index even the small CAPEC corpus, otherwise every profile is measured as a brute-force scan
+    client.update_collection(name, optimizers_config=OptimizersConfigDiff(indexing_threshold=10))
+
+    try:
+        IngestionPipeline(wrapper).run(
+            corpus[start:start + Config.INGESTION_BATCH_SIZE]
+            for start in range(0, len(corpus), Config.INGESTION_BATCH_SIZE)
+        )
+        _wait_until_indexed(client, name, index_timeout)
+
+        position = {point_id: row for row, point_id in enumerate(ids)}
+        latencies, recalls = [], []
+        for query, expected in zip(queries, ground_truth):
+            start = time.perf_counter()
+            hits = client.search(
+                collection_name=name,
+                query_vector=query.tolist(),
+                limit=k,
+                search_params=profile.search_params(),
+                with_payload=False,
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+            found = {position.get(hit.id) for hit in hits}
+            recalls.append(len(found & set(expected)) / k)
+    finally:
+        if not keep:
+            client.delete_collection(name)
+
+    return {
+        "points": len(corpus),
+        "estimated_ram_mb": round(profile.estimated_ram_bytes(len(corpus), queries.shape[1]) / 2**20, 2),
+        f"recall@{k}": round(float(np.mean(recalls)), 4),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 2),
+    }
+
+
+def tuning_report(
+    client: QdrantClient,
+    snapshot: IndexSnapshot,
+    profiles: List[CollectionProfile],
+    num_queries: int = 200,
+    k: int = 5,
+    scale: int = 1,
+    seed: int = 0,
+    keep: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Compare memory, recall and latency of collection profiles on the same corpus.
+
+    Recall is measured against an exact NumPy search over the float32 vectors.
+
+    Args:
+        client (QdrantClient): Qdrant connection.
+        snapshot (IndexSnapshot): Snapshot providing the vectors and payloads.
+        profiles (List[CollectionProfile]): Profiles to compare.
+        num_queries (int): Number of queries.
+        k (int): Number of results per query.
+        scale (int): Number of (jittered) copies of the snapshot to index.
+        seed (int): Seed for query sampling and jitter.
+        keep (bool): Keep the scratch collections.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Measurements per profile name.
+    """
+    corpus = _load_corpus(snapshot, scale, seed)
+    matrix = np.stack([chunk["embeddings"] for chunk in corpus]).astype(np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    ids = [chunk["id"] for chunk in corpus]
+
+    queries = make_queries(matrix, num_queries, seed)
+    scores = queries @ matrix.T
+    ground_truth = [list(np.argsort(-row)[:k]) for row in scores]
+
+    report = {}
+    for profile in profiles:
+        logger.info(f"Evaluating collection profile '{profile.name}' on {len(corpus)} points")
+        report[profile.name] = evaluate_profile(client, profile, corpus, queries, ground_truth, ids, k, keep)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report memory, recall and latency of the Qdrant collection profiles.")
+    parser.add_argument("--profiles", nargs="+", default=sorted(COLLECTION_PROFILES), choices=sorted(COLLECTION_PROFILES))
+    parser.add_argument("--queries", type=int, default=200, help="Number of sampled queries")
+    parser.add_argument("--k", type=int, default=5, help="Results per query")
+    parser.add_argument("--scale", type=int, default=1, help="Index this many jittered copies of the dataset")
+    parser.add_argument("--snapshot-dir", default=Config.INDEX_SNAPSHOT_DIR, help="Directory holding index snapshots")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch collections")
+    args = parser.parse_args()
+
+    snapshot: Optional[IndexSnapshot] = IndexSnapshot.find_latest(args.snapshot_dir)
+    if snapshot is None:
+        snapshot = IndexSnapshot.build(CsvParser(data_dir=Config.DATA_DIRECTORY), args.snapshot_dir)
+
+    client = QdrantClient(host=Config.QDRANT_HOST, port=Config.QDRANT_PORT, timeout=60)
+    report = tuning_report(
+        client, snapshot, [COLLECTION_PROFILES[name] for name in args.profiles],
+        num_queries=args.queries, k=args.k, scale=args.scale, keep=args.keep,
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
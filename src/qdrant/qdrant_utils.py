@@ -1,36 +1,93 @@
 import time
-from typing import List, Dict, Any, Optional
+from datetime import datetime
+from typing import Callable, List, Dict, Any, Optional, Union
 
 from loguru import logger
 from qdrant_client import QdrantClient
 from src.config.config import Config
+from src.qdrant.collection_profiles import CollectionProfile, get_collection_profile
+from src.qdrant.search_filters import FilterValue, build_search_filter
 from qdrant_client.models import (
-    Distance,
-    VectorParams,
+    PayloadSchemaType,
     PointStruct,
     FilterSelector,
     CollectionInfo,
-    Filter
+    Filter,
+    PointIdsList,
+    FieldCondition,
+    MatchValue,
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation
 )
 
 
+# Payload keys linking a field-level chunk to its CAPEC entry
+CHILD_PAYLOAD_FIELDS = ("parent_id", "field", "chunk_index")
+
+
+def hit_to_result(point_id: Union[int, str], score: Optional[float], payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a search hit into the result dict returned by every search backend."""
+    result = {
+        "id": point_id,
+        "document": payload.get("metadata"),
+        "content": payload.get("text"),
+        "score": score,
+    }
+    result.update({key: payload[key] for key in CHILD_PAYLOAD_FIELDS if key in payload})
+    # Snapshot records keep the structured fields nested under "fields"
+    capec_id = payload.get("capec_id") or (payload.get("fields") or {}).get("capec_id")
+    if capec_id:
+        result["capec_id"] = capec_id
+    return result
+
+
 class QdrantWrapper:
     """A wrapper class for Qdrant vector database operations."""
 
-    def __init__(self, collection_name: str = Config.COLLECTION_NAME) -> None:
+    def __init__(
+        self,
+        collection_name: str = Config.COLLECTION_ALIAS,
+        client: Optional[QdrantClient] = None,
+        profile: Optional[CollectionProfile] = None,
+    ) -> None:
         """
         Initialize the QdrantWrapper with connection settings.
 
         Args:
-            collection_name (str): Name of the collection to use.
+            collection_name (str): Name of the collection to use. The default is the
+                serving alias, which points at the current physical collection.
+            client (Optional[QdrantClient]): Existing connection to reuse instead of
+                opening a new one.
+            profile (Optional[CollectionProfile]): Storage, index and search settings;
+                defaults to `Config.COLLECTION_PROFILE`.
         """
+        self.profile = profile or get_collection_profile()
+        self._change_listeners: List[Callable[[], None]] = []
         self.host = "qdrant"
         self.port = 6333
         self.max_retries = 5
         self.retry_delay = 5  # seconds
-        self.client: Optional[QdrantClient] = None
+        self.client: Optional[QdrantClient] = client
         self.collection_name = collection_name
-        self._connect_with_retry()
+        if client is None:
+            self._connect_with_retry()
+        else:
+            self._ensure_collection()
+
+    def add_change_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Register a callback run after every write to the collection or alias.
+
+        Args:
+            listener (Callable[[], None]): Callback; it may be called from ingestion threads.
+        """
+        self._change_listeners.append(listener)
+
+    def _notify_change(self) -> None:
+        for listener in self._change_listeners:
+            listener()
 
     def _connect_with_retry(self) -> None:
         """
@@ -53,7 +110,7 @@ class QdrantWrapper:
                 # Test connection by calling an API
                 self.client.get_collections()
                 logger.info("Successfully connected to Qdrant")
-                self._create_collection_if_not_exists()
+                self._ensure_collection()
                 break
             except Exception as e:
                 logger.error(f"Connection attempt {attempt + 1} failed: {str(e)}")
@@ -65,6 +122,14 @@ class QdrantWrapper:
                         f"Failed to connect to Qdrant after {self.max_retries} attempts"
                     )
 
+    def _ensure_collection(self) -> None:
+        """Make sure the serving alias, or the physical collection, exists and has its payload indexes."""
+        if self.collection_name == Config.COLLECTION_ALIAS:
+            self.ensure_alias()
+        else:
+            self._create_collection_if_not_exists()
+        self.create_payload_indexes(self.get_alias_target(self.collection_name) or self.collection_name)
+
     def _create_collection_if_not_exists(self) -> None:
         """
         Create the collection if it doesn't exist.
@@ -72,16 +137,129 @@ class QdrantWrapper:
         Raises:
             Exception: If collection creation fails.
         """
-        collections = self.client.get_collections().collections
-        if not any(collection.name == self.collection_name for collection in collections):
-            self.client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config=VectorParams(size=384, distance=Distance.COSINE),
-            )
+        if not self.collection_exists(self.collection_name):
+            self.create_collection(self.collection_name)
             logger.info("Collection is Created")
         else:
             logger.info("Collection already exists")
 
+    def collection_exists(self, name: str) -> bool:
+        """
+        Check whether a name refers to an existing collection or alias.
+
+        Args:
+            name (str): Collection or alias name.
+
+        Returns:
+            bool: True if it exists.
+        """
+        collections = self.client.get_collections().collections
+        if any(collection.name == name for collection in collections):
+            return True
+        return self.get_alias_target(name) is not None
+
+    def create_collection(self, name: str, profile: Optional[CollectionProfile] = None) -> None:
+        """
+        Create a physical collection for 384-dimensional cosine vectors.
+
+        Args:
+            name (str): Name of the collection to create.
+            profile (Optional[CollectionProfile]): Storage and index settings;
+                defaults to the profile of this wrapper.
+        """
+        profile = profile or self.profile
+        self.client.create_collection(
+            collection_name=name,
+            vectors_config=profile.vectors_config(384),
+            hnsw_config=profile.hnsw_config(),
+            quantization_config=profile.quantization_config(),
+            on_disk_payload=profile.payload_on_disk,
+        )
+        logger.info(f"Created collection {name} with profile '{profile.name}'")
+
+    def create_payload_indexes(self, name: str) -> None:
+        """
+        Create keyword indexes on the filterable payload fields, so filtered
+        searches are resolved inside the vector index.
+
+        Existing indexes are left as they are, so this is safe to call on every start.
+
+        Args:
+            name (str): Collection or alias to index.
+        """
+        for field in Config.PAYLOAD_INDEX_FIELDS:
+            try:
+                self.client.create_payload_index(
+                    collection_name=name,
+                    field_name=field,
+                    field_schema=PayloadSchemaType.KEYWORD,
+                )
+            except Exception as e:
+                logger.warning(f"Could not index payload field '{field}' of {name}: {e}")
+    @staticmethod
+    def new_collection_name(alias: str = Config.COLLECTION_ALIAS) -> str:
+        """Return a fresh, time-ordered physical collection name for an alias."""
+        return f"{alias}-{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+
+    def list_collection_names(self) -> List[str]:
+        """Return the names of all physical collections."""
+        return [collection.name for collection in self.client.get_collections().collections]
+
+    def get_alias_target(self, alias: str) -> Optional[str]:
+        """
+        Resolve an alias to the physical collection it points at.
+
+        Args:
+            alias (str): Alias name.
+
+        Returns:
+            Optional[str]: The collection name, or None if the alias does not exist.
+        """
+        for description in self.client.get_aliases().aliases:
+            if description.alias_name == alias:
+                return description.collection_name
+        return None
+
+    def ensure_alias(self) -> None:
+        """
+        Create the serving alias if it is missing.
+
+        A collection left by a pre-alias deployment (`Config.COLLECTION_NAME`) is
+        adopted as the first version; otherwise a new physical collection is created.
+        """
+        alias = self.collection_name
+        current = self.get_alias_target(alias)
+        if current is not None:
+            logger.info(f"Alias {alias} -> {current}")
+            return
+
+        if Config.COLLECTION_NAME in self.list_collection_names():
+            target = Config.COLLECTION_NAME
+        else:
+            target = self.new_collection_name(alias)
+            self.create_collection(target)
+
+        self.swap_alias(target)
+
+    def swap_alias(self, target: str) -> None:
+        """
+        Atomically point the alias of this wrapper at another physical collection.
+
+        Args:
+            target (str): Collection the alias should point at.
+        """
+        operations = []
+        if self.get_alias_target(self.collection_name) is not None:
+            operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=self.collection_name)))
+        operations.append(
+            CreateAliasOperation(create_alias=CreateAlias(collection_name=target, alias_name=self.collection_name))
+        )
+
+        # Both operations are applied in a single request, so searches never see a missing alias
+        self.client.update_collection_aliases(change_aliases_operations=operations)
+        self._notify_change()
+        logger.info(f"Alias {self.collection_name} now points at {target}")
+
     def clear_collection(self) -> None:
         """
         Delete all vectors/points from the collection while keeping the structure.
@@ -95,6 +273,7 @@ class QdrantWrapper:
                     collection_name=self.collection_name,
                     points_selector=FilterSelector(filter=Filter())
                 )
+                self._notify_change()
                 logger.info(
                     f"Successfully cleared all vectors from collection: "
                     f"{self.collection_name}"
@@ -115,33 +294,190 @@ class QdrantWrapper:
         """
         try:
 
-            points = [
-            PointStruct(
-                    id=i,
-                    vector=doc["embeddings"],
-                    payload={"text": doc["text"], "metadata": doc["metadata"]}
-                )
-                for i, doc in enumerate(docs)
-            ]
-            self.client.upsert(collection_name=self.collection_name, points=points)
+            for start in range(0, len(docs), Config.INGESTION_BATCH_SIZE):
+                self.upsert_chunks(docs[start:start + Config.INGESTION_BATCH_SIZE], offset=start)
 
         except Exception as E:
             logger.error(f"Error in Data ingestion: {E}")
 
+    def upsert_chunks(self, docs: List[Dict[str, Any]], offset: int = 0) -> None:
+        """
+        Upsert one batch of processed chunks, propagating any error to the caller.
+
+        Args:
+            docs (List[Dict[str, Any]]): Processed chunks to upsert.
+            offset (int): Position of the first chunk, used as point ID for
+                chunks that carry no ID of their own.
+        """
+        points = [
+            PointStruct(
+                id=doc.get("id", offset + i),
+                vector=list(map(float, doc["embeddings"])),
+                payload={
+                    **(doc.get("fields") or {}),
+                    "text": doc["text"],
+                    "metadata": doc["metadata"],
+                    "content_hash": doc.get("content_hash"),
+                    "source_file": doc.get("source_file"),
+                    "source_views": doc.get("source_views"),
+                    **{key: doc[key] for key in CHILD_PAYLOAD_FIELDS if key in doc},
+                }
+            )
+            for i, doc in enumerate(docs)
+        ]
+        self.client.upsert(collection_name=self.collection_name, points=points)
+        self._notify_change()
+
     def delete_collection(self, collection_name:str) -> None:
         self.client.delete_collection(collection_name)  
 
+    def count_points(self) -> int:
+        """
+        Return the exact number of points in the collection.
+
+        Returns:
+            int: Number of points, 0 if the collection does not exist.
+
+        Raises:
+            Exception: Any other error, e.g. Qdrant being unreachable, which must
+                not be mistaken for an empty collection.
+        """
+        try:
+            return self.client.count(collection_name=self.collection_name, exact=True).count
+        except Exception as e:
+            if "not found" not in str(e).lower():
+                raise
+            logger.warning(f"Collection {self.collection_name} does not exist: {e}")
+            return 0
+
+    def fetch_content_hashes(self, page_size: int = 1000, source_file: Optional[str] = None) -> Dict[Union[int, str], Optional[str]]:
+        """
+        Fetch the content hash stored with every point in the collection.
+
+        Args:
+            page_size (int): Number of points requested per scroll call.
+            source_file (Optional[str]): Only fetch points ingested from this file.
+
+        Returns:
+            Dict[Union[int, str], Optional[str]]: Mapping of point ID to content hash.
+            Points ingested before hashes were stored map to None.
+        """
+        payloads = self.scroll_payloads(["content_hash"], page_size, source_file)
+        return {point_id: payload.get("content_hash") for point_id, payload in payloads.items()}
+
+    def scroll_payloads(
+        self,
+        fields: List[str],
+        page_size: int = 1000,
+        source_file: Optional[str] = None,
+    ) -> Dict[Union[int, str], Dict[str, Any]]:
+        """
+        Fetch selected payload fields of every point, without vectors.
+
+        Args:
+            fields (List[str]): Payload fields to fetch.
+            page_size (int): Number of points requested per scroll call.
+            source_file (Optional[str]): Only fetch points ingested from this file.
+
+        Returns:
+            Dict[Union[int, str], Dict[str, Any]]: Mapping of point ID to its payload fields.
+        """
+        payloads: Dict[Union[int, str], Dict[str, Any]] = {}
+        offset = None
+
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=self._source_file_filter(source_file) if source_file else None,
+                limit=page_size,
+                offset=offset,
+                with_payload=fields,
+                with_vectors=False,
+            )
+            for point in points:
+                payloads[point.id] = point.payload or {}
+
+            if offset is None:
+                break
+
+        return payloads
+
+    def iter_points(self, page_size: int = 1000):
+        """
+        Yield pages of (point ID, vector, payload) for every point in the collection.
+
+        Args:
+            page_size (int): Number of points requested per scroll call.
+
+        Yields:
+            List[Tuple[Union[int, str], List[float], Dict[str, Any]]]: One page of points.
+        """
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                limit=page_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            yield [(point.id, point.vector, point.payload or {}) for point in points]
+
+            if offset is None:
+                break
+
+    def delete_source_file(self, source_file: str) -> None:
+        """
+        Delete every point ingested from a source file.
+
+        Args:
+            source_file (str): Value of the `source_file` payload field.
+        """
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=FilterSelector(filter=self._source_file_filter(source_file))
+        )
+        self._notify_change()
+        logger.info(f"Deleted points of {source_file} from {self.collection_name}")
+
+    @staticmethod
+    def _source_file_filter(source_file: str) -> Filter:
+        return Filter(must=[FieldCondition(key="source_file", match=MatchValue(value=source_file))])
+
+    def delete_points(self, point_ids: List[Union[int, str]]) -> None:
+        """
+        Delete points from the collection by ID.
+
+        Args:
+            point_ids (List[Union[int, str]]): IDs of the points to delete.
+        """
+        if not point_ids:
+            return
+
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=PointIdsList(points=point_ids)
+        )
+        self._notify_change()
+        logger.info(f"Deleted {len(point_ids)} points from {self.collection_name}")
+
     def search(
         self,
         query_vector: List[float],
-        limit: int = 5
+        limit: int = 5,
+        filters: Optional[Dict[str, FilterValue]] = None
     ) -> List[Dict[str, str]]:
         """
         Search vectors in Qdrant collection with empty collection check.
 
+        The collection is only counted when a search returns nothing, so a
+        successful search costs a single request.
+
         Args:
             query_vector (List[float]): Vector to search for.
             limit (int): Number of results to return.
+            filters (Optional[Dict[str, FilterValue]]): Restrict results to points whose
+                payload fields match, e.g. {"typical_severity": ["High"]}.
 
         Returns:
             List[Dict[str, str]]: List of search results containing documents and content.
@@ -151,32 +487,22 @@ class QdrantWrapper:
             Exception: For other search-related errors.
         """
         try:
-            # Get collection info to check if it's empty
-            collection_info = self.client.get_collection(self.collection_name)
+            search_result = self.client.search(
+                collection_name=self.collection_name,
+                query_vector=query_vector,
+                limit=limit,
+                query_filter=build_search_filter(filters),
+                search_params=self.profile.search_params()
+            )
 
-            # Check if collection exists and has points
-            if collection_info.points_count == 0:
+            if not search_result and self.count_points() == 0:
                 logger.warning(f"Collection '{self.collection_name}' is empty")
                 raise ValueError(
                     f"The collection '{self.collection_name}' is empty. "
                     "Please ingest data first."
                 )
 
-
-            # Perform search if collection has data
-            search_result = self.client.search(
-                collection_name=self.collection_name,
-                query_vector=query_vector,
-                limit=limit
-            )
-
-            return [
-                {
-                    "document": hit.payload["metadata"],
-                    "content": hit.payload["text"]
-                }
-                for hit in search_result
-            ]
+            return [hit_to_result(hit.id, hit.score, hit.payload or {}) for hit in search_result]
 
         except Exception as e:
             if "Collection not found" in str(e):
@@ -184,4 +510,4 @@ class QdrantWrapper:
                     f"Collection '{self.collection_name}' does not exist. "
                     "Please create it first."
                 )
-            raise
\ No newline at end of file
+            raise
@@ -0,0 +1,65 @@
+from typing import Any, Dict, List, Optional, Union
+
+from qdrant_client.models import FieldCondition, Filter, MatchAny
+
+from src.config.config import Config
+
+
+FilterValue = Union[str, List[str]]
+
+
+def _as_list(value: FilterValue) -> List[str]:
+    return [str(item) for item in value] if isinstance(value, (list, tuple, set)) else [str(value)]
+
+
+def validate_filters(filters: Optional[Dict[str, FilterValue]]) -> Dict[str, List[str]]:
+    """
+    Normalize search filters to lists of accepted values per payload field.
+
+    Args:
+        filters (Optional[Dict[str, FilterValue]]): Payload field to one value or a
+            list of accepted values, e.g. {"typical_severity": ["High", "Very High"]}.
+            Values are matched exactly.
+
+    Returns:
+        Dict[str, List[str]]: The normalized filters.
+
+    Raises:
+        ValueError: If a field is not one of `Config.PAYLOAD_INDEX_FIELDS`.
+    """
+    normalized = {}
+    for field, value in (filters or {}).items():
+        if field not in Config.PAYLOAD_INDEX_FIELDS:
+            raise ValueError(f"Cannot filter on '{field}', expected one of {Config.PAYLOAD_INDEX_FIELDS}")
+        normalized[field] = _as_list(value)
+    return normalized
+
+
+def build_search_filter(filters: Optional[Dict[str, FilterValue]]) -> Optional[Filter]:
+    """
+    Build a Qdrant filter requiring every field to match one of its accepted values.
+
+    Args:
+        filters (Optional[Dict[str, FilterValue]]): See `validate_filters`.
+
+    Returns:
+        Optional[Filter]: The filter, or None when there is nothing to filter on.
+    """
+    normalized = validate_filters(filters)
+    if not normalized:
+        return None
+    return Filter(must=[FieldCondition(key=field, match=MatchAny(any=values)) for field, values in normalized.items()])
+
+
+def payload_matches(payload: Dict[str, Any], filters: Dict[str, List[str]]) -> bool:
+    """
+    Evaluate normalized filters against a payload, with the semantics of `build_search_filter`.
+
+    Array fields match when any of their elements is accepted.
+    """
+    for field, accepted in filters.items():
+        value = payload.get(field)
+        values = _as_list(value) if value is not None else []
+        if not any(item in accepted for item in values):
+            return False
+    return True
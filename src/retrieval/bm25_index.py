@@ -0,0 +1,123 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.config.config import Config
+from src.qdrant.qdrant_utils import hit_to_result
+from src.qdrant.search_filters import payload_matches
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "was", "what", "when", "which", "with",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase alphanumeric terms.
+
+    Identifiers such as "CWE-89" become "cwe" and "89", so they match the bare
+    numbers the CAPEC CSV columns store.
+    """
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+class BM25Index:
+    """
+    In-memory BM25 inverted index over the points of a collection.
+
+    Postings are stored per term as NumPy arrays of document rows and
+    precomputed BM25 weights, so a query costs one vectorized add per query term.
+    """
+
+    def __init__(
+        self,
+        documents: Iterable[Tuple[Union[int, str], Dict[str, Any]]],
+        k1: float = Config.BM25_K1,
+        b: float = Config.BM25_B,
+    ) -> None:
+        """
+        Build the index.
+
+        Args:
+            documents (Iterable[Tuple[Union[int, str], Dict[str, Any]]]): Point ID and
+                payload pairs; the payload must hold `text` and `metadata`, and may hold
+                the filterable fields of `Config.PAYLOAD_INDEX_FIELDS`.
+            k1 (float): Term frequency saturation.
+            b (float): Document length normalization.
+        """
+        self.ids: List[Union[int, str]] = []
+        self.payloads: List[Dict[str, Any]] = []
+        self.filter_fields: List[Dict[str, Any]] = []
+        term_counts: List[Dict[str, int]] = []
+
+        for point_id, payload in documents:
+            counts: Dict[str, int] = {}
+            for token in tokenize(payload.get("text") or ""):
+                counts[token] = counts.get(token, 0) + 1
+            self.ids.append(point_id)
+            self.payloads.append(hit_to_result(point_id, None, payload))
+            self.filter_fields.append({field: payload.get(field) for field in Config.PAYLOAD_INDEX_FIELDS})
+            term_counts.append(counts)
+
+        lengths = np.array([sum(counts.values()) for counts in term_counts], dtype=np.float32)
+        average_length = float(lengths.mean()) if len(lengths) and lengths.mean() > 0 else 1.0
+
+        rows: Dict[str, List[int]] = {}
+        frequencies: Dict[str, List[int]] = {}
+        for row, counts in enumerate(term_counts):
+            for term, frequency in counts.items():
+                rows.setdefault(term, []).append(row)
+                frequencies.setdefault(term, []).append(frequency)
+
+        num_documents = len(self.ids)
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for term, term_rows in rows.items():
+            row_array = np.array(term_rows, dtype=np.int64)
+            tf = np.array(frequencies[term], dtype=np.float32)
+            idf = np.log(1 + (num_documents - len(term_rows) + 0.5) / (len(term_rows) + 0.5))
+            norm = k1 * (1 - b + b * lengths[row_array] / average_length)
+            self.postings[term] = (row_array, (idf * tf * (k1 + 1) / (tf + norm)).astype(np.float32))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, query: str, limit: int = 20, filters: Optional[Dict[str, List[str]]] = None) -> List[Dict[str, Any]]:
+        """
+        Return the best BM25 matches of a query.
+
+        Args:
+            query (str): Query text.
+            limit (int): Maximum number of results.
+            filters (Optional[Dict[str, List[str]]]): Normalized filters (see
+                `validate_filters`) the results' payload fields must match.
+
+        Returns:
+            List[Dict[str, Any]]: Results with `id`, `document`, `content` and `score`,
+            best first; documents sharing no term with the query are left out.
+        """
+        if not self.ids:
+            return []
+
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is not None:
+                scores[posting[0]] += posting[1]
+
+        matched = np.flatnonzero(scores)
+        if filters:
+            matched = np.array(
+                [row for row in matched if payload_matches(self.filter_fields[row], filters)], dtype=np.int64
+            )
+        if len(matched) > limit:
+            matched = matched[np.argpartition(-scores[matched], limit)[:limit]]
+        matched = matched[np.argsort(-scores[matched])]
+
+        return [
+            {**self.payloads[row], "score": float(scores[row])}
+            for row in matched
+        ]
@@ -0,0 +1,159 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from loguru import logger
+
+from src.config.config import Config
+from src.qdrant.async_qdrant import AsyncQdrantWrapper
+from src.qdrant.qdrant_utils import CHILD_PAYLOAD_FIELDS, QdrantWrapper
+from src.qdrant.search_filters import FilterValue, validate_filters
+from src.retrieval.bm25_index import BM25Index
+from src.retrieval.parent_aggregation import aggregate_by_parent
+
+
+def reciprocal_rank_fusion(rankings: Sequence[List[Dict[str, Any]]], k: int = Config.RRF_K) -> List[Dict[str, Any]]:
+    """
+    Fuse ranked result lists by summing 1 / (k + rank) per result ID.
+
+    Args:
+        rankings (Sequence[List[Dict[str, Any]]]): Result lists, best first; results need an `id`.
+        k (int): Damping constant; larger values flatten the contribution of top ranks.
+
+    Returns:
+        List[Dict[str, Any]]: Unique results ordered by fused score, which replaces their `score`.
+    """
+    scores: Dict[Any, float] = {}
+    results: Dict[Any, Dict[str, Any]] = {}
+    for ranking in rankings:
+        for rank, result in enumerate(ranking, start=1):
+            scores[result["id"]] = scores.get(result["id"], 0.0) + 1.0 / (k + rank)
+            results.setdefault(result["id"], result)
+
+    return [
+        {**results[point_id], "score": scores[point_id]}
+        for point_id in sorted(scores, key=scores.get, reverse=True)
+    ]
+
+
+class HybridSearcher:
+    """
+    First-stage retrieval combining dense vector search with BM25 keyword search.
+
+    Both retrievers return field-level chunks. The chunk rankings are fused,
+    then aggregated per CAPEC entry on their fused scores.
+
+    The BM25 index is built from the payloads stored in Qdrant and rebuilt, in
+    a background task, on the first search after the collection changed; searches
+    keep using the previous index until the new one replaces it. Rebuilds are
+    spaced at least `rebuild_interval` seconds apart, so a running ingestion
+    does not trigger one per batch.
+    """
+
+    def __init__(
+        self,
+        dense_client: AsyncQdrantWrapper,
+        qdrant_client: QdrantWrapper,
+        prefetch: int = Config.HYBRID_PREFETCH,
+        rrf_k: int = Config.RRF_K,
+        rebuild_interval: float = Config.SPARSE_INDEX_REBUILD_INTERVAL,
+        enabled: bool = Config.HYBRID_SEARCH_ENABLED,
+    ) -> None:
+        """
+        Initialize the searcher.
+
+        Args:
+            dense_client (AsyncQdrantWrapper): Client used for dense search, or a client
+                with the same `search` coroutine such as `LocalSearchClient`.
+            qdrant_client (QdrantWrapper): Client used to read payloads for the BM25 index;
+                a `LocalVectorIndex` works as well.
+            prefetch (int): Candidates fetched from each retriever before fusion.
+            rrf_k (int): Reciprocal rank fusion constant.
+            rebuild_interval (float): Minimum seconds between BM25 index rebuilds.
+            enabled (bool): When False, only dense search is used.
+        """
+        self.dense_client = dense_client
+        self.qdrant_client = qdrant_client
+        self.prefetch = prefetch
+        self.rrf_k = rrf_k
+        self.rebuild_interval = rebuild_interval
+        self.enabled = enabled
+
+        self.index: Optional[BM25Index] = None
+        self._stale = True
+        self._built_at: Optional[float] = None
+        self._rebuild_task: Optional[asyncio.Task] = None
+
+    def invalidate(self) -> None:
+        """Mark the BM25 index as outdated; safe to call from any thread."""
+        self._stale = True
+
+    def build_index(self) -> BM25Index:
+        """Build a BM25 index from the text and metadata of every point in the collection."""
+        payloads = self.qdrant_client.scroll_payloads(
+            ["text", "metadata", *CHILD_PAYLOAD_FIELDS, *Config.PAYLOAD_INDEX_FIELDS]
+        )
+        index = BM25Index(payloads.items())
+        logger.info(f"Built BM25 index over {len(index)} points")
+        return index
+
+    async def ensure_index(self) -> Optional[BM25Index]:
+        """
+        Start a BM25 rebuild if the index is stale and the rebuild interval has passed.
+
+        Returns:
+            Optional[BM25Index]: The current index. Only the very first build is
+            awaited; later rebuilds replace the index when they finish.
+        """
+        due = self._built_at is None or time.monotonic() - self._built_at >= self.rebuild_interval
+        if self._stale and due and (self._rebuild_task is None or self._rebuild_task.done()):
+            self._stale = False
+            self._built_at = time.monotonic()
+            self._rebuild_task = asyncio.create_task(self._rebuild())
+
+        if self.index is None and self._rebuild_task is not None:
+            await asyncio.shield(self._rebuild_task)
+        return self.index
+
+    async def _rebuild(self) -> None:
+        try:
+            self.index = await asyncio.get_running_loop().run_in_executor(None, self.build_index)
+        except Exception as e:
+            self._stale = True
+            logger.error(f"Failed to build BM25 index, using dense search only: {str(e)}")
+
+    async def search(
+        self,
+        query: str,
+        query_vector: List[float],
+        limit: int = 5,
+        filters: Optional[Dict[str, FilterValue]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve the best candidates for a query.
+
+        Args:
+            query (str): Query text for keyword search.
+            query_vector (List[float]): Query embedding for dense search.
+            limit (int): Number of entries to return.
+            filters (Optional[Dict[str, FilterValue]]): Payload filters applied to
+                both retrievers; see `validate_filters`.
+
+        Returns:
+            List[Dict[str, Any]]: One candidate per entry, see `aggregate_by_parent`.
+
+        Raises:
+            ValueError: If the collection is empty or doesn't exist, or a filter field is unknown.
+        """
+        dense_results = await self.dense_client.search(query_vector, self.prefetch, filters)
+        if not self.enabled:
+            return aggregate_by_parent(dense_results)[:limit]
+
+        index = await self.ensure_index()
+        sparse_results = (
+            index.search(query, self.prefetch, validate_filters(filters)) if index is not None else []
+        )
+
+        # Chunks are fused first, so an entry collects the fields matched by either retriever
+        fused = reciprocal_rank_fusion([dense_results, sparse_results], self.rrf_k)
+        return aggregate_by_parent(fused)[:limit]
@@ -0,0 +1,235 @@
+import asyncio
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from loguru import logger
+
+from src.config.config import Config
+from src.qdrant.qdrant_utils import CHILD_PAYLOAD_FIELDS, QdrantWrapper, hit_to_result
+from src.retrieval.parent_aggregation import join_entry
+from src.retrieval.relationship_graph import RELATION_TYPES, RelationshipGraph, detect_relation
+from src.utils.utils import find_capec_ids, find_cwe_ids
+
+
+PointId = Union[int, str]
+
+RELATED_CAPEC_PATTERN = re.compile(r"CAPEC ID:(\d+)")
+DIGITS_PATTERN = re.compile(r"\d+")
+
+
+def parse_row_fields(text: str) -> Dict[str, str]:
+    """Split a CSV row text ("Column: value | Column: value") back into its columns."""
+    fields = {}
+    for part in text.split(" | "):
+        column, separator, value = part.partition(": ")
+        if separator:
+            fields[column.strip()] = value.strip()
+    return fields
+
+
+class IdLookup:
+    """
+    Resolve CAPEC and CWE identifiers in a query straight to CAPEC entries.
+
+    Maps from CAPEC ID to point and from CWE ID to the CAPEC entries listing it
+    as a related weakness are built from the CSV points of the collection, so an
+    identifier is answered with dictionary lookups instead of embedding, vector
+    search and reranking. The maps are rebuilt, in a worker thread, on the first
+    lookup after the collection changed, at most once per `rebuild_interval`.
+
+    When a relationship graph is available, related entries are taken from it,
+    following the relation the query asks about ("what can follow CAPEC-X"), and
+    a summary of the entry's relationships is added to the context.
+    """
+
+    def __init__(
+        self,
+        qdrant_client: QdrantWrapper,
+        max_related: int = Config.ID_LOOKUP_MAX_RELATED,
+        max_results: int = Config.ID_LOOKUP_MAX_RESULTS,
+        rebuild_interval: float = Config.SPARSE_INDEX_REBUILD_INTERVAL,
+        graph_loader: Optional[Callable[[], Optional[RelationshipGraph]]] = None,
+    ) -> None:
+        """
+        Initialize the lookup. The maps are built on first use.
+
+        Args:
+            qdrant_client (QdrantWrapper): Client used to read the CSV payloads; a
+                `LocalVectorIndex` works as well.
+            max_related (int): Related attack patterns added per matched entry.
+            max_results (int): Maximum number of entries returned for a query.
+            rebuild_interval (float): Minimum seconds between rebuilds of the maps.
+            graph_loader (Optional[Callable[[], Optional[RelationshipGraph]]]): Returns
+                the relationship graph of the collection, reloaded with the maps.
+        """
+        self.qdrant_client = qdrant_client
+        self.max_related = max_related
+        self.max_results = max_results
+        self.rebuild_interval = rebuild_interval
+        self.graph_loader = graph_loader
+
+        self.entries: Dict[PointId, Dict[str, Any]] = {}
+        self.capec_points: Dict[str, PointId] = {}
+        self.cwe_points: Dict[str, List[PointId]] = {}
+        self.related_capecs: Dict[PointId, List[str]] = {}
+        self.graph: Optional[RelationshipGraph] = None
+        self._stale = True
+        self._built_at: Optional[float] = None
+        self._build_lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        """Mark the maps as outdated; safe to call from any thread."""
+        self._stale = True
+
+    def build(self) -> None:
+        """Rebuild the ID maps from the CSV points of the collection."""
+        payloads = self.qdrant_client.scroll_payloads(
+            ["text", "metadata", "source_file", "capec_id", "related_cwe_ids", *CHILD_PAYLOAD_FIELDS]
+        )
+
+        children: Dict[PointId, List[Dict[str, Any]]] = {}
+        capec_points: Dict[str, PointId] = {}
+        cwe_points: Dict[str, List[PointId]] = {}
+        related_capecs: Dict[PointId, List[str]] = {}
+
+        for point_id, payload in payloads.items():
+            if not str(payload.get("source_file") or "").lower().endswith(".csv"):
+                continue
+            # Points stored before the structured payload fields existed only carry the row text
+            fields = parse_row_fields(payload.get("text") or "")
+            capec_id = payload.get("capec_id") or fields.get("ID")
+            if not capec_id:
+                continue
+
+            # Field-level chunks are collected under their entry; whole-row points are their own entry
+            entry_id = payload.get("parent_id") or point_id
+            children.setdefault(entry_id, []).append({**hit_to_result(point_id, None, payload), "capec_id": capec_id})
+            capec_points[capec_id] = entry_id
+            cwe_ids = payload.get("related_cwe_ids") or DIGITS_PATTERN.findall(fields.get("Related Weaknesses", ""))
+            for cwe_id in cwe_ids:
+                entries_of_cwe = cwe_points.setdefault(cwe_id, [])
+                if entry_id not in entries_of_cwe:
+                    entries_of_cwe.append(entry_id)
+            related = related_capecs.setdefault(entry_id, [])
+            for related_id in RELATED_CAPEC_PATTERN.findall(fields.get("Related Attack Patterns", "")):
+                if related_id not in related:
+                    related.append(related_id)
+
+        entries = {
+            entry_id: {
+                "id": entry_id,
+                "document": chunks[0]["document"],
+                "capec_id": chunks[0].get("capec_id"),
+                "content": join_entry(chunks),
+            }
+            for entry_id, chunks in children.items()
+        }
+
+        self.entries, self.capec_points = entries, capec_points
+        self.cwe_points, self.related_capecs = cwe_points, related_capecs
+        if self.graph_loader is not None:
+            self.graph = self.graph_loader()
+        logger.info(f"Built ID lookup over {len(capec_points)} CAPEC entries and {len(cwe_points)} CWE IDs")
+
+    async def ensure_built(self) -> None:
+        """Rebuild the maps if they are stale and the rebuild interval has passed."""
+        if not self._stale:
+            return
+        if self._built_at is not None and time.monotonic() - self._built_at < self.rebuild_interval:
+            return
+
+        async with self._build_lock:
+            if self._stale:
+                self._stale = False
+                self._built_at = time.monotonic()
+                try:
+                    await asyncio.get_running_loop().run_in_executor(None, self.build)
+                except Exception as e:
+                    self._stale = True
+                    logger.error(f"Failed to build ID lookup: {str(e)}")
+
+    async def resolve(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Return the entries a query refers to by identifier.
+
+        Entries named by CAPEC ID come first, then entries related to a named CWE
+        ID, then the attack patterns related to the matched entries. A query asking
+        about a relation ("what can follow CAPEC-62") is answered with the
+        relationship summary and the entries along that relation after the named ones.
+
+        Args:
+            query (str): User query.
+
+        Returns:
+            List[Dict[str, Any]]: Results with `id`, `document` and `content`; empty
+            when the query names no known identifier.
+        """
+        capec_ids, cwe_ids = find_capec_ids(query), find_cwe_ids(query)
+        if not capec_ids and not cwe_ids:
+            return []
+
+        await self.ensure_built()
+
+        matched: List[PointId] = [
+            self.capec_points[capec_id] for capec_id in capec_ids if capec_id in self.capec_points
+        ]
+        for cwe_id in cwe_ids:
+            matched.extend(self.cwe_points.get(cwe_id, []))
+        matched = list(dict.fromkeys(matched))
+        if not matched:
+            return []
+
+        relation = detect_relation(query) if self.graph is not None and capec_ids else None
+        if relation is not None:
+            neighbors = [
+                self.capec_points[neighbor]
+                for capec_id in capec_ids
+                for neighbor in self.graph.neighbors(capec_id, relation)
+                if neighbor in self.capec_points
+            ]
+            # The named entries stay in the context; the entries along the relation follow them
+            point_ids = list(dict.fromkeys(matched + neighbors))[:self.max_results]
+            return self.describe_relationships(capec_ids) + [self.entries[point_id] for point_id in point_ids]
+
+        related: List[PointId] = []
+        for point_id in matched:
+            for capec_id in self._related(point_id)[:self.max_related]:
+                related_point = self.capec_points.get(capec_id)
+                if related_point is not None:
+                    related.append(related_point)
+
+        point_ids = list(dict.fromkeys(matched + related))[:self.max_results]
+        return self.describe_relationships(capec_ids) + [self.entries[point_id] for point_id in point_ids]
+
+    def _related(self, point_id: PointId) -> List[str]:
+        """Return the CAPEC IDs related to an entry, parents and children first when the graph is loaded."""
+        capec_id = self.entries[point_id].get("capec_id")
+        if self.graph is None or capec_id is None:
+            return self.related_capecs.get(point_id, [])
+        related = [
+            neighbor
+            for relation in RELATION_TYPES
+            for neighbor in self.graph.neighbors(capec_id, relation)
+        ]
+        return list(dict.fromkeys(related))
+
+    def describe_relationships(self, capec_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Return one context result summarizing the graph relationships of each entry.
+
+        Args:
+            capec_ids (List[str]): CAPEC IDs, e.g. of the top search hits.
+
+        Returns:
+            List[Dict[str, Any]]: Results with `id`, `document` and `content`; empty
+            without a relationship graph.
+        """
+        if self.graph is None:
+            return []
+        results = []
+        for capec_id in dict.fromkeys(capec_ids):
+            description = self.graph.describe(capec_id)
+            if description:
+                results.append({"id": f"relationships:{capec_id}", "document": None, "content": description})
+        return results
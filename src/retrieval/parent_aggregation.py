@@ -0,0 +1,79 @@
+from typing import Any, Dict, List
+
+from src.config.config import Config
+from src.parser.csv_parser import CHILD_HEADER_SEPARATOR
+
+
+def aggregate_by_parent(
+    results: List[Dict[str, Any]],
+    mode: str = Config.PARENT_AGGREGATION,
+    max_fields: int = Config.MAX_FIELDS_PER_RESULT,
+) -> List[Dict[str, Any]]:
+    """
+    Group field-level hits by the CAPEC entry they belong to.
+
+    An entry scores the best (`max`) or the total (`sum`) score of its matched
+    fields. Its content is the entry header followed by its best `max_fields`
+    matched fields only, so downstream stages never see the whole row. Hits
+    without a `parent_id` (whole-row points, threat intel) pass through as
+    their own group.
+
+    Args:
+        results (List[Dict[str, Any]]): Hits, best first, as returned by a search backend.
+        mode (str): "max" or "sum".
+        max_fields (int): Matched fields kept per entry.
+
+    Returns:
+        List[Dict[str, Any]]: One result per entry, best first, with the IDs of
+        its matched chunks under `chunk_ids` and their field names under `fields`.
+    """
+    if mode not in ("max", "sum"):
+        raise ValueError(f"Unknown aggregation mode '{mode}', expected 'max' or 'sum'")
+
+    groups: Dict[Any, Dict[str, Any]] = {}
+    for rank, result in enumerate(results):
+        key = result.get("parent_id") or result["id"]
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {"id": key, "document": result.get("document"), "children": [], "rank": rank}
+        group["children"].append(result)
+
+    aggregated = []
+    for group in groups.values():
+        children = group["children"]
+        scores = [child["score"] for child in children if child.get("score") is not None]
+        score = (max(scores) if mode == "max" else sum(scores)) if scores else None
+        aggregated.append({
+            "id": group["id"],
+            "document": group["document"],
+            "capec_id": children[0].get("capec_id"),
+            "content": _join_fields(children[:max_fields]),
+            "score": score,
+            "chunk_ids": [child["id"] for child in children],
+            "fields": [child["field"] for child in children if child.get("field")],
+            "rank": group["rank"],
+        })
+
+    # Backends without scores keep their rank order
+    aggregated.sort(key=lambda item: (item["score"] is None, -(item["score"] or 0.0), item["rank"]))
+    for item in aggregated:
+        del item["rank"]
+    return aggregated
+
+
+def join_entry(children: List[Dict[str, Any]]) -> str:
+    """Join the fields of one entry, in `chunk_index` order, under a single header."""
+    return _join_fields(sorted(children, key=lambda child: child.get("chunk_index", 0)))
+
+
+def _join_fields(children: List[Dict[str, Any]]) -> str:
+    if not any(child.get("parent_id") for child in children):
+        return "\n".join(child["content"] or "" for child in children)
+
+    header = None
+    bodies = []
+    for child in children:
+        child_header, _, body = (child["content"] or "").partition(CHILD_HEADER_SEPARATOR)
+        header = header or child_header
+        bodies.append(body)
+    return "\n".join([header or ""] + bodies)
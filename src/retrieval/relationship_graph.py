@@ -0,0 +1,243 @@
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from loguru import logger
+
+from src.config.config import Config
+from src.parser.csv_parser import RowRecord
+from src.qdrant.qdrant_utils import QdrantWrapper
+
+
+RELATION_TYPES = ("ChildOf", "ParentOf", "CanPrecede", "CanFollow", "PeerOf", "CanAlsoBe")
+# CAPEC usually records one direction of a relationship only; the other is derived
+INVERSE_RELATION = {
+    "ChildOf": "ParentOf",
+    "ParentOf": "ChildOf",
+    "CanPrecede": "CanFollow",
+    "CanFollow": "CanPrecede",
+    "PeerOf": "PeerOf",
+    "CanAlsoBe": "CanAlsoBe",
+}
+RELATED_PATTERN = re.compile(r"NATURE:(\w+):CAPEC ID:(\d+)")
+DIGITS_PATTERN = re.compile(r"\d+")
+
+# Explicit relation phrasing mapped to the relation to follow from the named entry;
+# plain words such as "after" or "next" are too common in ordinary questions
+RELATION_INTENTS = (
+    ("CanPrecede", re.compile(r"\b(can|could|may|might) follow\b|\bfollow[- ]on (attacks?|patterns?)\b", re.IGNORECASE)),
+    ("CanFollow", re.compile(r"\b(can|could|may|might) precede\b", re.IGNORECASE)),
+    ("ChildOf", re.compile(r"\bparents? (of|patterns?)\b", re.IGNORECASE)),
+    ("ParentOf", re.compile(r"\bchild(ren| patterns?)? of\b", re.IGNORECASE)),
+    ("PeerOf", re.compile(r"\bpeers? of\b", re.IGNORECASE)),
+)
+
+
+def detect_relation(query: str) -> Optional[str]:
+    """Return the relation a query asks about ("what can follow CAPEC-66" -> "CanPrecede"), if any."""
+    for relation, pattern in RELATION_INTENTS:
+        if pattern.search(query):
+            return relation
+    return None
+
+
+class RelationshipGraph:
+    """
+    CAPEC relationship graph in compressed sparse row form.
+
+    Nodes are CAPEC IDs sorted ascending. For every relation type, the
+    neighbours of node `i` are `indices[indptr[i]:indptr[i + 1]]` (node
+    positions); related CWE IDs are stored the same way. Lookups are a dict
+    access plus an array slice.
+    """
+
+    def __init__(
+        self,
+        node_ids: np.ndarray,
+        names: np.ndarray,
+        relations: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        weaknesses: Tuple[np.ndarray, np.ndarray],
+    ) -> None:
+        """
+        Wrap prebuilt CSR arrays; use `from_records` or `load` to create a graph.
+
+        Args:
+            node_ids (np.ndarray): Sorted CAPEC IDs.
+            names (np.ndarray): Entry name per node, empty for entries missing from the dataset.
+            relations (Dict[str, Tuple[np.ndarray, np.ndarray]]): `(indptr, indices)` per relation type.
+            weaknesses (Tuple[np.ndarray, np.ndarray]): `(indptr, cwe_ids)` per node.
+        """
+        self.node_ids = node_ids
+        self.names = names
+        self.relations = relations
+        self.weaknesses = weaknesses
+        self.position = {int(node_id): position for position, node_id in enumerate(node_ids)}
+
+    @classmethod
+    def from_records(cls, records: Iterable[RowRecord]) -> "RelationshipGraph":
+        """
+        Parse the "Related Attack Patterns" and "Related Weaknesses" columns of CAPEC rows.
+
+        Rows of the same entry from several views are merged, and every edge is
+        also added in its inverse direction.
+
+        Args:
+            records (Iterable[RowRecord]): Row records carrying `sections`.
+
+        Returns:
+            RelationshipGraph: The graph.
+        """
+        names: Dict[int, str] = {}
+        edges: Dict[str, Set[Tuple[int, int]]] = {relation: set() for relation in RELATION_TYPES}
+        weaknesses: Dict[int, Set[int]] = {}
+
+        for record in records:
+            if not record.get("sections") or not record["capec_id"].isdigit():
+                continue
+            values = dict(record["sections"])
+            source = int(record["capec_id"])
+            names[source] = values.get("Name", "")
+            for relation, target in RELATED_PATTERN.findall(values.get("Related Attack Patterns", "")):
+                if relation in edges:
+                    edges[relation].add((source, int(target)))
+                    edges[INVERSE_RELATION[relation]].add((int(target), source))
+            weaknesses.setdefault(source, set()).update(
+                int(cwe_id) for cwe_id in DIGITS_PATTERN.findall(values.get("Related Weaknesses", ""))
+            )
+
+        node_set = set(names)
+        for relation_edges in edges.values():
+            for source, target in relation_edges:
+                node_set.update((source, target))
+        node_ids = np.array(sorted(node_set), dtype=np.int64)
+        position = {int(node_id): index for index, node_id in enumerate(node_ids)}
+
+        def to_csr(adjacency: Dict[int, List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+            counts = np.array([len(adjacency.get(int(node_id), ())) for node_id in node_ids], dtype=np.int64)
+            indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+            indices = np.array(
+                [value for node_id in node_ids for value in adjacency.get(int(node_id), ())], dtype=np.int64
+            )
+            return indptr, indices
+
+        relations = {}
+        for relation, relation_edges in edges.items():
+            adjacency: Dict[int, List[int]] = {}
+            for source, target in sorted(relation_edges):
+                adjacency.setdefault(source, []).append(position[target])
+            relations[relation] = to_csr(adjacency)
+
+        graph = cls(
+            node_ids,
+            np.array([names.get(int(node_id), "") for node_id in node_ids], dtype=str),
+            relations,
+            to_csr({node: sorted(cwe_ids) for node, cwe_ids in weaknesses.items()}),
+        )
+        logger.info(f"Built relationship graph over {len(node_ids)} CAPEC entries")
+        return graph
+
+    def neighbors(self, capec_id: str, relation: str) -> List[str]:
+        """
+        Return the CAPEC IDs related to an entry.
+
+        Args:
+            capec_id (str): CAPEC ID of the entry.
+            relation (str): One of `RELATION_TYPES`, read as "<entry> <relation> <neighbour>".
+
+        Returns:
+            List[str]: Related CAPEC IDs, ascending; empty for unknown entries.
+        """
+        position = self.position.get(int(capec_id)) if str(capec_id).isdigit() else None
+        if position is None:
+            return []
+        indptr, indices = self.relations[relation]
+        return [str(self.node_ids[index]) for index in indices[indptr[position]:indptr[position + 1]]]
+
+    def related_weaknesses(self, capec_id: str) -> List[str]:
+        """Return the CWE IDs an entry lists as related weaknesses."""
+        position = self.position.get(int(capec_id)) if str(capec_id).isdigit() else None
+        if position is None:
+            return []
+        indptr, cwe_ids = self.weaknesses
+        return [str(cwe_id) for cwe_id in cwe_ids[indptr[position]:indptr[position + 1]]]
+
+    def name(self, capec_id: str) -> str:
+        position = self.position.get(int(capec_id)) if str(capec_id).isdigit() else None
+        return str(self.names[position]) if position is not None else ""
+
+    def describe(self, capec_id: str, max_per_relation: int = Config.GRAPH_MAX_NEIGHBORS) -> Optional[str]:
+        """
+        Summarize the relationships of an entry as one line of context.
+
+        Args:
+            capec_id (str): CAPEC ID of the entry.
+            max_per_relation (int): Neighbours listed per relation type.
+
+        Returns:
+            Optional[str]: e.g. "CAPEC-66 SQL Injection relationships: ChildOf CAPEC-248
+            (Command Injection); Related weaknesses: CWE-89", or None if there are none.
+        """
+        parts = []
+        for relation in RELATION_TYPES:
+            neighbors = self.neighbors(capec_id, relation)
+            if neighbors:
+                listed = ", ".join(
+                    f"CAPEC-{neighbor} ({self.name(neighbor)})" if self.name(neighbor) else f"CAPEC-{neighbor}"
+                    for neighbor in neighbors[:max_per_relation]
+                )
+                parts.append(f"{relation} {listed}")
+        cwe_ids = self.related_weaknesses(capec_id)
+        if cwe_ids:
+            parts.append("Related weaknesses: " + ", ".join(f"CWE-{cwe_id}" for cwe_id in cwe_ids))
+        if not parts:
+            return None
+        return f"CAPEC-{capec_id} {self.name(capec_id)} relationships: " + "; ".join(parts)
+
+    def save(self, path: Path) -> None:
+        """Write the graph to an .npz file, replacing any previous version atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {"node_ids": self.node_ids, "names": self.names}
+        for relation, (indptr, indices) in self.relations.items():
+            arrays[f"{relation}_indptr"] = indptr
+            arrays[f"{relation}_indices"] = indices
+        arrays["cwe_indptr"], arrays["cwe_ids"] = self.weaknesses
+
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as file:
+            np.savez(file, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["RelationshipGraph"]:
+        """
+        Read a graph written by `save`.
+
+        Args:
+            path (Path): Graph file.
+
+        Returns:
+            Optional[RelationshipGraph]: The graph, or None if the file does not exist.
+        """
+        if not Path(path).exists():
+            return None
+        with np.load(path) as arrays:
+            return cls(
+                arrays["node_ids"],
+                arrays["names"],
+                {relation: (arrays[f"{relation}_indptr"], arrays[f"{relation}_indices"]) for relation in RELATION_TYPES},
+                (arrays["cwe_indptr"], arrays["cwe_ids"]),
+            )
+
+
+def collection_graph_path(collection_name: str) -> Path:
+    """Return where the relationship graph of a physical collection is stored."""
+    return Path(Config.RELATIONSHIP_GRAPH_DIR) / f"{collection_name}.npz"
+
+
+def serving_graph_path(qdrant_client: QdrantWrapper) -> Path:
+    """Return the graph path of the physical collection a wrapper currently serves from."""
+    name = qdrant_client.collection_name
+    return collection_graph_path(qdrant_client.get_alias_target(name) or name)
@@ -0,0 +1,139 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+
+
+def _current_rss_bytes() -> Optional[int]:
+    """Return the resident set size of this process, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _parameter_bytes(instance: Any) -> int:
+    """Sum the parameter sizes of the torch modules held by a model wrapper."""
+    total = 0
+    seen = set()
+    for value in vars(instance).values():
+        # CrossEncoder keeps its torch module in `.model`; other wrappers hold modules directly
+        module = getattr(value, "model", value)
+        parameters = getattr(module, "parameters", None)
+        if not callable(parameters) or id(module) in seen:
+            continue
+        seen.add(id(module))
+        try:
+            total += sum(parameter.numel() * parameter.element_size() for parameter in parameters())
+        except Exception:
+            continue
+    return total
+
+
+class ModelRegistry:
+    """
+    Process-wide registry that loads each model lazily, once, and shares the instance.
+
+    Load time, parameter memory and the RSS growth observed while loading are
+    recorded per model.
+    """
+
+    def __init__(self) -> None:
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """
+        Register how to build a model.
+
+        Args:
+            name (str): Registry key.
+            factory (Callable[[], Any]): Zero-argument callable returning the model.
+        """
+        with self._lock:
+            self._factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        """
+        Return the shared instance of a model, loading it on first use.
+
+        Args:
+            name (str): Registry key.
+
+        Returns:
+            Any: The model instance.
+
+        Raises:
+            KeyError: If no factory is registered under `name`.
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if name in self._instances:
+                return self._instances[name]
+
+            rss_before = _current_rss_bytes()
+            start = time.perf_counter()
+            instance = self._factories[name]()
+            load_seconds = time.perf_counter() - start
+            rss_after = _current_rss_bytes()
+
+            self._instances[name] = instance
+            self._stats[name] = {
+                "load_seconds": round(load_seconds, 3),
+                "parameter_mb": round(_parameter_bytes(instance) / 2**20, 1),
+                "rss_growth_mb": (
+                    round((rss_after - rss_before) / 2**20, 1)
+                    if rss_before is not None and rss_after is not None else None
+                ),
+            }
+            logger.info(f"Loaded model '{name}': {self._stats[name]}")
+            return instance
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return load statistics of every model loaded so far."""
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+
+def _load_embedding_model() -> Any:
+    from src.embedder.embedder import EmbeddingWrapper
+    return EmbeddingWrapper()
+
+
+def _load_reranker() -> Any:
+    from src.reranker.re_ranking import RerankDocuments
+    return RerankDocuments()
+
+
+def _load_guardrails() -> Any:
+    from src.guardrails.guardrails import GuardRails
+    return GuardRails()
+
+
+model_registry = ModelRegistry()
+model_registry.register("embedding", _load_embedding_model)
+model_registry.register("reranker", _load_reranker)
+model_registry.register("guardrails", _load_guardrails)
+
+
+def get_embedding_model() -> Any:
+    """Return the shared EmbeddingWrapper."""
+    return model_registry.get("embedding")
+
+
+def get_reranker() -> Any:
+    """Return the shared RerankDocuments."""
+    return model_registry.get("reranker")
+
+
+def get_guardrails() -> Any:
+    """Return the shared GuardRails."""
+    return model_registry.get("guardrails")
@@ -1,5 +1,7 @@
 from typing import List, Dict, Any
+import hashlib
 import re
+import uuid
 from loguru import logger
 
 
@@ -30,3 +32,26 @@ def find_file_names(query: str, database_files: List) -> str:
         return ""
 
 
+def hash_text(text: str) -> str:
+    """Return a stable SHA-256 hex digest of a text, used to detect changed content."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_point_id(source_file: str, key: str) -> str:
+    """Return a deterministic Qdrant point ID (UUID5) for an entry of a source file."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{source_file}:{key}"))
+
+
+# A version number ("CAPEC 3.9") is not an ID
+CAPEC_ID_PATTERN = re.compile(r"\bcapec\s*(?:id)?[\s\-_:#]*(\d+)\b(?!\.\d)", re.IGNORECASE)
+CWE_ID_PATTERN = re.compile(r"\bcwe\s*(?:id)?[\s\-_:#]*(\d+)\b(?!\.\d)", re.IGNORECASE)
+
+
+def find_capec_ids(query: str) -> List[str]:
+    """Return the CAPEC IDs mentioned in a query ("CAPEC-66", "capec 112"), in order and without duplicates."""
+    return list(dict.fromkeys(CAPEC_ID_PATTERN.findall(query)))
+
+
+def find_cwe_ids(query: str) -> List[str]:
+    """Return the CWE IDs mentioned in a query ("CWE-89", "cwe 20"), in order and without duplicates."""
+    return list(dict.fromkeys(CWE_ID_PATTERN.findall(query)))
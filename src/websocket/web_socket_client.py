@@ -163,6 +163,11 @@ class WebSocketClient:
                     }))
                     continue
 
+                # Ingestion progress frames precede the final result
+                if response_data.get("type") == "progress":
+                    logger.info(f"Ingestion progress: {response_data.get('progress')}")
+                    continue
+
                 result = response_data.get("result", "No response from server")
                 if result:
                     if action == "search":
@@ -174,7 +179,7 @@ class WebSocketClient:
                         new_message = (payload.get("query", ""), result)
                         updated_history = history + [new_message]
                         return "", result, direction
-                    elif action == "ingest_data":
+                    elif action in ("ingest_data", "cancel_ingestion"):
                         return result, []
                     elif action == "positive":
                         return result, []
@@ -0,0 +1,122 @@
+from src.chatbot.answer_cache import SemanticAnswerCache, answer_with_cache
+from src.chatbot.conversation import Conversation
+
+
+QUERY = [1.0, 0.0, 0.0]
+SIMILAR_QUERY = [0.99, 0.05, 0.0]
+OTHER_QUERY = [0.0, 1.0, 0.0]
+CONTEXT = ["a", "b"]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeChatBot:
+    def __init__(self) -> None:
+        self.guidelines_version = 0
+        self.calls = 0
+
+    def chat(self, query, context, conversation):
+        self.calls += 1
+        response, run_id = f"answer {self.calls}", f"run-{self.calls}"
+        conversation.record(query, response, run_id)
+        return response, run_id
+
+
+def make_cache(clock=None) -> SemanticAnswerCache:
+    return SemanticAnswerCache(max_size=8, ttl_seconds=60, threshold=0.95, clock=clock or FakeClock())
+
+
+def test_similar_query_with_same_key_is_a_hit():
+    cache = make_cache()
+    cache.put(QUERY, CONTEXT, "history", 1, "answer", "run", latency=2.0)
+
+    cached = cache.get(SIMILAR_QUERY, CONTEXT, "history", 1)
+
+    assert cached["answer"] == "answer"
+    assert cached["run_id"] == "run"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["saved_seconds"] == 2.0
+
+
+def test_query_below_threshold_is_a_miss():
+    cache = make_cache()
+    cache.put(QUERY, CONTEXT, "history", 1, "answer", "run", latency=1.0)
+
+    assert cache.get(OTHER_QUERY, CONTEXT, "history", 1) is None
+
+
+def test_different_context_is_a_miss():
+    cache = make_cache()
+    cache.put(QUERY, CONTEXT, "history", 1, "answer", "run", latency=1.0)
+
+    assert cache.get(QUERY, ["a", "c"], "history", 1) is None
+    assert cache.get(QUERY, ["b", "a"], "history", 1) is None
+
+
+def test_different_history_is_a_miss():
+    cache = make_cache()
+    cache.put(QUERY, CONTEXT, "history", 1, "answer", "run", latency=1.0)
+
+    assert cache.get(QUERY, CONTEXT, "other history", 1) is None
+
+
+def test_new_guidelines_version_is_a_miss_and_clears_the_cache():
+    cache = make_cache()
+    cache.put(QUERY, CONTEXT, "history", 1, "answer", "run", latency=1.0)
+
+    assert cache.get(QUERY, CONTEXT, "history", 2) is None
+    assert cache.stats()["size"] == 0
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_expired_answer_is_a_miss():
+    clock = FakeClock()
+    cache = make_cache(clock)
+    cache.put(QUERY, CONTEXT, "history", 1, "answer", "run", latency=1.0)
+
+    clock.now = 59.0
+    assert cache.get(QUERY, CONTEXT, "history", 1) is not None
+    clock.now = 61.0
+    assert cache.get(QUERY, CONTEXT, "history", 1) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_answer_is_evicted():
+    cache = SemanticAnswerCache(max_size=1, ttl_seconds=60, threshold=0.95, clock=FakeClock())
+    cache.put(QUERY, CONTEXT, "history", 1, "first", "run-1", latency=1.0)
+    cache.put(OTHER_QUERY, CONTEXT, "history", 1, "second", "run-2", latency=1.0)
+
+    assert cache.get(QUERY, CONTEXT, "history", 1) is None
+    assert cache.get(OTHER_QUERY, CONTEXT, "history", 1)["answer"] == "second"
+
+
+def test_similar_query_from_another_connection_is_a_hit():
+    cache, chatbot = make_cache(), FakeChatBot()
+    context_results = [{"id": "a", "content": "entry a"}, {"id": "b", "content": "entry b"}]
+    first, second = Conversation(), Conversation()
+
+    answer = answer_with_cache(cache, chatbot, first, "what is sql injection", QUERY, context_results)
+    reused = answer_with_cache(cache, chatbot, second, "what is sql injection?", SIMILAR_QUERY, context_results)
+
+    assert reused == answer
+    assert chatbot.calls == 1
+    assert second.response == answer
+    assert second.run_id == first.run_id
+
+
+def test_follow_up_in_the_same_connection_is_generated_again():
+    cache, chatbot = make_cache(), FakeChatBot()
+    context_results = [{"id": "a", "content": "entry a"}]
+    conversation = Conversation()
+
+    answer_with_cache(cache, chatbot, conversation, "what is sql injection", QUERY, context_results)
+    answer_with_cache(cache, chatbot, conversation, "what is sql injection?", SIMILAR_QUERY, context_results)
+
+    # The first exchange is now part of the prompt, so the cached answer does not apply
+    assert chatbot.calls == 2
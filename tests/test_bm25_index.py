@@ -0,0 +1,36 @@
+from src.retrieval.bm25_index import BM25Index, tokenize
+
+
+def documents():
+    return [
+        ("sqli", {"text": "SQL injection through unsanitized query parameters", "metadata": None,
+                  "typical_severity": "High"}),
+        ("xss", {"text": "Cross-site scripting through a reflected query parameter", "metadata": None,
+                 "typical_severity": "Medium"}),
+        ("phish", {"text": "Phishing email harvesting credentials", "metadata": None,
+                   "typical_severity": "High"}),
+    ]
+
+
+def test_tokenize_splits_identifiers_and_drops_stop_words():
+    assert tokenize("What is CWE-89 in the CAPEC-66 entry?") == ["cwe", "89", "capec", "66", "entry"]
+
+
+def test_rare_terms_score_higher():
+    results = BM25Index(documents()).search("sql query")
+
+    assert [result["id"] for result in results] == ["sqli", "xss"]
+    assert results[0]["score"] > results[1]["score"] > 0
+
+
+def test_documents_without_query_terms_are_left_out():
+    assert BM25Index(documents()).search("buffer overflow") == []
+    assert BM25Index([]).search("sql") == []
+
+
+def test_limit_and_filters():
+    index = BM25Index(documents())
+
+    assert len(index.search("through", limit=1)) == 1
+    filtered = index.search("query", filters={"typical_severity": ["Medium"]})
+    assert [result["id"] for result in filtered] == ["xss"]
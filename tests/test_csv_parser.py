@@ -0,0 +1,98 @@
+from src.config.config import Config
+from src.parser.csv_parser import CsvParser, RowRecord, split_text
+from src.utils.utils import make_point_id
+
+
+def test_short_text_is_kept_whole():
+    assert split_text("::one::two::", 100) == ["::one::two::"]
+
+
+def test_list_items_are_packed_into_pieces():
+    assert split_text("::aa::bb::cccc::", 10) == ["aa :: bb", "cccc"]
+
+
+def test_long_item_is_cut_at_whitespace():
+    pieces = split_text("one two three four five six", 10)
+
+    assert pieces == ["one two", "three", "four five", "six"]
+
+
+def test_pieces_respect_the_limit_and_are_never_empty():
+    text = "::" + "::".join(f"step {i} " + "word " * i for i in range(30)) + "::"
+
+    pieces = split_text(text, 50)
+
+    assert all(0 < len(piece) <= 50 for piece in pieces)
+    words = [word for word in " ".join(pieces).split() if word != "::"]
+    assert words == text.replace("::", " ").split()
+
+
+def row(capec_id="66", sections=None):
+    return RowRecord(
+        id=make_point_id("capec", capec_id),
+        capec_id=capec_id,
+        text="ID: 66 | Name: SQL Injection",
+        content_hash="hash",
+        source_file="1000.csv",
+        source_views=["1000.csv", "3000.csv"],
+        fields={"capec_id": capec_id},
+        sections=sections if sections is not None else [
+            ("ID", capec_id),
+            ("Name", "SQL Injection"),
+            ("Abstraction", "Standard"),
+            ("Typical Severity", "High"),
+            ("Description", "Inject SQL through input"),
+            ("Mitigations", "::Use prepared statements::Validate input::"),
+        ],
+    )
+
+
+def test_split_fields_creates_a_summary_and_one_child_per_field():
+    children = CsvParser.split_fields([row()])
+
+    assert [child["field"] for child in children] == ["Summary", "Description", "Mitigations"]
+    assert [child["chunk_index"] for child in children] == [0, 1, 2]
+    assert children[0]["text"] == "CAPEC-66 SQL Injection | Abstraction: Standard | Typical Severity: High"
+    assert children[1]["text"] == "CAPEC-66 SQL Injection | Description: Inject SQL through input"
+    assert all(child["parent_id"] == row()["id"] for child in children)
+    assert all(child["source_views"] == ["1000.csv", "3000.csv"] for child in children)
+
+
+def test_split_fields_ids_are_deterministic_and_unique(monkeypatch):
+    monkeypatch.setattr(Config, "FIELD_CHUNK_CHARS", 30)
+
+    first = CsvParser.split_fields([row()])
+    second = CsvParser.split_fields([row()])
+
+    assert [child["id"] for child in first] == [child["id"] for child in second]
+    assert len({child["id"] for child in first}) == len(first)
+    # The mitigations list no longer fits one piece and is split into parts
+    assert [child["field"] for child in first].count("Mitigations") == 2
+    assert [child["text"] for child in first][-2:] == [
+        "CAPEC-66 SQL Injection | Mitigations: Use prepared statements",
+        "CAPEC-66 SQL Injection | Mitigations: Validate input",
+    ]
+
+
+def test_rows_without_sections_pass_through():
+    record = row(sections=[])
+
+    assert CsvParser.split_fields([record]) == [record]
+
+
+def test_row_text_is_built_from_the_row_sections(tmp_path, monkeypatch):
+    from src.parser import csv_parser
+
+    monkeypatch.setattr(csv_parser, "get_embedding_model", lambda: None)
+    # CAPEC exports quote the first header and end every row with a separator
+    (tmp_path / "1000.csv").write_text(
+        "'ID,Name,Description,Notes\n"
+        "66,SQL Injection,  Inject SQL through input  ,,\n",
+        encoding="utf-8",
+    )
+
+    [record] = CsvParser(str(tmp_path)).read_records(tmp_path / "1000.csv")
+
+    assert record["sections"] == [("ID", "66"), ("Name", "SQL Injection"), ("Description", "Inject SQL through input")]
+    assert record["text"] == "ID: 66 | Name: SQL Injection | Description: Inject SQL through input"
+    assert record["capec_id"] == "66"
@@ -0,0 +1,44 @@
+import threading
+from pathlib import Path
+
+from src.ingestion.dataset_watcher import DatasetWatcher
+
+
+class FakeSync:
+    def __init__(self, data_dir) -> None:
+        self.parser = type("Parser", (), {"data_dir": data_dir})()
+
+
+def make_watcher(tmp_path, write_lock) -> DatasetWatcher:
+    watcher = DatasetWatcher(
+        FakeSync(tmp_path), file_processor=None, qdrant_client=None, pipeline=object(),
+        debounce_seconds=0, write_lock=write_lock,
+    )
+    watcher.applied = []
+    watcher.apply = lambda changed, removed: watcher.applied.append((changed, removed))
+    return watcher
+
+
+def test_changes_wait_while_another_writer_holds_the_lock(tmp_path):
+    write_lock = threading.Lock()
+    watcher = make_watcher(tmp_path, write_lock)
+    watcher.scan = lambda: {Path("1000.csv"): (2, 10)}
+    watcher._snapshot = {Path("1000.csv"): (1, 10)}
+
+    with write_lock:
+        watcher.poll()
+    assert watcher.applied == []
+
+    watcher.poll()
+    assert watcher.applied == [([Path("1000.csv")], [])]
+    assert not write_lock.locked()
+
+
+def test_removed_files_are_applied(tmp_path):
+    watcher = make_watcher(tmp_path, None)
+    watcher.scan = lambda: {}
+    watcher._snapshot = {Path("rules.yar"): (1, 10)}
+
+    watcher.poll()
+
+    assert watcher.applied == [([], [Path("rules.yar")])]
@@ -0,0 +1,62 @@
+import json
+
+import numpy as np
+
+from src.embedder.embedding_cache import EmbeddingCache
+
+
+def open_cache(tmp_path, **kwargs) -> EmbeddingCache:
+    return EmbeddingCache(dim=3, cache_dir=str(tmp_path), model_name="test-model", version="1", **kwargs)
+
+
+def vectors(count):
+    return np.arange(count * 3, dtype=np.float32).reshape(count, 3)
+
+
+def test_reopened_cache_replays_the_log(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.put_many(["a", "b"], vectors(2))
+    assert cache.log_path.read_text().splitlines() == ["a 0", "b 1"]
+    assert not cache.index_path.exists()
+
+    # Reopened without a flush, e.g. after a crash
+    reopened = open_cache(tmp_path)
+
+    np.testing.assert_array_equal(reopened.get("b"), vectors(2)[1])
+    assert reopened.get("c") is None
+    assert json.loads(reopened.index_path.read_text()) == {"a": 0, "b": 1}
+    assert reopened.log_path.read_text() == ""
+
+
+def test_torn_log_line_is_skipped(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.put_many(["a"], vectors(1))
+    with open(cache.log_path, "a", encoding="utf-8") as log:
+        log.write("b")
+
+    reopened = open_cache(tmp_path)
+
+    assert len(reopened) == 1
+    assert reopened.get("b") is None
+
+
+def test_log_is_compacted_past_its_entry_limit(tmp_path):
+    cache = open_cache(tmp_path, log_max_entries=3)
+    cache.put_many(["a", "b"], vectors(2))
+    assert cache.log_entries == 2
+
+    cache.put_many(["c"], vectors(3)[2:])
+
+    assert cache.log_entries == 0
+    assert cache.log_path.read_text() == ""
+    assert json.loads(cache.index_path.read_text()) == {"a": 0, "b": 1, "c": 2}
+    np.testing.assert_array_equal(open_cache(tmp_path).get("c"), vectors(3)[2])
+
+
+def test_known_hashes_are_not_stored_twice(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.put_many(["a"], vectors(1))
+    cache.put_many(["a", "b"], vectors(2))
+
+    assert len(cache) == 2
+    assert cache.log_path.read_text().splitlines() == ["a 0", "b 1"]
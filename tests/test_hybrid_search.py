@@ -0,0 +1,44 @@
+import pytest
+
+from src.retrieval.hybrid_search import reciprocal_rank_fusion
+
+
+def result(point_id, content=None, score=None):
+    return {"id": point_id, "document": None, "content": content or point_id, "score": score}
+
+
+def test_results_found_by_both_retrievers_rank_first():
+    dense = [result("a"), result("b"), result("c")]
+    sparse = [result("c"), result("d")]
+
+    fused = reciprocal_rank_fusion([dense, sparse], k=60)
+
+    # "b" and "d" tie at rank 2; ties keep the order they were first seen in
+    assert [item["id"] for item in fused] == ["c", "a", "b", "d"]
+
+
+def test_fused_score_replaces_retriever_score():
+    fused = reciprocal_rank_fusion([[result("a", score=0.9)], [result("b", score=12.0), result("a", score=3.0)]], k=10)
+
+    scores = {item["id"]: item["score"] for item in fused}
+    assert scores["a"] == pytest.approx(1 / 11 + 1 / 12)
+    assert scores["b"] == pytest.approx(1 / 11)
+
+
+def test_first_occurrence_payload_is_kept():
+    fused = reciprocal_rank_fusion([[result("a", content="dense")], [result("a", content="sparse")]])
+
+    assert len(fused) == 1
+    assert fused[0]["content"] == "dense"
+
+
+def test_inputs_are_not_mutated():
+    dense = [result("a", score=0.5)]
+
+    reciprocal_rank_fusion([dense, []])
+
+    assert dense[0]["score"] == 0.5
+
+
+def test_empty_rankings():
+    assert reciprocal_rank_fusion([[], []]) == []
@@ -0,0 +1,135 @@
+import pytest
+
+from src.config.config import Config
+from src.ingestion.incremental_sync import IncrementalSync
+from src.parser.csv_parser import CsvParser
+
+
+def row(capec_id, text, view):
+    return {
+        "id": f"{view}:{capec_id}",
+        "capec_id": capec_id,
+        "text": text,
+        "content_hash": "",
+        "source_file": view,
+        "source_views": [view],
+        "fields": {},
+    }
+
+
+class FakeParser:
+    def __init__(self, files, unreadable=()) -> None:
+        self.files = files
+        self.unreadable = unreadable
+
+    def list_files(self):
+        return list(self.files)
+
+    def iter_file_records(self, failed_files=None):
+        for name, rows in self.files.items():
+            if name in self.unreadable:
+                failed_files.append(name)
+                continue
+            yield rows
+
+    def index_records(self, records):
+        return CsvParser.dedupe_records(records)
+
+    def iter_embedded_batches(self, records):
+        for record in records:
+            yield [{**record, "embeddings": [1.0, 0.0]}]
+
+
+class FakeQdrant:
+    def __init__(self, payloads) -> None:
+        self.payloads = payloads
+        self.deleted = []
+
+    def scroll_payloads(self, fields, page_size=1000, source_file=None):
+        return self.payloads
+
+    def delete_points(self, point_ids):
+        self.deleted.extend(point_ids)
+
+
+class FakePipeline:
+    def __init__(self) -> None:
+        self.upserted = []
+
+    def run(self, batches, progress=None):
+        for batch in batches:
+            self.upserted.extend(chunk["id"] for chunk in batch)
+        return len(self.upserted)
+
+
+@pytest.fixture(autouse=True)
+def no_graph(monkeypatch):
+    monkeypatch.setattr(Config, "RELATIONSHIP_GRAPH_ENABLED", False)
+
+
+def stored(records):
+    return {
+        record["id"]: {
+            "content_hash": record["content_hash"],
+            "source_file": record["source_file"],
+            "source_views": record["source_views"],
+        }
+        for record in records
+    }
+
+
+def run_sync(files, payloads, unreadable=()):
+    qdrant, pipeline = FakeQdrant(payloads), FakePipeline()
+    report = IncrementalSync(FakeParser(files, unreadable), qdrant, pipeline=pipeline).sync()
+    return report, qdrant, pipeline
+
+
+def test_adds_updates_and_deletes_rows():
+    before = CsvParser.dedupe_records([row("1", "one", "1000.csv"), row("2", "two", "1000.csv"), row("3", "three", "1000.csv")])
+    files = {"1000.csv": [row("1", "one", "1000.csv"), row("2", "two, edited", "1000.csv"), row("4", "four", "1000.csv")]}
+
+    report, qdrant, pipeline = run_sync(files, stored(before))
+
+    assert report == {"added": 1, "updated": 1, "deleted": 1, "unchanged": 1}
+    ids = {record["capec_id"]: record["id"] for record in CsvParser.dedupe_records(files["1000.csv"])}
+    assert pipeline.upserted == [ids["2"], ids["4"]]
+    assert qdrant.deleted == [before[2]["id"]]
+
+
+def test_unchanged_dataset_writes_nothing():
+    files = {"1000.csv": [row("1", "one", "1000.csv")]}
+
+    report, qdrant, pipeline = run_sync(files, stored(CsvParser.dedupe_records(files["1000.csv"])))
+
+    assert report == {"added": 0, "updated": 0, "deleted": 0, "unchanged": 1}
+    assert pipeline.upserted == []
+    assert qdrant.deleted == []
+
+
+def test_rows_of_an_unreadable_view_are_neither_rewritten_nor_deleted():
+    files = {
+        "1000.csv": [row("1", "one", "1000.csv"), row("2", "two", "1000.csv")],
+        "3000.csv": [row("1", "one", "3000.csv"), row("3", "three", "3000.csv")],
+    }
+    before = CsvParser.dedupe_records(files["1000.csv"] + files["3000.csv"])
+
+    report, qdrant, pipeline = run_sync(files, stored(before), unreadable={"3000.csv"})
+
+    # Entry 1 would lose the 3000.csv view and entry 3 would disappear without it
+    assert pipeline.upserted == []
+    assert qdrant.deleted == []
+    assert report == {"added": 0, "updated": 0, "deleted": 0, "unchanged": 2}
+
+
+def test_shared_entries_are_rewritten_once_every_view_is_readable_again():
+    files = {
+        "1000.csv": [row("1", "one", "1000.csv")],
+        "3000.csv": [row("1", "one", "3000.csv")],
+    }
+    # Stored while 3000.csv was missing from the dataset
+    before = CsvParser.dedupe_records(files["1000.csv"])
+
+    report, qdrant, pipeline = run_sync(files, stored(before))
+
+    assert report["updated"] == 1
+    assert pipeline.upserted == [before[0]["id"]]
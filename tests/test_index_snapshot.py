@@ -0,0 +1,93 @@
+import json
+
+import numpy as np
+
+from src.config.config import Config
+from src.ingestion.index_snapshot import IndexSnapshot
+
+
+class FakeQdrant:
+    collection_name = "capec"
+
+    def __init__(self, pages) -> None:
+        self.pages = pages
+
+    def iter_points(self, page_size: int = 1000):
+        yield from self.pages
+
+    def get_alias_target(self, name):
+        return None
+
+
+def point(point_id, vector, content_hash):
+    return point_id, vector, {"text": f"text {point_id}", "content_hash": content_hash, "source_file": "1000.csv"}
+
+
+def test_export_streams_every_page_in_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "RELATIONSHIP_GRAPH_DIR", str(tmp_path / "graphs"))
+    monkeypatch.setattr(Config, "INGESTION_BATCH_SIZE", 2)
+    pages = [
+        [point(1, [1.0, 0.0, 0.0], "h1"), point(2, [0.0, 1.0, 0.0], "h2")],
+        [point(3, [0.0, 0.0, 1.0], "h3")],
+    ]
+
+    snapshot = IndexSnapshot.export(FakeQdrant(pages), str(tmp_path / "local"))
+
+    embeddings = np.load(snapshot.path / IndexSnapshot.EMBEDDINGS_FILE)
+    np.testing.assert_array_equal(embeddings, np.eye(3, dtype=np.float32))
+    with open(snapshot.path / IndexSnapshot.PAYLOADS_FILE, encoding="utf-8") as payloads:
+        records = [json.loads(line) for line in payloads]
+    assert [record["id"] for record in records] == [1, 2, 3]
+    assert records[2]["text"] == "text 3"
+    assert snapshot.manifest["count"] == 3
+    assert snapshot.manifest["dim"] == 3
+    assert sorted(file.name for file in snapshot.path.iterdir()) == [
+        IndexSnapshot.EMBEDDINGS_FILE, IndexSnapshot.MANIFEST_FILE, IndexSnapshot.PAYLOADS_FILE,
+    ]
+
+
+def test_export_of_an_empty_collection(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "RELATIONSHIP_GRAPH_DIR", str(tmp_path / "graphs"))
+
+    snapshot = IndexSnapshot.export(FakeQdrant([[]]), str(tmp_path / "local"))
+
+    assert snapshot.manifest["count"] == 0
+    assert np.load(snapshot.path / IndexSnapshot.EMBEDDINGS_FILE).shape[0] == 0
+
+
+def write_manifest(path, **overrides):
+    path.mkdir()
+    manifest = {
+        "format_version": IndexSnapshot.FORMAT_VERSION,
+        "embedding_model": Config.EMBEDDING_MODEL,
+        "embedding_version": Config.EMBEDDING_VERSION_NUMBER,
+        "embedding_backend": Config.EMBEDDING_BACKEND,
+        **overrides,
+    }
+    (path / IndexSnapshot.MANIFEST_FILE).write_text(json.dumps(manifest), encoding="utf-8")
+    return IndexSnapshot(path)
+
+
+def test_snapshot_of_another_embedding_backend_is_incompatible(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "EMBEDDING_BACKEND", "onnx")
+
+    assert write_manifest(tmp_path / "onnx").is_compatible()
+    assert not write_manifest(tmp_path / "torch", embedding_backend="torch").is_compatible()
+
+
+def test_manifest_without_a_backend_was_built_with_torch(tmp_path, monkeypatch):
+    snapshot = write_manifest(tmp_path / "legacy")
+    del snapshot.manifest["embedding_backend"]
+
+    monkeypatch.setattr(Config, "EMBEDDING_BACKEND", "torch")
+    assert snapshot.is_compatible()
+    monkeypatch.setattr(Config, "EMBEDDING_BACKEND", "onnx")
+    assert not snapshot.is_compatible()
+
+
+def test_export_records_the_embedding_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "RELATIONSHIP_GRAPH_DIR", str(tmp_path / "graphs"))
+
+    snapshot = IndexSnapshot.export(FakeQdrant([[point(1, [1.0, 0.0], "h1")]]), str(tmp_path / "local"))
+
+    assert snapshot.manifest["embedding_backend"] == Config.EMBEDDING_BACKEND
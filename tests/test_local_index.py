@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.qdrant.local_index import FallbackSearchClient
+
+
+class FakePrimary:
+    def __init__(self, error=None) -> None:
+        self.error = error
+        self.calls = 0
+
+    async def search(self, query_vector, limit=5, filters=None):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return [{"id": "qdrant"}]
+
+
+class FakeIndex:
+    def search(self, query_vector, limit=5, filters=None):
+        return [{"id": "local"}]
+
+
+def test_fallback_is_opened_off_the_event_loop():
+    loaded_in = []
+
+    def load_fallback():
+        loaded_in.append(threading.current_thread())
+        return FakeIndex()
+
+    client = FallbackSearchClient(FakePrimary(ConnectionError("down")), load_fallback, retry_interval=60)
+    results = asyncio.run(client.search([1.0, 0.0]))
+
+    assert results == [{"id": "local"}]
+    assert loaded_in and loaded_in[0] is not threading.main_thread()
+    assert client.fallback_searches == 1
+
+
+def test_primary_is_skipped_during_the_retry_interval():
+    primary = FakePrimary(ConnectionError("down"))
+    client = FallbackSearchClient(primary, lambda: None, retry_interval=60, fallback=FakeIndex())
+
+    async def search_twice():
+        await client.search([1.0])
+        return await client.search([1.0])
+
+    assert asyncio.run(search_twice()) == [{"id": "local"}]
+    assert primary.calls == 1
+
+
+def test_value_errors_are_not_treated_as_outages():
+    client = FallbackSearchClient(FakePrimary(ValueError("empty")), lambda: FakeIndex())
+
+    with pytest.raises(ValueError):
+        asyncio.run(client.search([1.0]))
+    assert client.fallback_searches == 0
+
+
+def test_reload_keeps_the_open_index_when_no_snapshot_exists():
+    index = FakeIndex()
+    client = FallbackSearchClient(FakePrimary(), lambda: None, fallback=index)
+
+    client.reload()
+
+    assert client.fallback is index
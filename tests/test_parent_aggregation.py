@@ -0,0 +1,82 @@
+import pytest
+
+from src.retrieval.parent_aggregation import aggregate_by_parent, join_entry
+
+
+def child(point_id, parent_id, field, body, score=None, chunk_index=0):
+    return {
+        "id": point_id,
+        "document": {"source": "1000.csv"},
+        "content": f"CAPEC-66 SQL Injection | {field}: {body}",
+        "score": score,
+        "parent_id": parent_id,
+        "field": field,
+        "chunk_index": chunk_index,
+    }
+
+
+def test_children_are_grouped_under_their_entry():
+    results = [
+        child("c1", "p66", "Description", "inject SQL", 0.9),
+        {"id": "ioc", "document": None, "content": "1.2.3.4", "score": 0.8},
+        child("c2", "p66", "Mitigations", "use prepared statements", 0.7),
+    ]
+
+    aggregated = aggregate_by_parent(results, mode="max", max_fields=3)
+
+    assert [item["id"] for item in aggregated] == ["p66", "ioc"]
+    entry = aggregated[0]
+    assert entry["chunk_ids"] == ["c1", "c2"]
+    assert entry["fields"] == ["Description", "Mitigations"]
+    assert entry["content"] == (
+        "CAPEC-66 SQL Injection\nDescription: inject SQL\nMitigations: use prepared statements"
+    )
+    assert aggregated[1]["content"] == "1.2.3.4"
+
+
+def test_max_and_sum_modes():
+    results = [
+        child("c1", "p1", "Description", "a", 0.6),
+        child("c2", "p1", "Mitigations", "b", 0.5),
+        child("c3", "p2", "Description", "c", 0.7),
+    ]
+
+    by_max = aggregate_by_parent(results, mode="max")
+    by_sum = aggregate_by_parent(results, mode="sum")
+
+    assert [(item["id"], item["score"]) for item in by_max] == [("p2", 0.7), ("p1", 0.6)]
+    assert [item["id"] for item in by_sum] == ["p1", "p2"]
+    assert by_sum[0]["score"] == pytest.approx(1.1)
+
+
+def test_content_keeps_only_the_best_fields():
+    results = [child(f"c{i}", "p1", f"Field{i}", str(i), 1.0 - i / 10) for i in range(5)]
+
+    entry = aggregate_by_parent(results, max_fields=2)[0]
+
+    assert entry["content"] == "CAPEC-66 SQL Injection\nField0: 0\nField1: 1"
+    assert len(entry["chunk_ids"]) == 5
+
+
+def test_unscored_results_keep_rank_order():
+    results = [child("c1", "p2", "Description", "a"), child("c2", "p1", "Description", "b")]
+
+    assert [item["id"] for item in aggregate_by_parent(results)] == ["p2", "p1"]
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        aggregate_by_parent([], mode="mean")
+
+
+def test_join_entry_orders_children_by_chunk_index():
+    children = [
+        child("c2", "p1", "Mitigations", "second", chunk_index=2),
+        child("c0", "p1", "Description", "first", chunk_index=0),
+    ]
+
+    assert join_entry(children) == "CAPEC-66 SQL Injection\nDescription: first\nMitigations: second"
+
+
+def test_join_entry_of_a_whole_row():
+    assert join_entry([{"id": "r1", "content": "ID: 66 | Name: SQL Injection"}]) == "ID: 66 | Name: SQL Injection"
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.embedder.query_cache import QueryEmbeddingCache, normalize_query
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = QueryEmbeddingCache(max_size=2, ttl_seconds=60, clock=FakeClock())
+    cache.put("a", np.zeros(2))
+    cache.put("b", np.ones(2))
+    cache.get("a")
+
+    cache.put("c", np.ones(2))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_entries_expire_after_their_ttl():
+    clock = FakeClock()
+    cache = QueryEmbeddingCache(max_size=2, ttl_seconds=60, clock=clock)
+    cache.put("a", np.zeros(2))
+
+    clock.now = 60.0
+    assert cache.get("a") is not None
+    clock.now = 60.5
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_hits_and_misses_are_counted():
+    cache = QueryEmbeddingCache(max_size=2, ttl_seconds=60, clock=FakeClock())
+    cache.put("a", np.zeros(2))
+    cache.get("a")
+    cache.get("b")
+
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "size": 1, "max_size": 2}
+
+
+def test_cached_embeddings_are_read_only():
+    cache = QueryEmbeddingCache(max_size=2, ttl_seconds=60, clock=FakeClock())
+    cache.put("a", np.zeros(2))
+
+    with pytest.raises(ValueError):
+        cache.get("a")[0] = 1.0
+
+
+def test_queries_differing_in_case_and_whitespace_share_a_key():
+    assert normalize_query("  What is  CAPEC-66?\n") == "what is capec-66?"
+    assert normalize_query("SQL\tInjection") == normalize_query("sql injection")
+    assert normalize_query("sql injection") != normalize_query("sql-injection")
@@ -0,0 +1,97 @@
+from src.parser.csv_parser import RowRecord
+from src.retrieval.relationship_graph import RelationshipGraph, detect_relation
+
+
+def row(capec_id, name, related="", weaknesses="", source_file="1000.csv"):
+    return RowRecord(
+        id=capec_id,
+        capec_id=capec_id,
+        text="",
+        content_hash="",
+        source_file=source_file,
+        source_views=[source_file],
+        sections=[
+            ("ID", capec_id),
+            ("Name", name),
+            ("Related Attack Patterns", related),
+            ("Related Weaknesses", weaknesses),
+        ],
+    )
+
+
+def build_graph():
+    return RelationshipGraph.from_records([
+        row("66", "SQL Injection", "::NATURE:ChildOf:CAPEC ID:248::NATURE:CanPrecede:CAPEC ID:7::", "::89::1286::"),
+        row("248", "Command Injection"),
+        row("7", "Blind SQL Injection", "::NATURE:ChildOf:CAPEC ID:66::"),
+        # The same entry in another view adds its relations to the same node
+        row("66", "SQL Injection", "::NATURE:PeerOf:CAPEC ID:470::", source_file="3000.csv"),
+    ])
+
+
+def test_edges_are_added_in_both_directions():
+    graph = build_graph()
+
+    assert graph.neighbors("66", "ChildOf") == ["248"]
+    assert graph.neighbors("248", "ParentOf") == ["66"]
+    assert graph.neighbors("66", "CanPrecede") == ["7"]
+    assert graph.neighbors("7", "CanFollow") == ["66"]
+    assert graph.neighbors("66", "ParentOf") == ["7"]
+    assert graph.neighbors("7", "ChildOf") == ["66"]
+
+
+def test_relations_are_merged_across_views():
+    graph = build_graph()
+
+    assert graph.neighbors("66", "PeerOf") == ["470"]
+    assert graph.neighbors("470", "PeerOf") == ["66"]
+
+
+def test_nodes_missing_from_the_dataset_have_no_name():
+    graph = build_graph()
+
+    assert graph.name("470") == ""
+    assert graph.name("66") == "SQL Injection"
+
+
+def test_unknown_entries_have_no_neighbors():
+    graph = build_graph()
+
+    assert graph.neighbors("9999", "ChildOf") == []
+    assert graph.neighbors("not-an-id", "ChildOf") == []
+    assert graph.related_weaknesses("9999") == []
+
+
+def test_related_weaknesses():
+    assert build_graph().related_weaknesses("66") == ["89", "1286"]
+
+
+def test_describe():
+    description = build_graph().describe("66")
+
+    assert description.startswith("CAPEC-66 SQL Injection relationships: ChildOf CAPEC-248 (Command Injection)")
+    assert "CanPrecede CAPEC-7 (Blind SQL Injection)" in description
+    assert "PeerOf CAPEC-470;" in description
+    assert description.endswith("Related weaknesses: CWE-89, CWE-1286")
+    assert build_graph().describe("9999") is None
+
+
+def test_save_and_load_round_trip(tmp_path):
+    graph = build_graph()
+    path = tmp_path / "graphs" / "collection.npz"
+
+    graph.save(path)
+    loaded = RelationshipGraph.load(path)
+
+    assert loaded.describe("66") == graph.describe("66")
+    assert loaded.neighbors("248", "ParentOf") == ["66"]
+    assert RelationshipGraph.load(tmp_path / "missing.npz") is None
+
+
+def test_detect_relation():
+    assert detect_relation("What can follow CAPEC-62?") == "CanPrecede"
+    assert detect_relation("Which attacks could precede CAPEC-62?") == "CanFollow"
+    assert detect_relation("What is the parent of CAPEC-66?") == "ChildOf"
+    assert detect_relation("List the children of CAPEC-66") == "ParentOf"
+    assert detect_relation("How do I detect CAPEC-66 after an attack?") is None
+    assert detect_relation("What comes next for a variant of CAPEC-66?") is None
@@ -0,0 +1,40 @@
+import pytest
+
+from src.qdrant.search_filters import build_search_filter, payload_matches, validate_filters
+
+
+def test_validate_filters_normalizes_values_to_lists():
+    assert validate_filters({"typical_severity": "High", "source_views": ("1000.csv", "3000.csv")}) == {
+        "typical_severity": ["High"],
+        "source_views": ["1000.csv", "3000.csv"],
+    }
+    assert validate_filters(None) == {}
+
+
+def test_validate_filters_rejects_unknown_fields():
+    with pytest.raises(ValueError):
+        validate_filters({"description": "sql"})
+
+
+def test_no_filter_is_built_without_filters():
+    assert build_search_filter({}) is None
+
+
+def test_payload_matches_any_accepted_value():
+    payload = {"typical_severity": "High", "related_cwe_ids": ["89", "20"]}
+
+    assert payload_matches(payload, {"typical_severity": ["High", "Very High"]})
+    assert payload_matches(payload, {"related_cwe_ids": ["20"]})
+    assert not payload_matches(payload, {"related_cwe_ids": ["79"]})
+
+
+def test_payload_matches_requires_every_field():
+    payload = {"typical_severity": "High", "abstraction": "Standard"}
+
+    assert payload_matches(payload, {"typical_severity": ["High"], "abstraction": ["Standard"]})
+    assert not payload_matches(payload, {"typical_severity": ["High"], "abstraction": ["Meta"]})
+
+
+def test_missing_field_does_not_match():
+    assert not payload_matches({}, {"status": ["Stable"]})
+    assert payload_matches({}, {})
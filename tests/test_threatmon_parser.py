@@ -0,0 +1,104 @@
+import pytest
+
+from src.parser import threatmon_parser
+from src.parser.threatmon_parser import FileProcessor, strip_yara_literals
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    # Rule splitting needs no embedding model
+    monkeypatch.setattr(threatmon_parser, "get_embedding_model", lambda: None)
+    return FileProcessor()
+
+
+def split_rules(processor, tmp_path, source):
+    path = tmp_path / "rules.yar"
+    path.write_text(source, encoding="utf-8")
+    return list(processor.iter_yara_rules(path))
+
+
+def test_strip_removes_quoted_strings_and_comments():
+    assert strip_yara_literals('$a = "{ not a brace }" // }') == ("$a =  ", False)
+    assert strip_yara_literals('$a = "quote \\" }"') == ("$a = ", False)
+
+
+def test_strip_removes_regex_literals_only_where_a_value_is_expected():
+    assert strip_yara_literals("$re = /a{2,}}/ nocase") == ("$re =  nocase", False)
+    assert strip_yara_literals("$s matches /x}/") == ("$s matches ", False)
+    assert strip_yara_literals("#a / 2 > 1") == ("#a / 2 > 1", False)
+
+
+def test_strip_tracks_block_comments_across_lines():
+    assert strip_yara_literals("rule a { /* opens {") == ("rule a { ", True)
+    assert strip_yara_literals("still } inside", in_comment=True) == ("", True)
+    assert strip_yara_literals("closes */ }", in_comment=True) == (" }", False)
+
+
+def test_braces_inside_literals_do_not_end_a_rule(processor, tmp_path):
+    rules = split_rules(processor, tmp_path, """import "pe"
+
+rule first {
+    strings:
+        $a = "}}"
+        $re = /[a-z]{3}}/
+        $h = { 4D 5A ?? [2-4] 90 }
+    condition:
+        // a closing brace in a comment }
+        any of them
+}
+
+rule second {
+    /* a block comment
+       with a } inside */
+    condition:
+        true
+}
+""")
+
+    assert [rule["rule_name"] for rule in rules] == ["first", "second"]
+    assert rules[0]["text"].endswith("any of them\n}")
+    assert "with a } inside" in rules[1]["text"]
+
+
+def test_multi_line_hex_string_stays_in_its_rule(processor, tmp_path):
+    rules = split_rules(processor, tmp_path, """rule hex {
+    strings:
+        $h = { 4D 5A
+               90 00 }
+    condition:
+        $h
+}
+""")
+
+    assert len(rules) == 1
+    assert rules[0]["text"].splitlines()[-1] == "}"
+
+
+def test_rule_start_inside_a_comment_is_ignored(processor, tmp_path):
+    rules = split_rules(processor, tmp_path, """/*
+rule commented_out { condition: true }
+*/
+rule real { condition: true }
+""")
+
+    assert [rule["rule_name"] for rule in rules] == ["real"]
+
+
+def test_unterminated_last_rule_is_kept(processor, tmp_path):
+    rules = split_rules(processor, tmp_path, """rule complete { condition: true }
+rule truncated {
+    condition:
+""")
+
+    assert [rule["rule_name"] for rule in rules] == ["complete", "truncated"]
+    assert rules[1]["text"].endswith("condition:")
+
+
+def test_repeated_rule_names_get_distinct_ids(processor, tmp_path):
+    path = tmp_path / "pack.yar"
+    path.write_text("rule dup { condition: true }\nrule dup { condition: false }\n", encoding="utf-8")
+
+    records = list(processor.iter_records(path))
+
+    assert [record["rule_name"] for record in records] == ["dup", "dup"]
+    assert records[0]["id"] != records[1]["id"]
@@ -0,0 +1,43 @@
+import pytest
+
+from src.utils.utils import find_capec_ids, find_cwe_ids
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("What is CAPEC-66?", ["66"]),
+    ("tell me about capec 66", ["66"]),
+    ("CAPEC ID: 112 and CAPEC_66", ["112", "66"]),
+    ("compare capec-66 with CAPEC-66", ["66"]),
+    ("capec#7.", ["7"]),
+])
+def test_capec_ids_are_found(query, expected):
+    assert find_capec_ids(query) == expected
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Which attacks exploit CWE-79?", ["79"]),
+    ("cwe 89 or CWE_20", ["89", "20"]),
+    ("cwe id 79", ["79"]),
+])
+def test_cwe_ids_are_found(query, expected):
+    assert find_cwe_ids(query) == expected
+
+
+@pytest.mark.parametrize("query", [
+    "How does SQL injection work?",
+    "CAPEC lists 559 attack patterns",
+    "What changed in CAPEC 3.9?",
+    "Escapec-12 is not an identifier",
+    "the top 25 CWE weaknesses",
+    "capecs and cwes",
+])
+def test_plain_prose_has_no_ids(query):
+    assert find_capec_ids(query) == []
+    assert find_cwe_ids(query) == []
+
+
+def test_capec_and_cwe_ids_are_told_apart():
+    query = "Is CAPEC-66 related to CWE-89?"
+
+    assert find_capec_ids(query) == ["66"]
+    assert find_cwe_ids(query) == ["89"]